@@ -0,0 +1,120 @@
+import base64
+import hashlib
+import os
+import threading
+
+# --- GESTION DES IMAGES ---
+# Fichiers servis par Streamlit depuis static/ (server.enableStaticServing) sous une URL versionnée par le
+# contenu : le navigateur garde l'image en cache et chaque rerun n'envoie que l'URL. Sans service statique,
+# repli sur un data URI encodé une seule fois par process (recalculé seulement si le fichier change).
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+class StaticAsset:
+    def __init__(self, name, mime, fallback):
+        self.name = name
+        self.path = os.path.join(STATIC_DIR, name)
+        self.mime = mime
+        self.fallback = fallback
+        self._state = (None, None, None)        # (mtime, url servie, data URI)
+        self._lock = threading.Lock()
+
+    def _load(self, mtime):
+        with open(self.path, "rb") as f: data = f.read()
+        version = hashlib.sha1(data).hexdigest()[:12]
+        return mtime, f"./app/static/{self.name}?v={version}", f"data:{self.mime};base64,{base64.b64encode(data).decode()}"
+
+    def _current(self):
+        try: mtime = os.stat(self.path).st_mtime_ns
+        except OSError: return None
+        state = self._state
+        if state[0] != mtime:
+            with self._lock:
+                try: state = self._state = self._load(mtime)
+                except OSError: return None
+        return state
+
+    @property
+    def url(self):
+        state = self._current()
+        if state is None: return self.fallback
+        return state[1] if _static_serving() else state[2]
+
+    def sizes(self):
+        # (octets de l'URL servie, octets du data URI) envoyés à chaque affichage
+        state = self._current()
+        return (len(state[1]), len(state[2])) if state else (len(self.fallback),) * 2
+
+
+_STATIC_SERVING = None
+
+
+def _static_serving():
+    # Option lue une fois : la configuration serveur ne change pas pendant la vie du process
+    global _STATIC_SERVING
+    if _STATIC_SERVING is None:
+        try:
+            import streamlit as st
+            _STATIC_SERVING = bool(st.get_option("server.enableStaticServing"))
+        except Exception: _STATIC_SERVING = False
+    return _STATIC_SERVING
+
+
+LOGO = StaticAsset("u_23309_200.png", "image/png", "https://img.fshub.io/images/airlines/2275/avatar.png")
+PILOT_AVATAR_URL = "https://cdn-icons-png.flaticon.com/512/3135/3135715.png"
+
+# --- FEUILLE DE STYLE ---
+# Chaîne construite une fois par process ; chaque rerun ne fait que la réinjecter
+CSS = """
+    <style>
+    .big-font { font-size:20px !important; }
+    div[data-testid="stMetric"] { background-color: rgb(0, 157, 255) !important; padding: 15px; border-radius: 12px; }
+    div[data-testid="stMetric"] label, div[data-testid="stMetricValue"] { color: white !important; }
+    div[data-testid="stMetric"] div[data-testid="stMetricDelta"] { color: #e0e0e0 !important; }
+    .metar-box { background-color: #e3f2fd; border-left: 5px solid rgb(0, 157, 255); padding: 15px; font-family: monospace; color: black; }
+    .stButton button { width: 100%; }
+    
+    .login-logo-container { display: flex; justify-content: center; width: 100%; margin-bottom: 20px; }
+    .login-logo { width: 150px; height: auto; }
+
+    /* STYLE ROSTER */
+    .roster-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(280px, 1fr)); column-gap: 16px; }
+    .pilot-card { background-color: white; border: 1px solid #e0e0e0; border-top: 4px solid rgb(0, 157, 255); border-radius: 12px; padding: 12px; margin-bottom: 15px; box-shadow: 0 2px 5px rgba(0,0,0,0.05); transition: transform 0.2s; min-height: 140px; display: flex; align-items: center; gap: 15px; }
+    .pilot-card:hover { transform: translateY(-3px); box-shadow: 0 5px 15px rgba(0,0,0,0.1); }
+    .pilot-img { width: 64px; height: 64px; border-radius: 50%; border: 3px solid #e3f2fd; object-fit: cover; }
+    .pilot-details { flex-grow: 1; }
+    .pilot-name { font-size: 18px; font-weight: 800; color: #2c3e50; margin-bottom: 4px; }
+    .rank-line { display: flex; align-items: center; gap: 8px; margin-bottom: 6px; }
+    .pilot-rank { background-color: #e3f2fd; color: #007bff; padding: 3px 10px; border-radius: 12px; font-size: 11px; font-weight: 700; }
+    .staff-badge { background-color: #d32f2f; color: white; padding: 3px 8px; border-radius: 12px; font-size: 10px; font-weight: 800; text-transform: uppercase; letter-spacing: 0.5px; }
+    .pilot-info { font-size: 12px; color: #7f8c8d; margin-top: 2px; display: flex; align-items: center; gap: 5px; }
+    
+    .badge-inactive { background-color: #95a5a6; color: white; padding: 4px 8px; border-radius: 4px; font-weight: bold; font-size: 11px; }
+
+    /* STYLE FLIGHT CARD */
+    .flight-card { background-color: white; border-radius: 12px; padding: 16px 24px; margin-bottom: 16px; border-left: 6px solid #009dff; box-shadow: 0 2px 6px rgba(0,0,0,0.06); display: flex; justify-content: space-between; align-items: center; transition: all 0.2s ease; }
+    .flight-card:hover { transform: translateX(2px); box-shadow: 0 4px 12px rgba(0,0,0,0.08); }
+    .fc-left { display: flex; flex-direction: column; gap: 4px; }
+    .fc-route { font-size: 22px; font-weight: 800; color: #2c3e50; letter-spacing: -0.5px; display: flex; align-items: center; gap: 8px; }
+    .fc-pilot { font-size: 13px; color: #64748b; font-weight: 600; display: flex; align-items: center; gap: 6px; }
+    .fc-right { display: flex; flex-direction: column; align-items: flex-end; gap: 6px; }
+    .fc-badges { display: flex; align-items: center; gap: 8px; }
+    .badge-aircraft { background-color: #f1f5f9; color: #475569; font-size: 11px; font-weight: 700; padding: 6px 12px; border-radius: 20px; border: 1px solid #e2e8f0; }
+    .badge-landing { font-family: 'Courier New', monospace; font-weight: 700; font-size: 12px; padding: 6px 10px; border-radius: 6px; background-color: #f8fafc; border: 1px solid #e2e8f0; }
+    .landing-good { color: #16a34a; border-color: #bbf7d0; background-color: #f0fdf4; }
+    .landing-hard { color: #dc2626; border-color: #fecaca; background-color: #fef2f2; }
+    .fc-date { font-size: 11px; color: #94a3b8; font-weight: 500; }
+    
+    /* STYLE EVENT CARD */
+    .event-card { background-color: white; border-radius: 12px; padding: 0; margin-bottom: 15px; box-shadow: 0 4px 12px rgba(0,0,0,0.05); display: flex; overflow: hidden; border: 1px solid #f1f5f9; }
+    .ev-date-box { background-color: #009dff; color: white; width: 80px; display: flex; flex-direction: column; align-items: center; justify-content: center; padding: 15px; }
+    .ev-day { font-size: 24px; font-weight: 800; line-height: 1; }
+    .ev-month { font-size: 12px; font-weight: 700; text-transform: uppercase; margin-top: 4px; }
+    .ev-details { padding: 15px 20px; flex-grow: 1; display: flex; flex-direction: column; justify-content: center; }
+    .ev-title { font-size: 18px; font-weight: 800; color: #2c3e50; margin-bottom: 6px; }
+    .ev-meta { font-size: 13px; color: #64748b; display: flex; gap: 15px; align-items: center; }
+    .ev-tag { background: #f1f5f9; padding: 2px 8px; border-radius: 6px; font-weight: 600; font-size: 11px; color: #475569; }
+
+    .center-text { text-align: center; }
+    </style>
+    """
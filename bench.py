@@ -0,0 +1,345 @@
+import io
+import random
+import sys
+import timeit
+import tracemalloc
+
+# --- MICRO-BENCHMARKS ---
+# Usage : python bench.py [nom ...]   (sans argument : tous)
+
+SAMPLE_METARS = [
+    "NTAA 181200Z 08010G20KT 050V120 9999 R04/0800V1200FT/U -SHRA VCTS FEW020CB BKN035 28/22 Q1012 TEMPO 4000 SHRA",
+    "KLAX 181253Z AUTO VRB03KT 1 1/2SM BR OVC004 M02/M04 A2992 RMK AO2 SLP132",
+    "EGLL 181220Z 24012KT CAVOK 15/M01 Q1030 NOSIG",
+    "NTTB 181200Z 10005KT 9999 SCT025 29/21 Q1011 BECMG 11015KT",
+]
+
+
+def report(name, seconds, count):
+    print(f"{name:<40} {seconds / count * 1e6:9.2f} µs/op  ({count} ops)")
+
+
+def legacy_extract_metar_data(raw_text):
+    # Ancienne version de app.py, conservée comme référence
+    data = {"Wind": "N/A", "Temp": "N/A", "QNH": "N/A"}
+    try:
+        parts = raw_text.split()
+        for part in parts:
+            if part.endswith("KT"): data["Wind"] = part
+            elif "/" in part and len(part) < 7: data["Temp"] = part
+            elif part.startswith("Q") and len(part) == 5: data["QNH"] = part
+            elif part.startswith("A") and len(part) == 5 and part[1:].isdigit(): data["QNH"] = part
+    except: pass
+    return data
+
+
+def varied_metars(n, seed=0):
+    # Bulletins tous différents (heure, vent, température, QNH) : le cache de jetons ne sert que pour les groupes répétés
+    rnd = random.Random(seed)
+    return [f"{rnd.choice(('NTAA', 'NTTB', 'KLAX', 'EGLL', 'LFPG'))} {rnd.randint(1, 28):02d}{rnd.randint(0, 23):02d}{rnd.choice((0, 30, 53)):02d}Z "
+            f"{rnd.randrange(0, 360, 10):03d}{rnd.randint(0, 30):02d}KT {rnd.choice(('9999', '8000', 'CAVOK', '4000 BR', '1 1/2SM'))} "
+            f"{rnd.choice(('FEW', 'SCT', 'BKN'))}{rnd.randint(5, 50):03d} {rnd.randint(0, 35):02d}/{rnd.randint(0, 25):02d} "
+            f"Q{rnd.randint(990, 1035)} {rnd.choice(('NOSIG', '', 'TEMPO 4000 SHRA'))}" for _ in range(n)]
+
+
+def bench_metar():
+    from metar import decode_metar, metar_summary
+    n = 20000
+    for name, fn in (("legacy extract_metar_data", legacy_extract_metar_data),
+                     ("decode_metar", decode_metar), ("metar_summary", metar_summary)):
+        t = timeit.timeit(lambda: [fn(r) for r in SAMPLE_METARS], number=n // len(SAMPLE_METARS))
+        report(name, t, n)
+    bulletins = varied_metars(n)
+    for name, fn in (("legacy extract_metar_data (variés)", legacy_extract_metar_data), ("decode_metar (variés)", decode_metar)):
+        t = timeit.timeit(lambda: [fn(r) for r in bulletins], number=1)
+        report(name, t, n)
+    try:
+        from metar import decode_batch
+        decode_batch(bulletins[:10])        # import de pandas/numpy hors mesure
+        t = timeit.timeit(lambda: decode_batch(bulletins), number=1)
+        report("decode_batch (DataFrame, variés)", t, n)
+    except ImportError:
+        print("decode_batch : pandas/numpy absents, ignoré")
+
+
+def fshub_fixture(rows=200):
+    # Page façon fsHub : un petit tableau, le tableau des vols, puis d'autres tableaux inutiles
+    flights = "".join(f"<tr><td><a href='/pilot/{i}'>THT{1000 + i % 50} Pilot {i}</a></td><td>NTAA</td><td>NTTB</td>"
+                      f"<td>A320</td><td>{-100 - i % 400} fpm</td><td>2026-10-{1 + i % 28:02d}</td></tr>" for i in range(rows))
+    filler = "".join(f"<tr><td>{i}</td><td>x</td></tr>" for i in range(rows * 5))
+    return ("<html><head><title>THT</title></head><body><div><table><tr><td>Total Flights</td><td>835</td></tr></table>"
+            "<table><thead><tr><th>Pilot</th><th>Departure</th><th>Arrival</th><th>Aircraft</th><th>Landing</th><th>Date</th></tr></thead>"
+            f"<tbody>{flights}</tbody></table><table>{filler}</table><table>{filler}</table></div></body></html>").encode()
+
+
+def _measure(fn):
+    tracemalloc.start()
+    t = timeit.timeit(fn, number=20) / 20
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return t, peak
+
+
+def bench_fshub():
+    from fshub import extract_table, flights_table, to_frame
+    page = fshub_fixture()
+    results = [("extract_table (iterparse)", lambda: extract_table(io.BytesIO(page), flights_table)),
+               ("extract_table + to_frame", lambda: to_frame(*extract_table(io.BytesIO(page), flights_table)))]
+    try:
+        import pandas as pd
+        results.append(("pd.read_html (toutes les tables)", lambda: [df for df in pd.read_html(io.BytesIO(page)) if len(df.columns) >= 5][0]))
+    except ImportError:
+        print("pd.read_html : pandas absent, ignoré")
+    for name, fn in results:
+        t, peak = _measure(fn)
+        print(f"{name:<40} {t * 1e3:9.2f} ms/page  pic mémoire {peak / 1024:8.0f} Kio")
+
+
+def synthetic_roster(n=5000):
+    roster = [{"id": f"THT{1000 + i}", "nom": f"Pilote {i}", "grade": "EP", "role": "Pilote", "fshub_id": str(i),
+               "default": "0h"} for i in range(n)]
+    hours_map = {f"Pilote {i} THT{1000 + i}": f"{random.randint(0, 2000):,}.{i % 10}h" for i in range(n)}
+    return roster, hours_map
+
+
+def legacy_hours_lookup(roster, hours_map):
+    # Ancienne boucle imbriquée des pages Accueil / Profil / Roster
+    result = {}
+    for pilot in roster:
+        h_str = pilot['default']
+        for name, h in hours_map.items():
+            if pilot['id'] in name:
+                h_str = h
+                break
+        try: clean_h = float(h_str.lower().replace('h', '').replace(',', '').replace(' ', ''))
+        except: clean_h = 0.0
+        result[pilot['id']] = clean_h
+    return result
+
+
+def bench_pilots():
+    from pilots import PilotIndexCache, build_pilot_index
+    roster, hours_map = synthetic_roster()
+    t = timeit.timeit(lambda: legacy_hours_lookup(roster, hours_map), number=1)
+    print(f"{'boucle imbriquée (5000 pilotes)':<40} {t * 1e3:9.1f} ms/rendu")
+    t = timeit.timeit(lambda: build_pilot_index(roster, hours_map), number=5) / 5
+    print(f"{'build_pilot_index (1 fois / instantané)':<40} {t * 1e3:9.1f} ms")
+    cache = PilotIndexCache()
+    cache.get(1, roster, hours_map)
+    t = timeit.timeit(lambda: [cache.get(1, roster, hours_map)[p['id']].hours for p in roster], number=20) / 20
+    print(f"{'index en cache, 5000 lectures':<40} {t * 1e3:9.1f} ms/rendu")
+
+
+def synthetic_flights(n=100_000):
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(7)
+    airports = np.array(["NTAA", "NTTB", "NTTR", "NTTH", "KLAX", "NZAA", "LFPG", "RJAA"])
+    return pd.DataFrame({
+        "flight_id": np.arange(n), "pilot": "THT1001",
+        "dep": rng.choice(airports, n), "arr": rng.choice(airports, n),
+        "aircraft": rng.choice(np.array(["A320", "B789", "A359", "AT76", "DH8D"]), n),
+        "landing_fpm": rng.normal(-250, 90, n).round(),
+        "day": (pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.integers(0, 4000, n), unit="D")).strftime("%Y-%m-%d"),
+        "minutes": rng.integers(20, 900, n),
+    })
+
+
+def bench_career():
+    from career import CareerCache, career_stats
+    df = synthetic_flights()
+    t = timeit.timeit(lambda: career_stats(df), number=5) / 5
+    print(f"{'career_stats (100k vols)':<40} {t * 1e3:9.1f} ms")
+    cache = CareerCache()
+    cache.get("THT1001", 1, lambda: df)
+    t = timeit.timeit(lambda: cache.get("THT1001", 1, lambda: df), number=10000) / 10000
+    print(f"{'career_stats mémoïsé (même version)':<40} {t * 1e6:9.2f} µs")
+
+
+# Révisions comparées à l'arbre courant, exportées telles quelles (git archive) : app.py monolithique d'origine et
+# app.py encore monolithique juste avant le découpage en views/ (modules du backlog importés en tête)
+COLDSTART_BASELINES = (("2c47edd", "app.py d'origine"), ("77d7e5c", "app.py avant découpage"))
+
+# Premier rendu de la page de connexion dans un process neuf ; modules de premier niveau importés par le script
+# lui-même (ceux déjà chargés par AppTest, dont streamlit, exclus)
+_FIRST_RUN = """import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120)
+loaded = set(sys.modules)
+t = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - t
+print(json.dumps({"run": elapsed, "modules": sorted({m.split(".")[0] for m in set(sys.modules) - loaded if not m.startswith("_")})}))
+"""
+
+
+def _export(rev, dest):
+    import subprocess
+    import tarfile
+    archive = subprocess.run(["git", "archive", "--format=tar", rev], capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar: tar.extractall(dest, filter="data")
+
+
+def _coldstart(tree, runs=3):
+    # Meilleur essai de chaque mesure, chacune dans un process neuf avec un répertoire de données vide :
+    # (premier rendu AppTest, import seul des modules chargés par ce rendu, streamlit déjà importé, nombre de ces modules)
+    import json
+    import os
+    import subprocess
+    import tempfile
+    env = {**os.environ, "PYTHONPATH": tree}
+    run = lambda code: subprocess.run([sys.executable, "-c", code], cwd=tree, capture_output=True, text=True, check=True,
+                                      env={**env, "ATN_DATA_DIR": tempfile.mkdtemp(prefix="atn-bench-")}).stdout.strip().splitlines()[-1]
+    first = [json.loads(run(_FIRST_RUN)) for _ in range(runs)]
+    modules = first[0]["modules"]
+    imports = [float(run(f"import time, streamlit; t = time.perf_counter(); import {', '.join(modules)}; print(time.perf_counter() - t)"))
+               for _ in range(runs)] if modules else [0.0]
+    return min(r["run"] for r in first), min(imports), len(modules)
+
+
+def bench_coldstart():
+    import tempfile
+    with tempfile.TemporaryDirectory(prefix="atn-baseline-") as root:
+        trees = []
+        for rev, label in COLDSTART_BASELINES:
+            dest = f"{root}/{rev}"
+            _export(rev, dest)
+            trees.append((f"{label} ({rev})", dest))
+        trees.append(("arbre courant (views/ paresseux)", "."))
+        for label, tree in trees:
+            first_run, imports, count = _coldstart(tree)
+            print(f"{label:<40} premier rendu {first_run * 1e3:7.1f} ms · imports {imports * 1e3:7.1f} ms ({count} modules)")
+
+
+def bench_assets():
+    import base64
+    from assets import LOGO
+    # Ancien comportement : lecture + encodage base64 du logo au chargement de app.py, donc à chaque rerun
+    t_legacy = timeit.timeit(lambda: base64.b64encode(open(LOGO.path, "rb").read()).decode(), number=1000) / 1000
+    LOGO.url                            # premier appel : lecture de la configuration serveur
+    t_cached = timeit.timeit(lambda: LOGO.url, number=10000) / 10000
+    print(f"{'logo : lecture + base64 par rerun':<40} {t_legacy * 1e6:9.2f} µs")
+    print(f"{'logo : LOGO.url (cache process, mtime)':<40} {t_cached * 1e6:9.2f} µs")
+    served, inline = LOGO.sizes()
+    # Affichages du logo par rerun : connexion (1), barre latérale (1), + page Contact (1)
+    for name, uses in (("login", 1), ("page connectée", 1), ("page Contact", 2)):
+        print(f"{'octets logo / rerun (' + name + ')':<40} {inline * uses:9d} -> {served * uses} (-{(inline - served) * uses} o)")
+
+
+def bench_roster():
+    from roster import Roster, paginate
+    rng = random.Random(7)
+    names = ["Guillaume", "Alain", "Andrew", "Bonno", "Frédéric", "Mattias", "Jordan", "Mathieu", "Daniel", "Kévin"]
+    rows = [{"id": f"THT{1000 + i}", "nom": f"{rng.choice(names)} {chr(65 + i % 26)}.", "grade": rng.choice(["EP", "PPL", "CPL", "CDB"]),
+             "role": "STAFF" if i % 40 == 0 else "Pilote", "fshub_id": str(20000 + i), "default": "0h"} for i in range(2000)]
+    roster = Roster(rows)
+    t = timeit.timeit(lambda: next((p for p in rows if p['id'] == "THT2990"), None), number=2000)
+    report("linear next() lookup (2000 pilotes)", t, 2000)
+    t = timeit.timeit(lambda: roster.get("THT2990"), number=100000)
+    report("Roster.get (2000 pilotes)", t, 100000)
+    t = timeit.timeit(lambda: roster.search("THT19"), number=2000)
+    report("Roster.search préfixe 'THT19'", t, 2000)
+    t = timeit.timeit(lambda: roster.search("gui", grade="CDB"), number=2000)
+    report("Roster.search 'gui' + grade", t, 2000)
+    t = timeit.timeit(lambda: paginate(roster.search(), 3, 24), number=2000)
+    report("page 3 / 24 cartes", t, 2000)
+    print(f"{'éléments Streamlit par rerun':<40} {len(rows):9d} -> 1 (page de 24 cartes)")
+
+
+def bench_fragments():
+    import pandas as pd
+    from fragments import RenderCache, flight_cards_html
+    df = pd.DataFrame([("THT1001 Guillaume B.", "NTAA", "NTTB", "A320", -180, "2026-01-12")] * 5,
+                      columns=["Pilot", "Departure", "Arrival", "Aircraft", "Landing", "Date"])
+
+    def legacy():
+        # Ancienne boucle de la page d'accueil : une f-string par ligne via iterrows()
+        out = []
+        for _, row in df.iterrows():
+            cols = row.index
+            out.append(f"""<div class="flight-card"><div class="fc-left"><div class="fc-route">{row[cols[1]]} - {row[cols[2]]}</div><div class="fc-pilot">👨‍✈️ {row[cols[0]]}</div></div><div class="fc-right"><div class="fc-badges"><span class="badge-aircraft">✈️ {row[cols[3]]}</span></div><div class="fc-date">{row[cols[5]]}</div></div></div>""")
+        return out
+
+    report("vols récents : iterrows (5 lignes)", timeit.timeit(legacy, number=500), 500)
+    report("vols récents : extraction par colonnes", timeit.timeit(lambda: flight_cards_html(df), number=500), 500)
+    cache = RenderCache()
+    cache.get("home_flights", 1, "FR", lambda: flight_cards_html(df))
+    report("vols récents : cache (même version)", timeit.timeit(lambda: cache.get("home_flights", 1, "FR", lambda: flight_cards_html(df)), number=100000), 100000)
+
+
+def bench_reruns():
+    # Avant = durée moyenne d'un rerun complet de app.py ("app.run") ; après = durée moyenne de l'exécution de la
+    # fonction du fragment touché, relevée pendant ces mêmes reruns complets (AppTest ne rejoue pas un fragment seul).
+    # Le temps propre du fragment est donc une borne basse d'un rerun de fragment : la reprise du ScriptRunner et
+    # l'envoi des deltas au navigateur ne sont pas comptés.
+    from streamlit.testing.v1 import AppTest
+    import views
+    from metrics import METRICS
+    runs = 5
+
+    def measure(label, at, fragment_name, prepare=lambda at: None):
+        METRICS.reset()
+        for _ in range(runs):
+            prepare(at)
+            at.run()
+        metrics = METRICS.snapshot()
+        app_n, app_t = metrics["app.run"].count, metrics["app.run"].total
+        frag = metrics.get(fragment_name)
+        frag_n, frag_t = (frag.count, frag.total) if frag else (0, 0.0)
+        after = f"{frag_t / frag_n * 1e3:.2f} ms" if frag_n else "fragment non affiché (pas de données)"
+        print(f"{label:<40} {app_t / app_n * 1e3:9.1f} ms -> {after}")
+
+    at = AppTest.from_file("app.py", default_timeout=120).run()
+    at.session_state["show_register"] = True
+    measure("quiz (réponse)", at, "fragment.views.login.quiz_card")
+    at = AppTest.from_file("app.py", default_timeout=120).run()
+    at.session_state["logged_in"] = True
+    at.session_state["username"] = "THT1001"
+    at.run()
+    menu = list(views.PAGES)
+    for key, label, fragment_name in (("menu_checklist", "checklist (case cochée)", "fragment.views.checklist.checklist_phase"),
+                                      ("menu_events", "événements (vote)", "fragment.views.agenda.event_rsvp"),
+                                      ("menu_metar", "METAR (recherche)", "fragment.views.metar.metar_search")):
+        # Radio de navigation resélectionnée avant chaque run (limite d'AppTest avec format_func)
+        measure(label, at, fragment_name, lambda at, key=key: at.sidebar.radio[0].set_value(at.sidebar.radio[0].options[menu.index(key)]))
+
+
+def bench_checklist():
+    from checklists import CHECKLISTS, ChecklistState
+    checklist = CHECKLISTS["A320"]
+    # Ancien état : une clé de session par élément, réinitialisation par balayage de toute la session
+    session = {f"chk_{phase}_{i}": True for phase, items in checklist.phases for i in range(len(items))}
+    session.update({f"other_{i}": i for i in range(200)})
+
+    def legacy_reset():
+        for key in session.keys():
+            if key.startswith("chk_"): session[key] = False
+
+    state = ChecklistState(checklist, [checklist.full_mask(p) for p in range(len(checklist.phases))])
+    report("reset : balayage des clés de session", timeit.timeit(legacy_reset, number=10000), 10000)
+    report("reset : masques par phase", timeit.timeit(state.reset, number=10000), 10000)
+    report("résumé des phases (bit_count)", timeit.timeit(state.summary, number=10000), 10000)
+    text = state.dump()
+    report(f"dump ({len(text)} octets)", timeit.timeit(state.dump, number=10000), 10000)
+    report("restore", timeit.timeit(lambda: ChecklistState.restore(checklist, text), number=10000), 10000)
+
+
+def bench_metrics():
+    from metrics import Registry
+    registry = Registry()
+    plain = lambda x: x
+    timed = registry.timed("bench")(plain)
+    report("appel nu", timeit.timeit(lambda: plain(1), number=100000), 100000)
+    report("appel instrumenté (histogramme)", timeit.timeit(lambda: timed(1), number=100000), 100000)
+    report("export Prometheus", timeit.timeit(registry.prometheus, number=1000), 1000)
+
+
+BENCHES = {"metar": bench_metar, "fshub": bench_fshub, "pilots": bench_pilots, "career": bench_career, "coldstart": bench_coldstart,
+           "assets": bench_assets, "roster": bench_roster,
+           "fragments": bench_fragments, "reruns": bench_reruns,
+           "checklist": bench_checklist, "metrics": bench_metrics}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHES:
+        print(f"--- {name} ---")
+        BENCHES[name]()
@@ -0,0 +1,65 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# --- STATISTIQUES DE CARRIERE ---
+# Tout est calculé par group-by / opérations vectorielles sur la table des vols du pilote (pas d'iterrows).
+PERCENTILES = (10, 50, 90)
+
+
+def longest_streaks(days, today=None):
+    # days : dates de vol ; série de jours consécutifs -> (plus longue série, série en cours au jour today, UTC par défaut)
+    unique = np.unique(pd.to_datetime(days.dropna()).values.astype("datetime64[D]"))
+    if unique.size == 0: return 0, 0
+    breaks = np.diff(unique).astype(int) != 1
+    run_ids = np.concatenate(([0], np.cumsum(breaks)))
+    runs = np.bincount(run_ids)
+    today = np.datetime64(today or pd.Timestamp.now("UTC").date(), "D")
+    current = int(runs[-1]) if today - unique[-1] <= np.timedelta64(1, "D") else 0
+    return int(runs.max()), current
+
+
+def career_stats(df, today=None):
+    # df : colonnes dep, arr, aircraft, landing_fpm, day, minutes (cf. FlightStore.frame)
+    hours = df["minutes"].fillna(0) / 60
+    landing = df["landing_fpm"].dropna().astype(float)
+    frame = df.assign(hours=hours, route=df["dep"].fillna("") + "-" + df["arr"].fillna(""))
+    by_aircraft = (frame.groupby("aircraft", sort=False)
+                   .agg(flights=("aircraft", "size"), hours=("hours", "sum"), landing_fpm=("landing_fpm", "mean"))
+                   .sort_values("flights", ascending=False))
+    by_route = (frame.groupby("route", sort=False)
+                .agg(flights=("route", "size"), hours=("hours", "sum"))
+                .sort_values("flights", ascending=False))
+    days = pd.to_datetime(frame["day"], errors="coerce", format="ISO8601")
+    monthly_hours = frame["hours"].groupby(days.dt.to_period("M")).sum().sort_index()
+    best_streak, current_streak = longest_streaks(days, today)
+    return {
+        "flights": int(len(frame)),
+        "hours": float(hours.sum()),
+        "landing_avg": float(landing.mean()) if len(landing) else None,
+        "landing_percentiles": dict(zip(PERCENTILES, np.percentile(landing, PERCENTILES).tolist())) if len(landing) else {},
+        "by_aircraft": by_aircraft,
+        "by_route": by_route,
+        "monthly_hours": monthly_hours,
+        "best_streak": best_streak,
+        "current_streak": current_streak,
+    }
+
+
+class CareerCache:
+    # Une entrée par pilote, valide tant que la version de l'historique local ne change pas
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, pilot, version, load):
+        entry = self._entries.get(pilot)
+        if entry is not None and entry[0] == version: return entry[1]
+        stats = career_stats(load())
+        with self._lock:
+            self._entries[pilot] = (version, stats)
+        return stats
+
+
+CAREER_CACHE = CareerCache()
@@ -0,0 +1,124 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+
+from flights import DATA_DIR
+
+# --- DEFINITIONS DES CHECKLISTS ---
+# Un fichier JSON par type avion dans checklists/ : {"type", "nom", "phases": [{"phase", "items": [...]}]}.
+# Lus une seule fois à l'import du module, puis partagés par toutes les sessions.
+CHECKLIST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "checklists")
+
+
+@dataclass(frozen=True, slots=True)
+class Checklist:
+    aircraft: str                       # type OACI (A320, B789...)
+    name: str
+    phases: tuple                       # ((phase, (items...)), ...) dans l'ordre du vol
+    signature: int                      # crc32 de la définition : invalide un état enregistré si elle change
+
+    def full_mask(self, phase):
+        return (1 << len(self.phases[phase][1])) - 1
+
+
+def parse_checklist(doc):
+    phases = tuple((p['phase'], tuple(p['items'])) for p in doc['phases'])
+    return Checklist(doc['type'], doc.get('nom', doc['type']), phases, zlib.crc32(repr(phases).encode()))
+
+
+def load_checklists(directory):
+    checklists = {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".json"): continue
+        with open(os.path.join(directory, filename), encoding="utf-8") as f: checklist = parse_checklist(json.load(f))
+        checklists[checklist.aircraft] = checklist
+    return checklists
+
+
+CHECKLISTS = load_checklists(CHECKLIST_DIR)
+
+
+# --- PROGRESSION ---
+# Un entier par phase (bit i = élément i coché) : réinitialisation, phases terminées et résumé en O(phases).
+class ChecklistState:
+    __slots__ = ("checklist", "masks", "generation")
+
+    def __init__(self, checklist, masks=None):
+        self.checklist = checklist
+        self.masks = list(masks) if masks is not None else [0] * len(checklist.phases)
+        self.generation = 0             # change à chaque réinitialisation (clés des cases à cocher)
+
+    def checked(self, phase, item):
+        return bool(self.masks[phase] >> item & 1)
+
+    def set(self, phase, item, value):
+        if value: self.masks[phase] |= 1 << item
+        else: self.masks[phase] &= ~(1 << item)
+
+    def phase_done(self, phase):
+        return self.masks[phase] == self.checklist.full_mask(phase)
+
+    def summary(self):
+        # [(phase, cochés, total)]
+        return [(name, mask.bit_count(), len(items)) for (name, items), mask in zip(self.checklist.phases, self.masks)]
+
+    def progress(self):
+        return sum(m.bit_count() for m in self.masks), sum(len(items) for _, items in self.checklist.phases)
+
+    def reset(self):
+        self.masks = [0] * len(self.checklist.phases)
+        self.generation += 1
+
+    def dump(self):
+        # "signature:masque.masque..." en hexadécimal, quelques octets par checklist
+        return f"{self.checklist.signature:x}:" + ".".join(f"{m:x}" for m in self.masks)
+
+    @classmethod
+    def restore(cls, checklist, text):
+        # Etat vide si la définition a changé depuis l'enregistrement ou si le texte est illisible
+        try:
+            signature, masks = text.split(":")
+            signature, masks = int(signature, 16), [int(m, 16) for m in masks.split(".")]
+        except (AttributeError, ValueError): return cls(checklist)
+        if signature != checklist.signature or len(masks) != len(checklist.phases): return cls(checklist)
+        return cls(checklist, masks)
+
+
+# --- ETATS ENREGISTRES ---
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checklist_state (
+    pilot TEXT NOT NULL,
+    aircraft TEXT NOT NULL,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (pilot, aircraft)
+);
+"""
+
+
+class ChecklistStore:
+    def __init__(self, path, checklists):
+        if path != ":memory:": os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self.checklists = checklists
+        self._lock = threading.Lock()
+
+    def load(self, pilot, aircraft):
+        with self._lock:
+            row = self._db.execute("SELECT state FROM checklist_state WHERE pilot = ? AND aircraft = ?", (pilot, aircraft)).fetchone()
+        return ChecklistState.restore(self.checklists[aircraft], row[0]) if row else ChecklistState(self.checklists[aircraft])
+
+    def save(self, pilot, state):
+        with self._lock, self._db:
+            self._db.execute("INSERT INTO checklist_state VALUES (?, ?, ?, ?) ON CONFLICT(pilot, aircraft) DO UPDATE SET "
+                             "state = excluded.state, updated_at = excluded.updated_at",
+                             (pilot, state.checklist.aircraft, state.dump(), time.time()))
+
+
+CHECKLIST_STORE = ChecklistStore(os.path.join(DATA_DIR, "checklists.sqlite3"), CHECKLISTS)
@@ -0,0 +1,70 @@
+# --- DONNEES STATIQUES ---
+# Quiz, checklist, roster et calendrier : construits une seule fois par process à l'import.
+
+# --- BANQUE DE QUESTIONS (EXAMEN ENTREE) ---
+QUIZ_DATA = [
+    {
+        "question": "Quelle est la signification de VFR ?",
+        "options": ["Visual Flight Rules", "Very Fast Run", "Vertical Flight Range", "Variable Fuel Rate"],
+        "answer": "Visual Flight Rules"
+    },
+    {
+        "question": "Quelle est la couleur des feux de piste de gauche (bâbord) ?",
+        "options": ["Vert", "Rouge", "Blanc", "Bleu"],
+        "answer": "Rouge"
+    },
+    {
+        "question": "Que signifie QNH ?",
+        "options": ["Pression au niveau de la mer", "Pression au sol", "Altitude pression standard", "Qualité Niveaux Hauts"],
+        "answer": "Pression au niveau de la mer"
+    },
+    {
+        "question": "Sur un A320, quelle est la vitesse de rotation approximative (Vr) à masse standard ?",
+        "options": ["100 kts", "140 kts", "180 kts", "220 kts"],
+        "answer": "140 kts"
+    },
+    {
+        "question": "Quel est le code OACI de l'aéroport de Tahiti Faa'a ?",
+        "options": ["NTAA", "NTTB", "NTTR", "KLAX"],
+        "answer": "NTAA"
+    },
+    {
+        "question": "En espace aérien de classe C, le contact radio est-il obligatoire ?",
+        "options": ["Oui", "Non", "Seulement la nuit", "Uniquement pour les jets"],
+        "answer": "Oui"
+    },
+    {
+        "question": "Que signifie METAR ?",
+        "options": ["Meteorological Aerodrome Report", "Meteo Target Area Radar", "Medium Temperature Area Range", "Metal Airplane Report"],
+        "answer": "Meteorological Aerodrome Report"
+    },
+    {
+        "question": "Quelle est la fréquence de détresse internationale ?",
+        "options": ["121.500", "122.800", "118.100", "130.000"],
+        "answer": "121.500"
+    },
+    {
+        "question": "Un cap à 270° correspond à quelle direction ?",
+        "options": ["Nord", "Sud", "Est", "Ouest"],
+        "answer": "Ouest"
+    },
+    {
+        "question": "Quelle est l'altitude de transition standard aux USA ?",
+        "options": ["18 000 ft", "5 000 ft", "10 000 ft", "3 000 ft"],
+        "answer": "18 000 ft"
+    }
+]
+
+# --- DONNÉES ROSTER ---
+ROSTER_DATA = [
+    {"id": "THT1001", "nom": "Guillaume B.", "grade": "CDB", "role": "STAFF", "fshub_id": "23309", "default": "232h"},
+    {"id": "THT1002", "nom": "Alain L.", "grade": "CDB", "role": "STAFF", "fshub_id": "23385", "default": "190h"},
+    {"id": "THT1003", "nom": "Andrew F.", "grade": "CDB", "role": "STAFF", "fshub_id": "23387", "default": "598h"},
+    {"id": "THT1004", "nom": "Bonno T.", "grade": "PPL", "role": "Pilote", "fshub_id": "23713", "default": "196h"},
+    {"id": "THT1005", "nom": "Frédéric B.", "grade": "CPL", "role": "Pilote", "fshub_id": "12054", "default": "288h"},
+    {"id": "THT1006", "nom": "Mattias G.", "grade": "CDB", "role": "STAFF", "fshub_id": "28103", "default": "74h"},
+    {"id": "THT1007", "nom": "Jordan M.", "grade": "EP", "role": "Pilote", "fshub_id": "19702", "default": "111h"},
+    {"id": "THT1008", "nom": "Mathieu G.", "grade": "EP", "role": "Pilote", "fshub_id": "1360", "default": "96h"},
+    {"id": "THT1009", "nom": "Daniel V.", "grade": "EP", "role": "Pilote", "fshub_id": "28217", "default": "0h"}, 
+    {"id": "THT1010", "nom": "Kévin", "grade": "EP", "role": "Pilote", "fshub_id": "28382", "default": "5h"}
+]
@@ -0,0 +1,318 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import requests
+
+from flights import DATA_DIR
+from metrics import METRICS
+
+# --- STOCKAGE DES INSCRIPTIONS AUX EVENEMENTS ---
+# Inscriptions indexées par (événement, pilote) -> statut.
+# Un backend expose load() -> (inscriptions, révision) et save(inscriptions, changements, révision) -> révision.
+# save lève VersionConflict si la révision a bougé depuis la lecture : le store relit, refusionne et réessaie.
+JSONBIN_URL = "https://api.jsonbin.io/v3/b/{bin_id}"
+STATUS_YES, STATUS_MAYBE, STATUS_NO = "Présent", "Incertain", "Absent"
+LEGACY_EVENT = "evt1"           # ancien format {pilote: statut} : un seul événement
+
+
+class VersionConflict(Exception):
+    pass
+
+
+class JsonBinBackend:
+    # JSONBin n'a pas d'écriture conditionnelle : la révision "_rev" est stockée dans l'enregistrement et
+    # vérifiée par une relecture juste avant le PUT (fenêtre de conflit réduite à un aller-retour). C'est la seule
+    # lecture d'un flush : le store fournit la base de sa dernière lecture et ne relit qu'en cas de conflit.
+    def __init__(self, bin_id, api_key, timeout=10):
+        self.url = JSONBIN_URL.format(bin_id=bin_id)
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._session.headers.update({'X-Master-Key': api_key})
+
+    @METRICS.timed("jsonbin.load")
+    def load(self):
+        # Enregistrement : {événement: {pilote: statut}, "_rev": n}
+        req = self._session.get(self.url, timeout=self.timeout)
+        req.raise_for_status()
+        record = req.json().get('record', {})
+        rsvps = {}
+        for key, value in record.items():
+            if key == "init" or key.startswith("_"): continue
+            if isinstance(value, dict): rsvps.update(((key, pilot), status) for pilot, status in value.items())
+            else: rsvps[(LEGACY_EVENT, key)] = value
+        return rsvps, record.get('_rev', 0)
+
+    @METRICS.timed("jsonbin.save")
+    def save(self, rsvps, changes, rev):
+        if self.load()[1] != rev: raise VersionConflict(rev)
+        record = {"_rev": rev + 1}
+        for (event_id, pilot), status in rsvps.items():
+            record.setdefault(event_id, {})[pilot] = status
+        self._session.put(self.url, json=record, timeout=self.timeout).raise_for_status()
+        return rev + 1
+
+
+class SqliteEventBackend:
+    def __init__(self, path):
+        if path != ":memory:": os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS event_rsvps (
+                event TEXT NOT NULL, pilot TEXT NOT NULL, status TEXT, updated_at REAL, PRIMARY KEY (event, pilot));
+            CREATE INDEX IF NOT EXISTS idx_event_rsvps_pilot ON event_rsvps (pilot);
+            CREATE TABLE IF NOT EXISTS event_meta (id INTEGER PRIMARY KEY CHECK (id = 0), rev INTEGER NOT NULL);
+            INSERT OR IGNORE INTO event_meta VALUES (0, 0);
+        """)
+        with self._db:
+            # Ancienne table à un seul événement
+            if self._db.execute("SELECT 1 FROM sqlite_master WHERE name = 'event_participants'").fetchone():
+                self._db.execute("INSERT OR IGNORE INTO event_rsvps SELECT ?, pilot, status, updated_at FROM event_participants",
+                                 (LEGACY_EVENT,))
+                self._db.execute("DROP TABLE event_participants")
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            rev = self._db.execute("SELECT rev FROM event_meta").fetchone()[0]
+            return {(e, p): s for e, p, s in self._db.execute("SELECT event, pilot, status FROM event_rsvps")}, rev
+
+    def save(self, rsvps, changes, rev):
+        # Seules les lignes modifiées sont écrites ; la révision sert de verrou optimiste
+        now = time.time()
+        with self._lock, self._db:
+            if not self._db.execute("UPDATE event_meta SET rev = rev + 1 WHERE rev = ?", (rev,)).rowcount:
+                raise VersionConflict(rev)
+            self._db.executemany("INSERT INTO event_rsvps VALUES (?, ?, ?, ?) ON CONFLICT(event, pilot) DO UPDATE SET "
+                                 "status = excluded.status, updated_at = excluded.updated_at",
+                                 [(event_id, pilot, status, now) for (event_id, pilot), status in changes.items()])
+        return rev + 1
+
+
+# --- CACHE PARTAGE + ECRITURES REGROUPEES ---
+# Un seul store par process : toutes les sessions lisent la même copie (rechargée au plus toutes les ttl
+# secondes) ; les votes sont appliqués localement tout de suite puis écrits en un seul lot après debounce.
+class EventStore:
+    def __init__(self, backend=None, ttl=60, debounce=2.0, retries=3, retry_delay=30):
+        self.backend = backend
+        self.ttl = ttl
+        self.retry_delay = retry_delay  # après un échec de lecture : copie courante servie sans relire
+        self.debounce = debounce
+        self.retries = retries
+        self._rsvps = {}
+        self._base = {}                 # dernier état lu ou écrit dans le backend (sans les votes en attente)
+        self._rev = None
+        self.version = 0                # change à chaque modification visible (clé des index dérivés)
+        self._loaded_at = 0
+        self._pending = {}
+        self._timer = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.stats = {"loads": 0, "writes": 0, "coalesced": 0, "conflicts": 0, "errors": 0}
+        atexit.register(self.flush)
+
+    def configure(self, backend):
+        with self._lock:
+            if self.backend is None: self.backend = backend
+
+    def rsvps(self):
+        return self.snapshot()[1]
+
+    def snapshot(self):
+        # (version, inscriptions) lus ensemble ; tant qu'aucune lecture n'a réussi, nouvel essai au plus toutes
+        # les retry_delay secondes (copie vide servie entre deux essais, backend indisponible ou non)
+        age = time.time() - self._loaded_at
+        if age > self.ttl or (self._rev is None and age > self.retry_delay): self._reload()
+        with self._lock:
+            return self.version, self._rsvps
+
+    def _reload(self):
+        # Un seul rechargement à la fois ; les autres sessions servent la copie courante (sauf au tout premier)
+        if not self._load_lock.acquire(blocking=self._loaded_at == 0): return
+        try:
+            rsvps, rev = self.backend.load()
+            self.stats["loads"] += 1
+            self._publish(rsvps, rev)
+        except Exception:
+            self.stats["errors"] += 1
+            self._loaded_at = time.time()
+        finally:
+            self._load_lock.release()
+
+    def _publish(self, rsvps, rev):
+        with self._lock:
+            self._base = rsvps
+            # Les votes pas encore écrits restent visibles (lecture de ses propres écritures)
+            rsvps = {**rsvps, **self._pending}
+            if rsvps != self._rsvps: self.version += 1
+            self._rsvps = rsvps
+            self._rev = rev
+            self._loaded_at = time.time()
+
+    def upsert(self, event_id, pilot, status):
+        key = (event_id, pilot)
+        with self._lock:
+            if key in self._pending: self.stats["coalesced"] += 1
+            self._pending[key] = status
+            self._rsvps = {**self._rsvps, key: status}
+            self.version += 1
+            if self._timer is None:
+                self._timer = threading.Timer(self.debounce, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                self._timer = None
+                changes, self._pending = self._pending, {}
+                base, rev = self._base, self._rev
+            if not changes or self.backend is None: return True
+            for _ in range(self.retries):
+                try:
+                    # Base de la dernière lecture : relue seulement si inconnue ou après un conflit de révision
+                    if rev is None: base, rev = self.backend.load()
+                    rev = self.backend.save({**base, **changes}, changes, rev)
+                except VersionConflict:
+                    self.stats["conflicts"] += 1
+                    rev = None
+                    continue
+                except Exception:
+                    self.stats["errors"] += 1
+                    break
+                self.stats["writes"] += 1
+                self._publish({**base, **changes}, rev)
+                return True
+            # Échec : les changements repartent dans la file (un vote plus récent reste prioritaire)
+            with self._lock:
+                self._pending = {**changes, **self._pending}
+                if self._timer is None:
+                    self._timer = threading.Timer(self.debounce * 5, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+            return False
+
+
+# --- CALENDRIER ---
+@dataclass(frozen=True, slots=True)
+class Event:
+    id: str
+    title: str
+    start: datetime                     # UTC
+    hub: str
+    tags: tuple = ()
+    slots: int | None = None            # places "Présent" ; None = illimité
+
+
+def parse_events(rows):
+    # rows : [{"id", "titre", "date" ("AAAA-MM-JJ HH:MM" UTC), "hub", "tags", "places"}]
+    return [Event(r['id'], r['titre'], datetime.strptime(r['date'], "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc),
+                  r['hub'], tuple(r.get('tags', ())), r.get('places')) for r in rows]
+
+
+# Evénements tenus par le staff dans events.json (liste au format de parse_events) : relu seulement quand le
+# fichier change, sans redémarrage ni modification du code. Un fichier illisible garde le calendrier précédent.
+EVENTS_FILE = os.environ.get("ATN_EVENTS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "events.json"))
+
+
+class EventCalendar:
+    def __init__(self, path):
+        self.path = path
+        self._state = (None, ())                # (mtime, événements)
+        self._lock = threading.Lock()
+
+    def events(self):
+        try: mtime = os.stat(self.path).st_mtime_ns
+        except OSError: return self._state[1]
+        state = self._state
+        if state[0] != mtime:
+            with self._lock:
+                try:
+                    with open(self.path, encoding="utf-8") as f: state = (mtime, tuple(parse_events(json.load(f))))
+                except (OSError, ValueError, KeyError, TypeError): state = (mtime, self._state[1])
+                self._state = state
+        return state[1]
+
+
+class EventBoard:
+    # Index figé construit en un passage sur les inscriptions : par date (à venir / passés), par pilote
+    # (mes événements) et compteurs par statut ; aucune table reconstruite à l'affichage.
+    def __init__(self, events, rsvps):
+        self.events = {e.id: e for e in events}
+        self._by_date = sorted((e.start, e.id) for e in events)
+        self._starts = [start for start, _ in self._by_date]
+        self._by_event = {}
+        self._by_pilot = {}
+        self._counts = {}
+        for (event_id, pilot), status in rsvps.items():
+            if event_id not in self.events: continue
+            self._by_event.setdefault(event_id, {})[pilot] = status
+            self._by_pilot.setdefault(pilot, {})[event_id] = status
+            counts = self._counts.setdefault(event_id, {})
+            counts[status] = counts.get(status, 0) + 1
+
+    def upcoming(self, now=None, limit=None):
+        now = now or datetime.now(timezone.utc)
+        ids = [event_id for _, event_id in self._by_date[bisect_left(self._starts, now):]]
+        return [self.events[i] for i in ids[:limit]]
+
+    def past(self, now=None, limit=None):
+        now = now or datetime.now(timezone.utc)
+        ids = [event_id for _, event_id in reversed(self._by_date[:bisect_right(self._starts, now)])]
+        return [self.events[i] for i in ids[:limit]]
+
+    def next_event(self, now=None):
+        upcoming = self.upcoming(now, 1)
+        return upcoming[0] if upcoming else None
+
+    def status(self, event_id, pilot):
+        return self._by_pilot.get(pilot, {}).get(event_id)
+
+    def my_events(self, pilot):
+        mine = self._by_pilot.get(pilot, {})
+        return sorted(((self.events[i], status) for i, status in mine.items()), key=lambda es: es[0].start)
+
+    def participants(self, event_id):
+        return self._by_event.get(event_id, {})
+
+    def count(self, event_id, status=STATUS_YES):
+        return self._counts.get(event_id, {}).get(status, 0)
+
+    def full(self, event_id):
+        slots = self.events[event_id].slots
+        return slots is not None and self.count(event_id) >= slots
+
+
+class EventBoardCache:
+    def __init__(self):
+        self._state = (None, None)
+        self._lock = threading.Lock()
+
+    def get(self, events, store):
+        # Clé : le tuple d'événements lui-même (nouveau à chaque relecture du calendrier) et la version des inscriptions
+        version, rsvps = store.snapshot()
+        state = self._state
+        if state[0] is None or state[0][0] is not events or state[0][1] != version:
+            with self._lock:
+                state = ((events, version), EventBoard(events, rsvps))
+                self._state = state
+        return state[1]
+
+
+def default_backend(jsonbin=None):
+    # jsonbin : section [jsonbin] des secrets Streamlit (bin_id, api_key) ; ATN_EVENT_BACKEND=sqlite force le local
+    if jsonbin and os.environ.get("ATN_EVENT_BACKEND", "jsonbin") == "jsonbin":
+        return JsonBinBackend(jsonbin['bin_id'], jsonbin['api_key'])
+    return SqliteEventBackend(os.path.join(DATA_DIR, "events.sqlite3"))
+
+
+EVENT_CALENDAR = EventCalendar(EVENTS_FILE)
+EVENT_STORE = EventStore()
+EVENT_BOARD = EventBoardCache()
@@ -0,0 +1,198 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date
+
+from fshub import FlightRow
+
+# --- HISTORIQUE LOCAL DES VOLS (SQLite) ---
+# Alimenté par synchronisation incrémentale : seuls les vols plus récents que le dernier identifiant
+# vu pour le pilote sont insérés. Les pages Profil / Historique interrogent la base locale.
+DATA_DIR = os.environ.get("ATN_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flights (
+    flight_id INTEGER PRIMARY KEY,
+    pilot TEXT NOT NULL,
+    dep TEXT,
+    arr TEXT,
+    aircraft TEXT,
+    landing_fpm INTEGER,
+    day TEXT,
+    minutes INTEGER,
+    synced_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_flights_pilot ON flights (pilot, day);
+CREATE INDEX IF NOT EXISTS idx_flights_day ON flights (day);
+CREATE INDEX IF NOT EXISTS idx_flights_route ON flights (dep, arr);
+CREATE INDEX IF NOT EXISTS idx_flights_arr ON flights (arr);
+CREATE INDEX IF NOT EXISTS idx_flights_aircraft ON flights (aircraft);
+CREATE TABLE IF NOT EXISTS sync_state (
+    pilot TEXT PRIMARY KEY,
+    last_flight_id INTEGER,
+    synced_at REAL
+);
+"""
+
+
+def _synthetic_id(pilot, f):
+    # Ligne fsHub sans lien vers le vol : identifiant négatif stable dérivé du contenu
+    key = f"{pilot}|{f.dep}|{f.arr}|{f.aircraft}|{f.day}|{f.landing_fpm}".encode()
+    return -zlib.crc32(key) - 1
+
+
+# --- STATISTIQUES D'ATTERRISSAGE EN CONTINU ---
+# Moyenne / variance de Welford + histogramme à pas fixe (percentiles et distribution) : mise à jour en O(1)
+# par vol ingéré, lecture en temps constant.
+HARD_LANDING_FPM = -600
+
+
+class LandingStats:
+    def __init__(self, low=-1500, high=300, step=10):
+        self.low, self.step = low, step
+        self.bins = [0] * ((high - low) // step + 1)
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.hard = 0
+        self._lock = threading.Lock()
+
+    def add(self, fpm):
+        with self._lock:
+            self.count += 1
+            delta = fpm - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (fpm - self.mean)
+            if fpm <= HARD_LANDING_FPM: self.hard += 1
+            idx = min(max(int((fpm - self.low) // self.step), 0), len(self.bins) - 1)
+            self.bins[idx] += 1
+
+    @property
+    def stddev(self):
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    @property
+    def hard_rate(self):
+        return self.hard / self.count if self.count else 0.0
+
+    def percentile(self, q):
+        if not self.count: return None
+        target = q / 100 * self.count
+        seen = 0
+        for idx, n in enumerate(self.bins):
+            seen += n
+            if seen >= target: return self.low + (idx + 0.5) * self.step
+        return self.low + len(self.bins) * self.step
+
+    def distribution(self, width=50):
+        # {borne basse: nb vols} regroupé par tranches de width fpm, tranches vides exclues
+        factor = max(width // self.step, 1)
+        grouped = {}
+        for idx, n in enumerate(self.bins):
+            if not n: continue
+            edge = self.low + (idx // factor) * factor * self.step
+            grouped[edge] = grouped.get(edge, 0) + n
+        return grouped
+
+
+class FlightStore:
+    def __init__(self, path):
+        if path != ":memory:": os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self.version = self._db.execute("SELECT COUNT(*) FROM flights").fetchone()[0]
+        self._pilot_versions = {}
+        # Amorçage unique au démarrage, ensuite uniquement des mises à jour incrémentales
+        self.landing = LandingStats()
+        for (fpm,) in self._db.execute("SELECT landing_fpm FROM flights WHERE landing_fpm IS NOT NULL"): self.landing.add(fpm)
+
+    def _query(self, sql, args=()):
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def last_seen(self, pilot):
+        rows = self._query("SELECT last_flight_id FROM sync_state WHERE pilot = ?", (pilot,))
+        return rows[0][0] if rows else None
+
+    def sync(self, pilot, flights):
+        # flights : FlightRow du plus récent au plus ancien (ordre fsHub) ; on s'arrête au premier déjà connu.
+        # Seule l'écriture est incrémentale : fsHub n'a pas de paramètre "depuis", la page du pilote est toujours
+        # téléchargée en entier (304 sans analyse si elle n'a pas changé, cf. fshub.fetch_parsed) et analysée.
+        # Retourne les vols réellement insérés.
+        last = self.last_seen(pilot)
+        new = []
+        for f in flights:
+            if f.flight_id is not None and last is not None and f.flight_id <= last: break
+            new.append(f)
+        if not new: return []
+        now = time.time()
+        newest = max((f.flight_id for f in new if f.flight_id is not None), default=last)
+        inserted = []
+        with self._lock, self._db:
+            for f in new:
+                row = (f.flight_id if f.flight_id is not None else _synthetic_id(pilot, f), pilot, f.dep, f.arr, f.aircraft,
+                       f.landing_fpm, f.day.isoformat() if f.day else None, f.minutes, now)
+                if self._db.execute("INSERT OR IGNORE INTO flights VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row).rowcount:
+                    inserted.append(f)
+            self._db.execute("INSERT INTO sync_state VALUES (?, ?, ?) ON CONFLICT(pilot) DO UPDATE SET "
+                             "last_flight_id = excluded.last_flight_id, synced_at = excluded.synced_at", (pilot, newest, now))
+            if inserted:
+                self.version += len(inserted)
+                self._pilot_versions[pilot] = self._pilot_versions.get(pilot, 0) + len(inserted)
+        for f in inserted:
+            if f.landing_fpm is not None: self.landing.add(f.landing_fpm)
+        return inserted
+
+    def add(self, pilot, f):
+        # Vol hors fsHub (PIREP validé) : identifiant synthétique, le curseur de synchronisation n'est pas touché
+        flight_id = _synthetic_id(pilot, f)
+        row = (flight_id, pilot, f.dep, f.arr, f.aircraft, f.landing_fpm, f.day.isoformat() if f.day else None, f.minutes, time.time())
+        with self._lock, self._db:
+            if not self._db.execute("INSERT OR IGNORE INTO flights VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row).rowcount: return None
+            self.version += 1
+            self._pilot_versions[pilot] = self._pilot_versions.get(pilot, 0) + 1
+        if f.landing_fpm is not None: self.landing.add(f.landing_fpm)
+        return flight_id
+
+    def find(self, pilot, dep, arr, day):
+        # Vol déjà connu pour ce pilote, cette route et ce jour (index pilot, day)
+        rows = self._query("SELECT * FROM flights WHERE pilot = ? AND day = ? AND dep = ? AND arr = ? LIMIT 1",
+                           (pilot, day.isoformat(), dep, arr))
+        return rows[0] if rows else None
+
+    def pilot_version(self, pilot):
+        # Change à chaque insertion pour ce pilote (clé de mémoïsation des statistiques)
+        return self._pilot_versions.get(pilot, 0)
+
+    def recent(self, pilot, limit=5):
+        return self._query("SELECT * FROM flights WHERE pilot = ? ORDER BY day DESC, flight_id DESC LIMIT ?", (pilot, limit))
+
+    def pilot_flights(self, pilot):
+        return [FlightRow(r['dep'], r['arr'], r['aircraft'], r['landing_fpm'], date.fromisoformat(r['day']) if r['day'] else None,
+                          r['minutes'], r['flight_id'] if r['flight_id'] > 0 else None)
+                for r in self._query("SELECT * FROM flights WHERE pilot = ? ORDER BY day DESC, flight_id DESC", (pilot,))]
+
+    def count(self, pilot=None):
+        if pilot is None: return self._query("SELECT COUNT(*) FROM flights")[0][0]
+        return self._query("SELECT COUNT(*) FROM flights WHERE pilot = ?", (pilot,))[0][0]
+
+    def frame(self, pilot=None, since=None):
+        import pandas as pd
+        query, args = "SELECT * FROM flights WHERE 1 = 1", []
+        if pilot is not None:
+            query += " AND pilot = ?"
+            args.append(pilot)
+        if since is not None:
+            query += " AND day >= ?"
+            args.append(str(since))
+        with self._lock:
+            return pd.read_sql_query(query + " ORDER BY day", self._db, params=args)
+
+
+FLIGHT_STORE = FlightStore(os.path.join(DATA_DIR, "flights.sqlite3"))
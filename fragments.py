@@ -0,0 +1,64 @@
+import threading
+
+from metrics import METRICS
+
+# --- CACHE DE FRAGMENTS HTML ---
+# HTML complet d'une section rangé par (section, langue) avec la version des données qui l'a produit : tant que
+# la version ne change pas, un rendu ne coûte qu'un accès dictionnaire. Une seule version gardée par entrée.
+class RenderCache:
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, section, version, lang, build):
+        # Succès / échecs comptés par famille de section ("profile_flights:23309" -> render.profile_flights)
+        entry = self._entries.get((section, lang))
+        hit = entry is not None and entry[0] == version
+        METRICS.cache(f"render.{section.split(':')[0]}", hit)
+        if hit: return entry[1]
+        with METRICS.time(f"render.{section.split(':')[0]}"): html = build()
+        with self._lock:
+            self._entries[(section, lang)] = (version, html)
+        return html
+
+
+# --- CONSTRUCTION PAR COLONNES ---
+# Colonnes fsHub lues par position (pilote, départ, arrivée, appareil, ...) et extraites d'un seul tableau numpy
+# en listes, puis un seul join : ni iterrows() ni Series construite par ligne.
+def _columns(df, positions):
+    values = df.to_numpy(dtype=object)
+    return [values[:, i].tolist() for i in positions]
+
+
+def flight_cards_html(df):
+    if df.empty or df.shape[1] < 4: return ""
+    pilots, deps, arrs, aircraft = _columns(df, range(4))
+    dates = _columns(df, [5])[0] if df.shape[1] > 5 else [""] * len(df)
+    return "".join(f"""<div class="flight-card"><div class="fc-left"><div class="fc-route">{dep} - {arr}</div><div class="fc-pilot">👨‍✈️ {pilot}</div></div><div class="fc-right"><div class="fc-badges"><span class="badge-aircraft">✈️ {ac}</span></div><div class="fc-date">{date_txt}</div></div></div>"""
+                   for pilot, dep, arr, ac, date_txt in zip(pilots, deps, arrs, aircraft, dates))
+
+
+def pilot_flight_cards_html(df):
+    if df.empty or df.shape[1] < 4: return ""
+    return "".join(f"""<div class="flight-card" style="border-left: 6px solid #2ecc71;"><div class="fc-left"><div class="fc-route">{dep} ➡️ {arr}</div><div class="fc-pilot">📅 {date_val}</div></div><div class="fc-right"><span class="badge-aircraft">{ac}</span></div></div>"""
+                   for dep, arr, ac, date_val in zip(*_columns(df, (1, 2, 3, -1))))
+
+
+MEDALS = ["🥇", "🥈", "🥉"]
+
+
+def podium_html(top3):
+    # top3 : [{"nom", "grade", "raw"}] ; les trois cartes dans une seule grille
+    cards = "".join(f"""<div style="background: white; border-radius: 10px; padding: 15px; border-top: 5px solid #FFD700; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1);"><div style="font-size: 30px;">{MEDALS[idx]}</div><div style="font-weight: bold; font-size: 18px; color: #2c3e50;">{p['nom']}</div><div style="color: #7f8c8d; font-size: 12px;">{p['grade']}</div><div style="font-size: 24px; font-weight: 800; color: #009dff; margin-top: 5px;">{p['raw']}</div></div>"""
+                    for idx, p in enumerate(top3))
+    return f'<div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 16px;">{cards}</div>'
+
+
+def ranking_html(rows):
+    # rows : [{"nom", "grade", "raw"}] dans l'ordre du classement ; une seule liste HTML
+    items = "".join(f"""<div style="display: flex; justify-content: space-between; padding: 6px 10px; border-bottom: 1px solid #ecf0f1;"><span><b>{rank}.</b> {p['nom']} <span style="color: #7f8c8d; font-size: 12px;">{p['grade']}</span></span><span style="font-weight: 700; color: #009dff;">{p['raw']}</span></div>"""
+                    for rank, p in enumerate(rows, 1))
+    return f'<div style="background: white; border-radius: 10px; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">{items}</div>'
+
+
+RENDER_CACHE = RenderCache()
@@ -0,0 +1,326 @@
+import heapq
+import io
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+import requests
+from lxml import etree
+
+from metrics import METRICS
+
+# --- EXTRACTION DES PAGES FSHUB ---
+# Un seul passage iterparse : on ne construit que le tableau visé et on arrête la lecture dès qu'il est complet.
+FSHUB_BASE = "https://fshub.io"
+OVERVIEW_URL = FSHUB_BASE + "/airline/THT/overview"
+PILOTS_URL = FSHUB_BASE + "/airline/THT/pilots"
+PILOT_URL = FSHUB_BASE + "/pilot/{fshub_id}"
+HEADERS = {'User-Agent': 'Mozilla/5.0'}
+
+
+def _text(el):
+    return " ".join("".join(el.itertext()).split())
+
+
+def _row_link(tr, link):
+    for a in tr.iter("a"):
+        m = link.search(a.get("href") or "")
+        if m: return m.group(1)
+    return None
+
+
+def _read_table(table, link=None):
+    header, rows, links = None, [], []
+    for tr in table.iter("tr"):
+        cells = [c for c in tr if c.tag in ("td", "th")]
+        if not cells: continue
+        if header is None and (all(c.tag == "th" for c in cells) or tr.getparent().tag == "thead"):
+            header = tuple(_text(c) for c in cells)
+        else:
+            rows.append(tuple(_text(c) for c in cells))
+            if link is not None: links.append(_row_link(tr, link))
+    return header or (), rows, links
+
+
+def extract_table(source, accept, link=None):
+    # accept(en-tête, lignes) -> bool ; retourne (en-tête, lignes) du premier tableau accepté, sinon ((), []).
+    # Avec link (regex à un groupe appliquée aux href), retourne aussi pour chaque ligne le premier lien reconnu.
+    for _, table in etree.iterparse(source, events=("end",), tag="table", html=True, recover=True):
+        header, rows, links = _read_table(table, link)
+        if accept(header, rows): return (header, rows, links) if link is not None else (header, rows)
+        table.clear(keep_tail=True)
+    return ((), [], []) if link is not None else ((), [])
+
+
+def table_width(header, rows):
+    return len(header) if header else max(map(len, rows), default=0)
+
+
+def pilots_table(header, rows):
+    return any("Pilot" in c for c in header) and any("Hour" in c for c in header)
+
+
+def flights_table(header, rows):
+    return table_width(header, rows) >= 5
+
+
+def pilot_flights_table(header, rows):
+    cols = [c.lower() for c in header]
+    return table_width(header, rows) >= 5 and any(k in c for c in cols for k in ("aircraft", "distance", "time"))
+
+
+def to_frame(header, rows):
+    import pandas as pd
+    if not header: return pd.DataFrame(rows)
+    return pd.DataFrame([r[:len(header)] for r in rows], columns=list(header))
+
+
+def column(header, keyword):
+    return next((i for i, c in enumerate(header) if keyword in c), None)
+
+
+# --- LIGNES DE VOL ---
+_FPM = re.compile(r"(-?\d+)\s*fpm", re.IGNORECASE)
+_DURATION = re.compile(r"(\d+)\s*(?::|h)\s*(\d{1,2})")
+_FLIGHT_LINK = re.compile(r"/flight/(\d+)")
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%b %d, %Y", "%d %b %Y", "%d %B %Y", "%B %d, %Y")
+
+
+@dataclass(frozen=True, slots=True)
+class FlightRow:
+    dep: str
+    arr: str
+    aircraft: str
+    landing_fpm: int | None
+    day: date | None
+    minutes: int | None = None
+    flight_id: int | None = None
+
+
+def parse_day(text):
+    text = text.strip()
+    for candidate in (text, text[:10], text.split(" ")[0]):
+        for fmt in _DATE_FORMATS:
+            try: return datetime.strptime(candidate, fmt).date()
+            except ValueError: continue
+    return None
+
+
+def flight_rows(header, rows, ids=None):
+    # Même disposition que les cartes de vol : départ, arrivée, appareil en colonnes 1 à 3, date en dernier.
+    # Générateur : FlightStore.sync arrête la conversion au premier vol déjà connu
+    cols = [c.lower() for c in header]
+    col_landing = next((i for i, c in enumerate(cols) if "landing" in c or "fpm" in c), None)
+    col_time = next((i for i, c in enumerate(cols) if "time" in c or "duration" in c or "block" in c), None)
+    for n, row in enumerate(rows):
+        if len(row) < 4: continue
+        landing = None
+        for cell in ([row[col_landing]] if col_landing is not None and col_landing < len(row) else row):
+            m = _FPM.search(cell)
+            if m:
+                landing = int(m.group(1))
+                break
+        minutes = None
+        if col_time is not None and col_time < len(row):
+            m = _DURATION.search(row[col_time])
+            if m: minutes = int(m.group(1)) * 60 + int(m.group(2))
+        flight_id = int(ids[n]) if ids and ids[n] else None
+        yield FlightRow(row[1], row[2], row[3], landing, parse_day(row[-1]), minutes, flight_id)
+
+
+# --- INSTANTANES PARTAGES ---
+@dataclass(frozen=True, slots=True)
+class OverviewSnapshot:
+    flights: str | None = None          # "Total Flights" tel qu'affiché par fsHub
+    hours: str | None = None            # "Total Hours"
+    header: tuple = ()
+    rows: list = field(default_factory=list)
+    fetched_at: float = 0
+
+
+def _total(text, label):
+    match = re.search(r'([\d,.]+)\s*<[^>]*>\s*' + label, text, re.IGNORECASE | re.DOTALL)
+    if match is None: match = re.search(r'>([\d,.]+)<.*' + label, text, re.IGNORECASE | re.DOTALL)
+    return match.group(1) if match else None
+
+
+def parse_overview(source):
+    # Une lecture : totaux par regex sur le texte, tableau des vols récents par iterparse
+    body = source.read()
+    text = body.decode("utf-8", errors="replace")
+    header, rows = extract_table(io.BytesIO(body), flights_table)
+    return OverviewSnapshot(flights=_total(text, "Total Flights"), hours=_total(text, "Total Hours"),
+                            header=header, rows=rows, fetched_at=time.time())
+
+
+def parse_pilot_hours(source):
+    header, rows = extract_table(source, pilots_table)
+    col_pilot, col_hours = column(header, "Pilot"), column(header, "Hour")
+    if col_pilot is None or col_hours is None: return {}
+    width = max(col_pilot, col_hours)
+    return {row[col_pilot]: row[col_hours] for row in rows if len(row) > width}
+
+
+def parse_pilot_flights(source):
+    # (en-tête, lignes, identifiants de vol fsHub)
+    return extract_table(source, pilot_flights_table, link=_FLIGHT_LINK)
+
+
+# --- REQUETES CONDITIONNELLES ---
+# Par URL : (ETag, Last-Modified, résultat analysé). Une page inchangée coûte un 304 et aucune analyse.
+_CONDITIONAL = {}
+_CONDITIONAL_LOCK = threading.Lock()
+CONDITIONAL_STATS = {"full": 0, "not_modified": 0}
+
+
+def fetch_parsed(url, parse, timeout=10):
+    cached = _CONDITIONAL.get(url)
+    headers = dict(HEADERS)
+    if cached is not None:
+        if cached[0]: headers["If-None-Match"] = cached[0]
+        if cached[1]: headers["If-Modified-Since"] = cached[1]
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        if response.status_code == 304 and cached is not None:
+            CONDITIONAL_STATS["not_modified"] += 1
+            METRICS.cache("fshub.conditional", True)
+            return cached[2]
+        METRICS.cache("fshub.conditional", False)
+        response.raise_for_status()
+        response.raw.decode_content = True
+        parsed = parse(response.raw)
+        etag, modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    with _CONDITIONAL_LOCK:
+        CONDITIONAL_STATS["full"] += 1
+        if etag or modified: _CONDITIONAL[url] = (etag, modified, parsed)
+    return parsed
+
+
+@METRICS.timed("fshub.overview")
+def fetch_overview():
+    return fetch_parsed(OVERVIEW_URL, parse_overview)
+
+
+@METRICS.timed("fshub.pilot_hours")
+def fetch_pilot_hours():
+    return fetch_parsed(PILOTS_URL, parse_pilot_hours)
+
+
+@METRICS.timed("fshub.pilot_flights")
+def fetch_pilot_flights(fshub_id):
+    return fetch_parsed(PILOT_URL.format(fshub_id=fshub_id), parse_pilot_flights)
+
+
+# --- RAFRAICHISSEMENT EN ARRIERE-PLAN ---
+# Un thread par process serveur rafraîchit chaque flux à sa cadence ; les pages ne lisent que le dernier
+# instantané publié et ne bloquent jamais sur le réseau.
+@dataclass(frozen=True, slots=True)
+class FeedSnapshot:
+    value: object = None
+    version: int = 0                    # incrémenté à chaque rafraîchissement réussi
+    refreshed_at: float = 0
+    duration: float = 0
+    error: str | None = None
+
+
+class FeedRefresher:
+    # min_gap : délai minimum entre deux requêtes vers fsHub ; jitter : dispersion relative des échéances
+    def __init__(self, min_gap=2.0, jitter=0.1):
+        self.min_gap = min_gap
+        self.jitter = jitter
+        self._feeds = {}                # nom -> (fonction, intervalle)
+        self._snapshots = {}
+        self._queue = []                # tas de (échéance, rang, nom)
+        self._listeners = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._last_request = 0
+
+    def register(self, name, fn, interval):
+        with self._lock:
+            if name in self._feeds: return
+            self._feeds[name] = (fn, interval)
+            self._snapshots[name] = FeedSnapshot()
+            heapq.heappush(self._queue, (time.time(), len(self._feeds), name))
+        self._wake.set()
+
+    def get(self, name, default=None):
+        snap = self._snapshots.get(name)
+        return snap.value if snap is not None and snap.version else default
+
+    def snapshot(self, name):
+        return self._snapshots.get(name, FeedSnapshot())
+
+    def status(self):
+        return dict(self._snapshots)
+
+    def stats(self):
+        # Par flux : dernier rafraîchissement réussi (horodatage Unix, 0 si jamais), âge et durée du dernier appel (s)
+        now = time.time()
+        out = {}
+        for name, snap in self._snapshots.items():
+            out[f"{name}.refreshed_at"] = snap.refreshed_at
+            out[f"{name}.age"] = round(now - snap.refreshed_at, 1) if snap.refreshed_at else -1
+            out[f"{name}.duration"] = round(snap.duration, 4)
+            out[f"{name}.errors"] = int(snap.error is not None)
+        return out
+
+    def refresh_now(self, name):
+        fn, interval = self._feeds[name]
+        previous = self._snapshots[name]
+        started = time.time()
+        try:
+            value = fn()
+            # Réponse 304 : même objet analysé, la version ne change pas
+            version = previous.version if value is previous.value and previous.version else previous.version + 1
+            snap = FeedSnapshot(value=value, version=version, refreshed_at=time.time(), duration=time.time() - started)
+        except Exception as e:
+            # On garde la dernière valeur valide
+            snap = FeedSnapshot(value=previous.value, version=previous.version, refreshed_at=previous.refreshed_at,
+                                duration=time.time() - started, error=str(e) or type(e).__name__)
+        self._snapshots[name] = snap
+        if snap.version != previous.version: self._notify(name, snap)
+        return snap
+
+    def on_refresh(self, key, fn):
+        # fn(nom, instantané) appelé après chaque nouvelle version ; rejoue les flux déjà chargés
+        replay = key not in self._listeners
+        self._listeners[key] = fn
+        if not replay: return
+        for name, snap in list(self._snapshots.items()):
+            if snap.version: self._notify(name, snap, only=fn)
+
+    def _notify(self, name, snap, only=None):
+        for fn in [only] if only else list(self._listeners.values()):
+            try: fn(name, snap)
+            except Exception: pass
+
+    def _loop(self):
+        while True:
+            with self._lock:
+                now = time.time()
+                wait = 60
+                if self._queue:
+                    wait = max(self._queue[0][0] - now, self._last_request + self.min_gap - now)
+                    if wait <= 0: _, rank, name = heapq.heappop(self._queue)
+            if wait > 0:
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+            self._last_request = time.time()
+            self.refresh_now(name)
+            interval = self._feeds[name][1]
+            with self._lock:
+                heapq.heappush(self._queue, (time.time() + interval * random.uniform(1 - self.jitter, 1 + self.jitter), rank, name))
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive(): return
+            self._thread = threading.Thread(target=self._loop, name="fshub-refresher", daemon=True)
+            self._thread.start()
+
+
+FSHUB_FEEDS = FeedRefresher()
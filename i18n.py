@@ -0,0 +1,362 @@
+import streamlit as st
+
+# --- DICTIONNAIRE DE TRADUCTION ---
+# Module importé une fois par process : le dictionnaire n'est plus reconstruit à chaque rerun
+TRANS = {
+    "FR": {
+        "menu_home": "🏠 Accueil",
+        "menu_profile": "👤 Mon Espace",
+        "menu_briefing": "✈️ Briefing Room",
+        "menu_events": "📅 Événements",
+        "menu_roster": "👨‍✈️ Roster Pilotes",
+        "menu_radar": "🌍 Radar Live",
+        "menu_pirep": "📝 PIREP Manuel",
+        "menu_metar": "🌦️ Météo / METAR",
+        "menu_tours": "🏆 Validation Tours",
+        "menu_checklist": "📋 Checklist (BETA)",
+        "menu_contact": "📞 Contact",
+        "menu_metrics": "📈 Métriques (Staff)",
+        "title_home": "Ia Ora Na",
+        "stats_pilots": "Pilotes Actifs",
+        "stats_hours": "Heures Totales",
+        "stats_flights": "Vols Effectués",
+        "stats_landing": "Landing Moyen",
+        "leaderboard_title": "🏆 Top 3 - Heures de Vol",
+        "leaderboard_more": "📊 Autres classements",
+        "leaderboard_flights": "✈️ Vols",
+        "leaderboard_landing": "🛬 Landing moyen (3 vols min.)",
+        "leaderboard_month": "📅 Vols du mois",
+        "leaderboard_empty": "Pas encore de vols synchronisés.",
+        "recent_flights": "✈️ Vols Récents (Global)",
+        "demo_mode": "ℹ️ Mode Démo (Données simulées)",
+        "event_title": "Prochains événements",
+        "event_next": "📅 Prochain événement",
+        "event_none": "Aucun événement programmé pour le moment.",
+        "event_past": "Événements passés",
+        "event_mine": "🗓️ Mes événements",
+        "event_full": "Complet",
+        "event_my_status": "Mon statut",
+        "months_short": ["JAN", "FÉV", "MAR", "AVR", "MAI", "JUN", "JUL", "AOÛ", "SEP", "OCT", "NOV", "DÉC"],
+        "roster_title": "L'Équipe ATN-Virtual",
+        "roster_inactive": "⛔ INACTIF",
+        "roster_sync": "Données synchronisées avec fsHub",
+        "roster_search": "Rechercher (callsign ou nom)",
+        "roster_grade": "Grade",
+        "roster_role": "Rôle",
+        "roster_all": "Tous",
+        "roster_page": "Page",
+        "roster_results": "pilote(s)",
+        "roster_none": "Aucun pilote ne correspond à la recherche.",
+        "briefing_title": "Flight Dispatch Center",
+        "briefing_desc": "Préparez votre rotation : Météo, Prévisions et Plan de vol.",
+        "briefing_dep": "🛫 Départ (OACI)",
+        "briefing_arr": "🛬 Arrivée (OACI)",
+        "briefing_ac": "✈️ Appareil",
+        "briefing_eta": "🕒 ETA Arrivée (UTC)",
+        "briefing_eta_fcst": "Prévision à l'ETA",
+        "briefing_btn": "📡 ANALYSER LA ROUTE",
+        "briefing_simbrief": "🚀 GÉNÉRER OFP (SimBrief)",
+        "pirep_title": "📝 Soumettre un rapport manuel (PIREP)",
+        "pirep_intro": "Formulaire de secours",
+        "pirep_warn": "Ce formulaire est réservé aux pilotes rencontrant des difficultés techniques avec le logiciel de suivi (LRM). L'utilisation du client automatique est recommandée pour la précision des données.",
+        "pirep_send": "📤 ENVOYER LE RAPPORT",
+        "pirep_saved": "✅ PIREP enregistré, en attente de validation par le Staff.",
+        "pirep_duplicate": "ℹ️ Ce vol est déjà présent dans l'historique fsHub : inutile de le déclarer.",
+        "pirep_mine": "🗂️ Mes PIREP",
+        "pirep_queue": "🛂 PIREP à valider",
+        "pirep_approve": "✅ Valider",
+        "pirep_reject": "❌ Refuser",
+        "pirep_states": {"pending": "⏳ En attente", "approved": "✅ Validé", "rejected": "❌ Refusé", "duplicate": "🔁 Doublon fsHub"},
+        "contact_title": "Contactez-nous",
+        "contact_desc": "Une question ? Une suggestion ? Le Staff est à votre écoute.",
+        "contact_send": "📤 ENVOYER LE MESSAGE",
+        "form_subject": "Sujet de votre message",
+        "form_msg": "Votre message détaillé...",
+        "form_dep": "🛫 Départ (OACI)",
+        "form_arr": "🛬 Arrivée (OACI)",
+        "form_aircraft": "✈️ Type Appareil",
+        "form_flight_nb": "🔢 Numéro de Vol",
+        "form_landing": "📉 Taux Atterrissage",
+        "form_time_dep": "🕒 Heure Départ (UTC)",
+        "form_time_arr": "🕒 Heure Arrivée (UTC)",
+        "form_date_dep": "📅 Date de Départ",
+        "form_date_arr": "📅 Date d'Arrivée",
+        "metar_title": "Météo Aéronautique",
+        "metar_desc": "Bulletin en temps réel & Décodage rapide.",
+        "metar_label": "Rechercher un aéroport (Code OACI)",
+        "metar_btn": "🔍 Analyser Météo",
+        "metar_raw": "Bulletin Brut (Source NOAA)",
+        "metar_decoded": "Données Clés",
+        "checklist_title": "Checklists Normales",
+        "checklist_info": "⚠️ MODULE EN DÉVELOPPEMENT : Cette checklist interactive est actuellement en phase de test (BETA). Elle couvre les types de la flotte (A320, A350, B787, ATR 72, Q400) et sera amenée à évoluer prochainement avec de nouvelles fonctionnalités.",
+        "checklist_complete": "✅ CHECKLIST COMPLETED",
+        "checklist_reset": "🔄 Réinitialiser la Checklist",
+        "checklist_aircraft": "Appareil",
+        "checklist_progress": "Progression",
+        "metrics_title": "Performances du Crew Center",
+        "metrics_desc": "Temps par appel externe et par rendu de page depuis le démarrage du serveur.",
+        "metrics_feeds": "Flux fsHub",
+        "metrics_components": "Compteurs des composants",
+        "metrics_dump": "Export Prometheus",
+        "metrics_empty": "Aucune mesure pour le moment.",
+        "staff_only": "⛔ Page réservée au Staff.",
+        "profile_title": "Mon Espace Pilote",
+        "profile_career": "Ma Carrière",
+        "profile_flights": "Mes Derniers Vols",
+        "profile_grade": "Grade Actuel",
+        "profile_hours": "Mes Heures",
+        "career_flights": "Vols (historique)",
+        "career_hours": "Heures bloc",
+        "career_landing": "Landing moyen",
+        "career_streak": "Meilleure série (jours)",
+        "career_details": "📊 Détails de carrière",
+        "landing_hard": "durs",
+        "landing_distribution": "📉 Distribution des atterrissages",
+        "landing_no_data": "Aucun atterrissage enregistré pour le moment",
+        "logout": "Déconnexion",
+        "ext_tools": "Outils Externes",
+        "lang_select": "Langue / Language",
+        "email_success": "✅ Message transmis, envoi au Staff en cours !",
+        "mail_status": "📤 Mes envois",
+        "mail_states": {"queued": "⏳ En attente", "sending": "📨 Envoi…", "sent": "✅ Envoyé", "failed": "❌ Échec"},
+        "email_error": "❌ Erreur lors de l'envoi : "
+    },
+    "EN": {
+        "menu_home": "🏠 Home",
+        "menu_profile": "👤 My Profile",
+        "menu_briefing": "✈️ Briefing Room",
+        "menu_events": "📅 Events",
+        "menu_roster": "👨‍✈️ Pilot Roster",
+        "menu_radar": "🌍 Live Radar",
+        "menu_pirep": "📝 Manual PIREP",
+        "menu_metar": "🌦️ Weather / METAR",
+        "menu_tours": "🏆 Tour Validation",
+        "menu_checklist": "📋 Checklist (BETA)",
+        "menu_contact": "📞 Contact",
+        "menu_metrics": "📈 Metrics (Staff)",
+        "title_home": "Ia Ora Na",
+        "stats_pilots": "Active Pilots",
+        "stats_hours": "Total Hours",
+        "stats_flights": "Flights Flown",
+        "stats_landing": "Avg Landing",
+        "leaderboard_title": "🏆 Top 3 - Flight Hours",
+        "leaderboard_more": "📊 More rankings",
+        "leaderboard_flights": "✈️ Flights",
+        "leaderboard_landing": "🛬 Avg landing (min. 3 flights)",
+        "leaderboard_month": "📅 Flights this month",
+        "leaderboard_empty": "No synced flights yet.",
+        "recent_flights": "✈️ Recent Flights (Global)",
+        "demo_mode": "ℹ️ Demo Mode (Simulated Data)",
+        "event_title": "Upcoming Events",
+        "event_next": "📅 Next event",
+        "event_none": "No event scheduled yet.",
+        "event_past": "Past events",
+        "event_mine": "🗓️ My events",
+        "event_full": "Full",
+        "event_my_status": "My status",
+        "months_short": ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"],
+        "roster_title": "ATN-Virtual Team",
+        "roster_inactive": "⛔ INACTIVE",
+        "roster_sync": "Data synced with fsHub",
+        "roster_search": "Search (callsign or name)",
+        "roster_grade": "Rank",
+        "roster_role": "Role",
+        "roster_all": "All",
+        "roster_page": "Page",
+        "roster_results": "pilot(s)",
+        "roster_none": "No pilot matches the search.",
+        "briefing_title": "Flight Dispatch Center",
+        "briefing_desc": "Prepare your rotation: Weather, Forecasts, and Flight Plan.",
+        "briefing_dep": "🛫 Departure (ICAO)",
+        "briefing_arr": "🛬 Arrival (ICAO)",
+        "briefing_ac": "✈️ Aircraft",
+        "briefing_eta": "🕒 Arrival ETA (UTC)",
+        "briefing_eta_fcst": "Forecast at ETA",
+        "briefing_btn": "📡 ANALYZE ROUTE",
+        "briefing_simbrief": "🚀 GENERATE OFP (SimBrief)",
+        "pirep_title": "📝 Submit Manual PIREP",
+        "pirep_intro": "Backup Form",
+        "pirep_warn": "This form is intended for pilots experiencing technical issues with the tracking client (LRM). Please use the automated client whenever possible for data accuracy.",
+        "pirep_send": "📤 SUBMIT REPORT",
+        "pirep_saved": "✅ PIREP saved, awaiting Staff review.",
+        "pirep_duplicate": "ℹ️ This flight is already in the fsHub history: no need to report it.",
+        "pirep_mine": "🗂️ My PIREPs",
+        "pirep_queue": "🛂 PIREPs to review",
+        "pirep_approve": "✅ Approve",
+        "pirep_reject": "❌ Reject",
+        "pirep_states": {"pending": "⏳ Pending", "approved": "✅ Approved", "rejected": "❌ Rejected", "duplicate": "🔁 fsHub duplicate"},
+        "contact_title": "Contact Us",
+        "contact_desc": "Any questions? Suggestions? The Staff is here to help.",
+        "contact_send": "📤 SEND MESSAGE",
+        "form_subject": "Subject",
+        "form_msg": "Your detailed message...",
+        "form_dep": "🛫 Departure (ICAO)",
+        "form_arr": "🛬 Arrival (ICAO)",
+        "form_aircraft": "✈️ Aircraft Type",
+        "form_flight_nb": "🔢 Flight Number",
+        "form_landing": "📉 Landing Rate",
+        "form_time_dep": "🕒 Dep Time (UTC)",
+        "form_time_arr": "🕒 Arr Time (UTC)",
+        "form_date_dep": "📅 Departure Date",
+        "form_date_arr": "📅 Arrival Date",
+        "metar_title": "Aviation Weather",
+        "metar_desc": "Real-time bulletin & Quick decode.",
+        "metar_label": "Search Airport (ICAO Code)",
+        "metar_btn": "🔍 Analyze Weather",
+        "metar_raw": "Raw Bulletin (NOAA Source)",
+        "metar_decoded": "Key Data",
+        "checklist_title": "Normal Checklists",
+        "checklist_info": "⚠️ UNDER DEVELOPMENT: This interactive checklist is currently in BETA testing phase. It covers the fleet types (A320, A350, B787, ATR 72, Q400) and will evolve soon with new features.",
+        "checklist_complete": "✅ CHECKLIST COMPLETED",
+        "checklist_reset": "🔄 Reset Checklist",
+        "checklist_aircraft": "Aircraft",
+        "checklist_progress": "Progress",
+        "metrics_title": "Crew Center Performance",
+        "metrics_desc": "Time per upstream call and per page render since the server started.",
+        "metrics_feeds": "fsHub feeds",
+        "metrics_components": "Component counters",
+        "metrics_dump": "Prometheus export",
+        "metrics_empty": "No measurements yet.",
+        "staff_only": "⛔ Staff only page.",
+        "profile_title": "My Pilot Area",
+        "profile_career": "My Career",
+        "profile_flights": "My Last Flights",
+        "profile_grade": "Current Rank",
+        "profile_hours": "My Hours",
+        "career_flights": "Flights (history)",
+        "career_hours": "Block hours",
+        "career_landing": "Avg landing",
+        "career_streak": "Best streak (days)",
+        "career_details": "📊 Career details",
+        "landing_hard": "hard",
+        "landing_distribution": "📉 Landing distribution",
+        "landing_no_data": "No landing recorded yet",
+        "logout": "Logout",
+        "ext_tools": "External Tools",
+        "lang_select": "Langue / Language",
+        "email_success": "✅ Message queued for delivery to the Staff!",
+        "mail_status": "📤 My messages",
+        "mail_states": {"queued": "⏳ Queued", "sending": "📨 Sending…", "sent": "✅ Sent", "failed": "❌ Failed"},
+        "email_error": "❌ Error sending email: "
+    },
+    "ES": {
+        "menu_home": "🏠 Inicio",
+        "menu_profile": "👤 Mi Perfil",
+        "menu_briefing": "✈️ Briefing Room",
+        "menu_events": "📅 Eventos",
+        "menu_roster": "👨‍✈️ Lista de Pilotos",
+        "menu_radar": "🌍 Radar en Vivo",
+        "menu_pirep": "📝 PIREP Manual",
+        "menu_metar": "🌦️ Clima / METAR",
+        "menu_tours": "🏆 Validación Tours",
+        "menu_checklist": "📋 Checklist (BETA)",
+        "menu_contact": "📞 Contacto",
+        "menu_metrics": "📈 Métricas (Staff)",
+        "title_home": "Ia Ora Na",
+        "stats_pilots": "Pilotos Activos",
+        "stats_hours": "Horas Totales",
+        "stats_flights": "Vuelos Realizados",
+        "stats_landing": "Aterrizaje Prom.",
+        "leaderboard_title": "🏆 Top 3 - Horas de Vuelo",
+        "leaderboard_more": "📊 Otras clasificaciones",
+        "leaderboard_flights": "✈️ Vuelos",
+        "leaderboard_landing": "🛬 Aterrizaje prom. (mín. 3 vuelos)",
+        "leaderboard_month": "📅 Vuelos del mes",
+        "leaderboard_empty": "Aún no hay vuelos sincronizados.",
+        "recent_flights": "✈️ Vuelos Recientes",
+        "demo_mode": "ℹ️ Modo Demo (Datos simulados)",
+        "event_title": "Próximos Eventos",
+        "event_next": "📅 Próximo evento",
+        "event_none": "No hay eventos programados por ahora.",
+        "event_past": "Eventos pasados",
+        "event_mine": "🗓️ Mis eventos",
+        "event_full": "Completo",
+        "event_my_status": "Mi estado",
+        "months_short": ["ENE", "FEB", "MAR", "ABR", "MAY", "JUN", "JUL", "AGO", "SEP", "OCT", "NOV", "DIC"],
+        "roster_title": "Equipo ATN-Virtual",
+        "roster_inactive": "⛔ INACTIVO",
+        "roster_sync": "Datos sincronizados con fsHub",
+        "roster_search": "Buscar (indicativo o nombre)",
+        "roster_grade": "Rango",
+        "roster_role": "Rol",
+        "roster_all": "Todos",
+        "roster_page": "Página",
+        "roster_results": "piloto(s)",
+        "roster_none": "Ningún piloto coincide con la búsqueda.",
+        "briefing_title": "Preparación de Vuelo",
+        "briefing_desc": "Prepara tu rotación: Clima, Pronósticos y Plan de Vuelo.",
+        "briefing_dep": "Aeropuerto de Salida",
+        "briefing_arr": "Aeropuerto de Llegada",
+        "briefing_ac": "Tipo de Avión",
+        "briefing_eta": "🕒 ETA Llegada (UTC)",
+        "briefing_eta_fcst": "Pronóstico a la ETA",
+        "briefing_btn": "Generar Briefing",
+        "briefing_simbrief": "🚀 Abrir en SimBrief",
+        "pirep_title": "📝 Enviar PIREP Manual",
+        "pirep_intro": "Formulario de Respaldo",
+        "pirep_warn": "Este formulario está reservado para pilotos con problemas técnicos en el cliente (LRM). Se recomienda usar el cliente automático para mayor precisión.",
+        "pirep_send": "📤 ENVIAR REPORTE",
+        "pirep_saved": "✅ PIREP guardado, pendiente de validación por el Staff.",
+        "pirep_duplicate": "ℹ️ Este vuelo ya está en el historial de fsHub: no es necesario declararlo.",
+        "pirep_mine": "🗂️ Mis PIREP",
+        "pirep_queue": "🛂 PIREP por validar",
+        "pirep_approve": "✅ Validar",
+        "pirep_reject": "❌ Rechazar",
+        "pirep_states": {"pending": "⏳ Pendiente", "approved": "✅ Validado", "rejected": "❌ Rechazado", "duplicate": "🔁 Duplicado fsHub"},
+        "contact_title": "Contáctanos",
+        "contact_desc": "¿Necesitas ayuda? Rellena este formulario.",
+        "contact_send": "📤 ENVIAR SOLICITUD",
+        "form_subject": "Asunto",
+        "form_msg": "Mensaje",
+        "form_dep": "🛫 Salida (OACI)",
+        "form_arr": "🛬 Llegada (OACI)",
+        "form_aircraft": "✈️ Tipo Avión",
+        "form_flight_nb": "🔢 Número Vuelo",
+        "form_landing": "📉 Tasa Aterrizaje",
+        "form_time_dep": "🕒 Hora Salida (UTC)",
+        "form_time_arr": "🕒 Hora Llegada (UTC)",
+        "form_date_dep": "📅 Fecha Salida",
+        "form_date_arr": "📅 Fecha Llegada",
+        "metar_title": "Clima Aeronáutico",
+        "metar_desc": "Boletín en tiempo real y decodificación rápida.",
+        "metar_label": "Buscar Aeropuerto (Código OACI)",
+        "metar_btn": "🔍 Analizar Clima",
+        "metar_raw": "Boletín Bruto (Fuente NOAA)",
+        "metar_decoded": "Datos Clave",
+        "checklist_title": "Checklists Normales",
+        "checklist_info": "⚠️ EN DESARROLLO: Esta checklist interactiva está en fase BETA. Cubre los tipos de la flota (A320, A350, B787, ATR 72, Q400) y evolucionará pronto.",
+        "checklist_complete": "✅ CHECKLIST COMPLETED",
+        "checklist_reset": "🔄 Reiniciar Checklist",
+        "checklist_aircraft": "Avión",
+        "checklist_progress": "Progreso",
+        "metrics_title": "Rendimiento del Crew Center",
+        "metrics_desc": "Tiempo por llamada externa y por renderizado de página desde el arranque del servidor.",
+        "metrics_feeds": "Flujos fsHub",
+        "metrics_components": "Contadores de componentes",
+        "metrics_dump": "Exportación Prometheus",
+        "metrics_empty": "Sin mediciones por ahora.",
+        "staff_only": "⛔ Página reservada al Staff.",
+        "profile_title": "Mi Zona Piloto",
+        "profile_career": "Mi Carrera",
+        "profile_flights": "Mis Últimos Vuelos",
+        "profile_grade": "Rango Actual",
+        "profile_hours": "Mis Horas",
+        "career_flights": "Vuelos (historial)",
+        "career_hours": "Horas bloque",
+        "career_landing": "Aterrizaje prom.",
+        "career_streak": "Mejor racha (días)",
+        "career_details": "📊 Detalles de carrera",
+        "landing_hard": "duros",
+        "landing_distribution": "📉 Distribución de aterrizajes",
+        "landing_no_data": "Ningún aterrizaje registrado por ahora",
+        "logout": "Cerrar Sesión",
+        "ext_tools": "Herramientas Externas",
+        "lang_select": "Langue / Language",
+        "email_success": "✅ ¡Mensaje en cola de envío al Staff!",
+        "mail_status": "📤 Mis envíos",
+        "mail_states": {"queued": "⏳ En espera", "sending": "📨 Enviando…", "sent": "✅ Enviado", "failed": "❌ Error"},
+        "email_error": "❌ Error al enviar: "
+    }
+}
+
+def T(key): return TRANS[st.session_state['lang']][key]
@@ -0,0 +1,70 @@
+import heapq
+import threading
+from dataclasses import dataclass
+
+# --- CLASSEMENTS ---
+# Les agrégats par pilote sont mis à jour quand un nouvel instantané arrive (thread de rafraîchissement) ;
+# les vues top-K sont recalculées par sélection sur tas et publiées comme tuples immuables.
+MIN_FLIGHTS_LANDING = 3
+
+
+@dataclass(frozen=True, slots=True)
+class LeaderEntry:
+    callsign: str
+    value: float
+    display: str
+
+
+class Leaderboard:
+    def __init__(self, k=10):
+        self.k = k
+        self._hours = {}            # callsign -> (heures, texte)
+        self._flights = {}          # callsign -> (nb vols, somme fpm, nb fpm, {AAAA-MM: nb vols})
+        self._views = {}            # nom de vue -> tuple(LeaderEntry)
+        self._lock = threading.Lock()
+        self.ready = False
+        self.version = 0            # incrémenté à chaque publication de vues
+
+    def view(self, name, k=None):
+        entries = self._views.get(name, ())
+        return entries[:k] if k else entries
+
+    def months(self):
+        return sorted((v[6:] for v in self._views if v.startswith("month:")), reverse=True)
+
+    def update_hours(self, pilot_index):
+        with self._lock:
+            self._hours = {cs: (p.hours, p.raw) for cs, p in pilot_index.items()}
+            best = heapq.nlargest(self.k, self._hours.items(), key=lambda item: item[1][0])
+            self._views["hours"] = tuple(LeaderEntry(cs, h, raw) for cs, (h, raw) in best)
+            self.ready = True
+            self.version += 1
+
+    def update_pilot_flights(self, callsign, flights):
+        # Seul l'agrégat du pilote concerné est recalculé
+        landings = [f.landing_fpm for f in flights if f.landing_fpm is not None]
+        per_month = {}
+        for f in flights:
+            if f.day is not None:
+                key = f"{f.day:%Y-%m}"
+                per_month[key] = per_month.get(key, 0) + 1
+        with self._lock:
+            previous = self._flights.get(callsign)
+            self._flights[callsign] = (len(flights), sum(landings), len(landings), per_month)
+            self._rank_flights(set(per_month) | set(previous[3] if previous else ()))
+            self.version += 1
+
+    def _rank_flights(self, months):
+        items = self._flights.items()
+        best = heapq.nlargest(self.k, items, key=lambda item: item[1][0])
+        self._views["flights"] = tuple(LeaderEntry(cs, agg[0], str(agg[0])) for cs, agg in best if agg[0])
+        rated = ((cs, agg[1] / agg[2]) for cs, agg in items if agg[2] >= MIN_FLIGHTS_LANDING)
+        softest = heapq.nsmallest(self.k, rated, key=lambda item: abs(item[1]))
+        self._views["landing"] = tuple(LeaderEntry(cs, avg, f"{avg:.0f} fpm") for cs, avg in softest)
+        for month in months:
+            counts = ((cs, agg[3].get(month, 0)) for cs, agg in items)
+            best = heapq.nlargest(self.k, counts, key=lambda item: item[1])
+            self._views["month:" + month] = tuple(LeaderEntry(cs, n, str(n)) for cs, n in best if n)
+
+
+LEADERBOARD = Leaderboard()
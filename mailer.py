@@ -0,0 +1,176 @@
+import os
+import smtplib
+import sqlite3
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from flights import DATA_DIR
+from metrics import METRICS
+
+# --- FILE D'ENVOI DES E-MAILS ---
+# Les pages déposent le message dans une file SQLite (survit à un redémarrage) et rendent la main tout de suite.
+# Un thread vide la file par lots sur une session SMTP authentifiée gardée ouverte entre deux lots ;
+# en cas d'échec le message est reprogrammé avec un délai exponentiel.
+QUEUED, SENDING, SENT, FAILED = "queued", "sending", "sent", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt);
+"""
+
+
+class MailQueue:
+    # settings : smtp_server, smtp_port, username, password, receiver_email (+ starttls, True par défaut)
+    def __init__(self, path, settings=None, batch=20, max_attempts=6, backoff=30, max_backoff=3600, idle_timeout=120):
+        if path != ":memory:": os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        # Messages interrompus en plein envoi par un arrêt du process : on les remet en file
+        with self._db:
+            self._db.execute("UPDATE outbox SET status = ? WHERE status = ?", (QUEUED, SENDING))
+        self.settings = settings
+        self.batch = batch
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._smtp = None
+        self._smtp_used = 0
+        self.stats = {"sent": 0, "retries": 0, "failed": 0, "connections": 0, "batches": 0}
+
+    def configure(self, settings):
+        with self._lock:
+            if self.settings is None: self.settings = dict(settings)
+
+    def _query(self, sql, args=()):
+        with self._lock, self._db:
+            return self._db.execute(sql, args).fetchall()
+
+    def enqueue(self, subject, body):
+        now = time.time()
+        with self._lock, self._db:
+            msg_id = self._db.execute("INSERT INTO outbox (subject, body, status, next_attempt, created_at) VALUES (?, ?, ?, ?, ?)",
+                                      (subject, body, QUEUED, now, now)).lastrowid
+        self._wake.set()
+        return msg_id
+
+    def status(self, msg_id):
+        rows = self._query("SELECT id, subject, status, attempts, last_error, created_at, sent_at FROM outbox WHERE id = ?", (msg_id,))
+        return rows[0] if rows else None
+
+    def statuses(self, ids):
+        if not ids: return []
+        marks = ",".join("?" * len(ids))
+        return self._query(f"SELECT id, subject, status, attempts, last_error, created_at, sent_at FROM outbox WHERE id IN ({marks}) ORDER BY id DESC", tuple(ids))
+
+    def pending(self):
+        return self._query("SELECT COUNT(*) FROM outbox WHERE status = ?", (QUEUED,))[0][0]
+
+    # --- SESSION SMTP ---
+    def _connection(self):
+        # Connexion réutilisée tant qu'elle répond et n'est pas restée inactive trop longtemps
+        if self._smtp is not None and time.time() - self._smtp_used < self.idle_timeout:
+            try:
+                if self._smtp.noop()[0] == 250: return self._smtp
+            except smtplib.SMTPException: pass
+            except OSError: pass
+        self._close()
+        cfg = self.settings
+        server = smtplib.SMTP(cfg["smtp_server"], int(cfg["smtp_port"]), timeout=30)
+        if cfg.get("starttls", True): server.starttls()
+        if cfg.get("username") and cfg.get("password"): server.login(cfg["username"], cfg["password"])
+        self._smtp = server
+        self.stats["connections"] += 1
+        return server
+
+    def _close(self):
+        if self._smtp is None: return
+        try: self._smtp.quit()
+        except Exception: pass
+        self._smtp = None
+
+    def _message(self, row):
+        msg = MIMEMultipart()
+        msg['From'] = self.settings["username"]
+        msg['To'] = self.settings["receiver_email"]
+        msg['Subject'] = row['subject']
+        msg.attach(MIMEText(row['body'], 'plain'))
+        return msg
+
+    # --- VIDAGE ---
+    def drain_once(self):
+        # Un lot de messages échus ; retourne le nombre de messages traités
+        if self.settings is None: return 0
+        now = time.time()
+        with self._lock, self._db:
+            rows = self._db.execute("SELECT * FROM outbox WHERE status = ? AND next_attempt <= ? ORDER BY id LIMIT ?",
+                                    (QUEUED, now, self.batch)).fetchall()
+            self._db.executemany("UPDATE outbox SET status = ? WHERE id = ?", [(SENDING, r['id']) for r in rows])
+        if not rows: return 0
+        self.stats["batches"] += 1
+        for row in rows:
+            try:
+                with METRICS.time("smtp.send"): self._connection().send_message(self._message(row))
+                self._smtp_used = time.time()
+            except Exception as e:
+                # Connexion suspecte : on la referme, le message suivant en rouvrira une
+                self._close()
+                self._failed(row, e)
+                continue
+            self._query("UPDATE outbox SET status = ?, attempts = attempts + 1, sent_at = ?, last_error = NULL WHERE id = ?",
+                        (SENT, time.time(), row['id']))
+            self.stats["sent"] += 1
+        return len(rows)
+
+    def _failed(self, row, error):
+        attempts = row['attempts'] + 1
+        error = str(error) or type(error).__name__
+        if attempts >= self.max_attempts:
+            self._query("UPDATE outbox SET status = ?, attempts = ?, last_error = ? WHERE id = ?", (FAILED, attempts, error, row['id']))
+            self.stats["failed"] += 1
+            return
+        delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+        self._query("UPDATE outbox SET status = ?, attempts = ?, last_error = ?, next_attempt = ? WHERE id = ?",
+                    (QUEUED, attempts, error, time.time() + delay, row['id']))
+        self.stats["retries"] += 1
+
+    def _next_due(self):
+        rows = self._query("SELECT MIN(next_attempt) FROM outbox WHERE status = ?", (QUEUED,))
+        return rows[0][0]
+
+    def _loop(self):
+        while True:
+            try:
+                while self.drain_once(): pass
+            except Exception: pass
+            due = self._next_due()
+            wait = self.idle_timeout if due is None else min(max(due - time.time(), 0.5), self.idle_timeout)
+            if not self._wake.wait(wait) and self._smtp is not None and time.time() - self._smtp_used >= self.idle_timeout:
+                self._close()
+            self._wake.clear()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive(): return
+            self._thread = threading.Thread(target=self._loop, name="mail-queue", daemon=True)
+            self._thread.start()
+
+
+MAIL_QUEUE = MailQueue(os.path.join(DATA_DIR, "outbox.sqlite3"))
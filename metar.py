@@ -0,0 +1,291 @@
+import re
+from dataclasses import dataclass, field
+
+# --- DECODEUR METAR ---
+# Une expression par type de groupe, réunies en une alternative : m.lastgroup donne le type en un passage.
+# Chaque jeton n'est essayé que sur les alternatives qui peuvent commencer par son premier caractère (même ordre,
+# donc même résultat que l'alternative complète), et le résultat décodé est mémorisé par jeton : les bulletins
+# répètent les mêmes groupes (9999, NOSIG, Q1013, FEW020...).
+_WX_DESC = "MI|PR|BC|DR|BL|SH|TS|FZ"
+_WX_PHEN = "DZ|RA|SN|SG|IC|PL|GR|GS|UP|BR|FG|FU|VA|DU|SA|HZ|PY|PO|SQ|FC|SS|DS"
+_DIGITS = "0123456789"
+_ALTERNATIVES = (
+    # (expression, premiers caractères possibles)
+    (r"(?P<time>(?P<day>\d{2})(?P<hour>\d{2})(?P<minute>\d{2})Z)", _DIGITS),
+    (r"(?P<wind>(?P<wdir>\d{3}|VRB)(?P<wspd>\d{2,3})(?:G(?P<wgst>\d{2,3}))?(?P<wunit>KT|MPS|KMH))", _DIGITS + "V"),
+    (r"(?P<wvar>(?P<vfrom>\d{3})V(?P<vto>\d{3}))", _DIGITS),
+    (r"(?P<vis>(?P<vism>\d{4})(?:N|NE|E|SE|S|SW|W|NW|NDV)?)", _DIGITS),
+    (r"(?P<vissm>(?P<smq>[PM])?(?:(?P<smn>\d+)/(?P<smd>\d+)|(?P<smi>\d+))SM)", _DIGITS + "PM"),
+    (r"(?P<cavok>CAVOK)", "C"),
+    (r"(?P<rvr>R(?P<rwy>\d{2}[LCR]?)/(?P<rvrval>[PM]?\d{4})(?:V(?P<rvrmax>[PM]?\d{4}))?(?P<rvrft>FT)?(?:/?[UDN])?)", "R"),
+    (r"(?P<cloud>(?P<cover>FEW|SCT|BKN|OVC|VV)(?P<height>\d{3}|///)(?P<ctype>CB|TCU|///)?)", "FSBOV"),
+    (r"(?P<sky>NSC|NCD|SKC|CLR|NSW)", "NSC"),
+    (r"(?P<temp>(?P<t>M?\d{2})/(?P<d>M?\d{2})?)", _DIGITS + "M"),
+    (r"(?P<qnh>Q(?P<hpa>\d{4}))", "Q"),
+    (r"(?P<alt>A(?P<inhg>\d{4}))", "A"),
+    (r"(?P<trend>NOSIG|BECMG|TEMPO)", "NBT"),
+    (r"(?P<wx>(?:[-+]|VC)?(?:(?:" + _WX_DESC + r")(?:" + _WX_PHEN + r")*|(?:" + _WX_PHEN + r")+))",
+     "-+V" + "".join({code[0] for code in (_WX_DESC + "|" + _WX_PHEN).split("|")})),
+    (r"(?P<recent>RE\w+)", "R"),
+    (r"(?P<auto>AUTO|COR)", "AC"),
+)
+_TOKEN = re.compile("|".join(pattern for pattern, _ in _ALTERNATIVES))
+_BY_FIRST_CHAR = {c: re.compile("|".join(pattern for pattern, chars in _ALTERNATIVES if c in chars)).fullmatch
+                  for c in set("".join(chars for _, chars in _ALTERNATIVES))}
+_STATION = re.compile(r"[A-Z][A-Z0-9]{3}")
+HPA_PER_INHG = 33.8639
+M_PER_SM = 1609.344
+
+
+@dataclass(slots=True)
+class Metar:
+    raw: str
+    station: str | None = None
+    day: int | None = None
+    hour: int | None = None
+    minute: int | None = None
+    auto: bool = False
+    wind_dir: int | None = None
+    wind_speed: int | None = None
+    wind_gust: int | None = None
+    wind_unit: str = "KT"
+    wind_variable: bool = False
+    wind_var_from: int | None = None
+    wind_var_to: int | None = None
+    visibility_m: int | None = None
+    cavok: bool = False
+    rvr: list = field(default_factory=list)        # (piste, mini, maxi, unité)
+    weather: list = field(default_factory=list)    # ex: "-SHRA", "VCTS"
+    clouds: list = field(default_factory=list)     # (couverture, hauteur ft, type)
+    temp_c: int | None = None
+    dewpoint_c: int | None = None
+    qnh_hpa: float | None = None
+    qnh_inhg: float | None = None
+    trends: list = field(default_factory=list)     # ex: "NOSIG", "TEMPO 4000 SHRA"
+
+    @property
+    def ceiling_ft(self):
+        return next((h for cover, h, _ in self.clouds if cover in ("BKN", "OVC", "VV") and h is not None), None)
+
+
+def _signed(txt):
+    return -int(txt[1:]) if txt[0] == "M" else int(txt)
+
+
+_TOKEN_CACHE_SIZE = 8192
+_TOKENS = {}
+_MISSING = object()
+
+
+def _parse_token(token):
+    # (type, valeur décodée) d'un jeton, None s'il n'est pas reconnu ; mémorisé dans _TOKENS (vidé quand il est plein)
+    fullmatch = _BY_FIRST_CHAR.get(token[0])
+    g = fullmatch(token) if fullmatch else None
+    if g is None: parsed = None
+    else:
+        kind = g.lastgroup
+        if kind == "time": value = (int(g["day"]), int(g["hour"]), int(g["minute"]))
+        elif kind == "wind":
+            variable = g["wdir"] == "VRB"
+            value = (None if variable else int(g["wdir"]), int(g["wspd"]), int(g["wgst"]) if g["wgst"] else None, g["wunit"], variable)
+        elif kind == "wvar": value = (int(g["vfrom"]), int(g["vto"]))
+        elif kind == "vis": value = int(g["vism"])
+        elif kind == "vissm": value = (int(g["smn"]) / int(g["smd"]), True) if g["smn"] else (int(g["smi"]), False)
+        elif kind == "rvr": value = (g["rwy"], g["rvrval"], g["rvrmax"], "FT" if g["rvrft"] else "M")
+        elif kind == "cloud":
+            value = (g["cover"], int(g["height"]) * 100 if g["height"] != "///" else None, g["ctype"] if g["ctype"] != "///" else None)
+        elif kind == "temp": value = (_signed(g["t"]), _signed(g["d"]) if g["d"] else None)
+        elif kind == "qnh": value = float(g["hpa"])
+        elif kind == "alt": value = int(g["inhg"]) / 100
+        else: value = None
+        parsed = (kind, value)
+    if len(_TOKENS) >= _TOKEN_CACHE_SIZE: _TOKENS.clear()
+    _TOKENS[token] = parsed
+    return parsed
+
+
+def decode_metar(raw_text, with_station=True):
+    # with_station=False : groupe de conditions sans en-tête (ex: groupe d'évolution d'un TAF)
+    m = Metar(raw=raw_text)
+    tokens = raw_text.split()
+    i = 0
+    if tokens and tokens[0] in ("METAR", "SPECI"): i = 1
+    if with_station and i < len(tokens) and _STATION.fullmatch(tokens[i]):
+        m.station = tokens[i]
+        i += 1
+    whole_sm = None
+    trend = None
+    for token in tokens[i:]:
+        if token == "RMK": break
+        if trend is not None:
+            # Tout ce qui suit BECMG/TEMPO appartient à la tendance
+            if token in ("BECMG", "TEMPO", "NOSIG"):
+                m.trends.append(" ".join(trend))
+                trend = [token]
+            else: trend.append(token)
+            continue
+        parsed = _TOKENS.get(token, _MISSING)
+        if parsed is _MISSING: parsed = _parse_token(token)
+        if parsed is None:
+            # "1 1/2SM" : la partie entière arrive dans un jeton séparé
+            whole_sm = int(token) if token.isdigit() and len(token) <= 2 else None
+            continue
+        kind, value = parsed
+        if kind == "time":
+            m.day, m.hour, m.minute = value
+        elif kind == "wind":
+            m.wind_dir, m.wind_speed, m.wind_gust, m.wind_unit, m.wind_variable = value
+        elif kind == "wvar":
+            m.wind_var_from, m.wind_var_to = value
+        elif kind == "vis":
+            if m.visibility_m is None: m.visibility_m = value
+        elif kind == "vissm":
+            miles, fraction = value
+            if fraction and whole_sm: miles += whole_sm
+            m.visibility_m = int(round(miles * M_PER_SM))
+        elif kind == "cavok":
+            m.cavok = True
+            m.visibility_m = 9999
+        elif kind == "rvr":
+            m.rvr.append(value)
+        elif kind == "cloud":
+            m.clouds.append(value)
+        elif kind == "temp":
+            m.temp_c, m.dewpoint_c = value
+        elif kind == "qnh":
+            m.qnh_hpa = value
+            m.qnh_inhg = round(value / HPA_PER_INHG, 2)
+        elif kind == "alt":
+            m.qnh_inhg = value
+            m.qnh_hpa = float(round(value * HPA_PER_INHG))
+        elif kind == "trend":
+            if token == "NOSIG": m.trends.append(token)
+            else: trend = [token]
+        elif kind == "wx":
+            m.weather.append(token)
+        elif kind == "auto":
+            m.auto = m.auto or token == "AUTO"
+        whole_sm = None
+    if trend is not None: m.trends.append(" ".join(trend))
+    return m
+
+
+def summarize(m):
+    # Valeurs affichées par les tuiles Vent / Temp / QNH
+    data = {"Wind": "N/A", "Temp": "N/A", "QNH": "N/A"}
+    if m.wind_speed is not None:
+        if m.wind_speed == 0: data["Wind"] = "CALM"
+        else:
+            direction = "VRB" if m.wind_variable else f"{m.wind_dir:03d}°"
+            gust = f"G{m.wind_gust}" if m.wind_gust else ""
+            data["Wind"] = f"{direction}/{m.wind_speed:02d}{gust} {m.wind_unit.lower()}"
+    if m.temp_c is not None:
+        data["Temp"] = f"{m.temp_c}°C / {m.dewpoint_c}°C" if m.dewpoint_c is not None else f"{m.temp_c}°C"
+    if m.qnh_hpa is not None: data["QNH"] = f"{m.qnh_hpa:.0f} hPa / {m.qnh_inhg:.2f}"
+    return data
+
+
+def metar_summary(raw_text):
+    try: return summarize(decode_metar(raw_text))
+    except: return {"Wind": "N/A", "Temp": "N/A", "QNH": "N/A"}
+
+
+# --- DECODAGE EN MASSE ---
+# Bulletins découpés en jetons (une ligne par jeton), jetons distincts factorisés puis décodés en une fois par
+# Series.str.extract avec l'alternative complète ; les valeurs sont redistribuées par index numpy et réduites par
+# bulletin avec les mêmes règles que decode_metar (dernière valeur gardée, première visibilité, partie entière
+# "1 1/2SM", arrêt à RMK et au premier BECMG/TEMPO).
+BATCH_COLUMNS = ("station", "day", "hour", "minute", "wind_dir", "wind_speed", "wind_gust", "visibility_m",
+                 "temp_c", "dewpoint_c", "qnh_hpa", "qnh_inhg", "ceiling_ft", "weather")
+_KINDS = ("time", "wind", "wvar", "vis", "vissm", "cavok", "rvr", "cloud", "sky", "temp", "qnh", "alt", "trend", "wx", "recent", "auto")
+_KIND = {name: i for i, name in enumerate(_KINDS)}          # type codé en entier (-1 : jeton non reconnu)
+
+
+def _decode_tokens(tokens):
+    # Valeurs par jeton distinct : un seul passage de l'expression par valeur, puis conversions vectorielles
+    import numpy as np
+    import pandas as pd
+    g = pd.Series(tokens, dtype=object).str.extract(f"^(?:{_TOKEN.pattern})$")
+    num = lambda col: pd.to_numeric(g[col], errors="coerce").to_numpy(dtype="float64")
+    signed = lambda col: pd.to_numeric(g[col].str.replace("M", "-", regex=False), errors="coerce").to_numpy(dtype="float64")
+    kind = np.full(len(g), -1, dtype=np.int8)
+    for name, code in _KIND.items(): kind[g[name].notna().to_numpy()] = code
+    fraction = g["smn"].notna().to_numpy()
+    miles = np.where(fraction, num("smn") / np.where(fraction, num("smd"), 1), num("smi"))
+    inhg, hpa = num("inhg") / 100, num("hpa")
+    alt = kind == _KIND["alt"]
+    return {
+        "kind": kind,
+        "day": num("day"), "hour": num("hour"), "minute": num("minute"),
+        "wind_dir": num("wdir"), "wind_speed": num("wspd"), "wind_gust": num("wgst"),
+        "vis": num("vism"), "miles": miles, "fraction": fraction,
+        "cover": g["cover"].to_numpy(dtype=object), "height": num("height") * 100,
+        "temp_c": signed("t"), "dewpoint_c": signed("d"),
+        # Comme decode_metar : groupe A -> pouces lus tels quels, hPa dérivés ; groupe Q -> l'inverse
+        "qnh_hpa": np.where(alt, np.round(inhg * HPA_PER_INHG), hpa), "qnh_inhg": np.where(alt, inhg, np.round(hpa / HPA_PER_INHG, 2)),
+    }
+
+
+def decode_batch(bulletins):
+    import numpy as np
+    import pandas as pd
+    n = len(bulletins)
+    tokens = pd.Series(bulletins, dtype=object).str.split().explode().dropna()
+    text = tokens.to_numpy(dtype=object)
+    bulletin = tokens.index.to_numpy()
+    position = tokens.groupby(level=0).cumcount().to_numpy()
+    codes, uniques = pd.factorize(tokens)
+    decoded = _decode_tokens(uniques)
+    kind = decoded["kind"][codes]
+
+    # En-tête : "METAR"/"SPECI" facultatif puis indicatif de station ; corps jusqu'au premier RMK / BECMG / TEMPO exclu
+    prefixed = np.zeros(n, dtype=bool)
+    prefixed[bulletin[(position == 0) & np.isin(uniques, ("METAR", "SPECI"))[codes]]] = True
+    offset = position - prefixed[bulletin]
+    is_station = (offset == 0) & pd.Series(uniques, dtype=object).str.fullmatch(_STATION.pattern).to_numpy(dtype=bool)[codes]
+    station = np.full(n, None, dtype=object)
+    station[bulletin[is_station]] = text[is_station]
+    stop = pd.Series(np.isin(uniques, ("RMK", "BECMG", "TEMPO"))[codes], index=tokens.index).groupby(level=0).cummax().to_numpy()
+    body = (offset >= 0) & ~is_station & ~stop
+
+    def rows(mask, keep):
+        # Une ligne par bulletin : dernière occurrence (affectation qui écrase) ou première
+        found = np.flatnonzero(mask & body)
+        return found[~pd.Index(bulletin[found]).duplicated(keep=keep)]
+
+    def spread(found, values):
+        # Valeurs par jeton distinct -> colonne par bulletin
+        out = np.full(n, np.nan)
+        out[bulletin[found]] = values[codes[found]]
+        return out
+
+    time_rows = rows(kind == _KIND["time"], "last")
+    wind_rows = rows(kind == _KIND["wind"], "last")
+    temp_rows = rows(kind == _KIND["temp"], "last")
+    qnh_rows = rows((kind == _KIND["qnh"]) | (kind == _KIND["alt"]), "last")
+    # Visibilité : dernière en miles / CAVOK, sinon premier groupe en mètres. "1 1/2SM" : partie entière prise sur le
+    # jeton précédent du même bulletin s'il est un entier isolé non reconnu
+    whole = np.zeros(len(text))
+    fractions = np.flatnonzero((kind == _KIND["vissm"]) & decoded["fraction"][codes] & (position > 0))
+    integer = np.array([(k == -1 and t.isdigit() and len(t) <= 2) for k, t in zip(kind[fractions - 1], text[fractions - 1])], dtype=bool)
+    whole[fractions[integer]] = [int(t) for t in text[fractions[integer] - 1]]
+    overriding = np.where(kind == _KIND["cavok"], 9999, np.round((decoded["miles"][codes] + whole) * M_PER_SM))
+    visibility = spread(rows(kind == _KIND["vis"], "first"), decoded["vis"])
+    overridden = rows((kind == _KIND["vissm"]) | (kind == _KIND["cavok"]), "last")
+    visibility[bulletin[overridden]] = overriding[overridden]
+    ceiling = spread(rows((kind == _KIND["cloud"]) & np.isin(decoded["cover"], ("BKN", "OVC", "VV"))[codes] & ~np.isnan(decoded["height"])[codes], "first"),
+                     decoded["height"])
+    wx = (kind == _KIND["wx"]) & body
+    weather = [""] * n
+    for b, token in zip(bulletin[wx].tolist(), text[wx].tolist()): weather[b] = f"{weather[b]} {token}" if weather[b] else token
+
+    ints = lambda values: pd.array(values, dtype="Float64").astype("Int64")
+    df = pd.DataFrame({"station": station.tolist(),
+                       "day": ints(spread(time_rows, decoded["day"])), "hour": ints(spread(time_rows, decoded["hour"])),
+                       "minute": ints(spread(time_rows, decoded["minute"])),
+                       "wind_dir": ints(spread(wind_rows, decoded["wind_dir"])), "wind_speed": ints(spread(wind_rows, decoded["wind_speed"])),
+                       "wind_gust": ints(spread(wind_rows, decoded["wind_gust"])), "visibility_m": ints(visibility),
+                       "temp_c": ints(spread(temp_rows, decoded["temp_c"])), "dewpoint_c": ints(spread(temp_rows, decoded["dewpoint_c"])),
+                       "qnh_hpa": spread(qnh_rows, decoded["qnh_hpa"]), "qnh_inhg": spread(qnh_rows, decoded["qnh_inhg"]), "ceiling_ft": ints(ceiling), "weather": weather})
+    df["spread_c"] = df["temp_c"] - df["dewpoint_c"]
+    return df
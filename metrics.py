@@ -0,0 +1,177 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# --- INSTRUMENTATION ---
+# Par nom de fonction : histogramme de latence (seaux cumulés façon Prometheus), nombre d'appels et d'erreurs,
+# succès / échecs de cache. Les exceptions de contrôle Streamlit (rerun, stop) ne dérivent pas d'Exception et
+# ne sont donc pas comptées comme erreurs.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    __slots__ = ("buckets", "count", "total", "errors", "hits", "misses")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)         # dernier seau : au-delà de 10 s
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def quantile(self, q):
+        # Borne haute du seau qui contient le quantile (None au-delà du dernier seau fini)
+        if not self.count: return None
+        target, seen = q * self.count, 0
+        for bound, n in zip(BUCKETS, self.buckets):
+            seen += n
+            if seen >= target: return bound
+        return None
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.name, time.perf_counter() - self.start,
+                              error=exc_type is not None and issubclass(exc_type, Exception))
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+        self._writer = None
+
+    def _metric(self, name):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, Metric())
+        return metric
+
+    def observe(self, name, seconds, error=False):
+        metric = self._metric(name)
+        with self._lock:
+            metric.buckets[bisect_left(BUCKETS, seconds)] += 1
+            metric.count += 1
+            metric.total += seconds
+            if error: metric.errors += 1
+
+    def cache(self, name, hit):
+        metric = self._metric(name)
+        with self._lock:
+            if hit: metric.hits += 1
+            else: metric.misses += 1
+
+    def time(self, name):
+        return _Timer(self, name)
+
+    def timed(self, name, error=None):
+        # error : prédicat sur le résultat pour les fonctions qui rendent un message au lieu de lever
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try: result = fn(*args, **kwargs)
+                except Exception:
+                    self.observe(name, time.perf_counter() - start, error=True)
+                    raise
+                self.observe(name, time.perf_counter() - start, error=bool(error and error(result)))
+                return result
+            return wrapper
+        return decorate
+
+    def collect(self, component, stats):
+        # Compteurs déjà tenus par un composant (dict ou fonction -> dict), relus à chaque export
+        self._collectors[component] = stats
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._metrics)
+
+    def components(self):
+        out = {}
+        for component, stats in self._collectors.items():
+            try: out[component] = dict(stats() if callable(stats) else stats)
+            except Exception: pass
+        return out
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+    # --- EXPORT PROMETHEUS (format texte 0.0.4) ---
+    def prometheus(self, prefix="atn"):
+        metrics = sorted(self.snapshot().items())
+        lines = [f"# HELP {prefix}_call_seconds Durée des appels et rendus instrumentés",
+                 f"# TYPE {prefix}_call_seconds histogram"]
+        for name, m in metrics:
+            if not m.count: continue
+            label = _label(name)
+            cumulative = 0
+            for bound, n in zip(BUCKETS + (float("inf"),), m.buckets):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{prefix}_call_seconds_bucket{{fn="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_call_seconds_sum{{fn="{label}"}} {m.total:.6f}')
+            lines.append(f'{prefix}_call_seconds_count{{fn="{label}"}} {m.count}')
+        lines += [f"# HELP {prefix}_call_errors_total Appels terminés en erreur", f"# TYPE {prefix}_call_errors_total counter"]
+        lines += [f'{prefix}_call_errors_total{{fn="{_label(name)}"}} {m.errors}' for name, m in metrics if m.count]
+        lines += [f"# HELP {prefix}_cache_requests_total Accès cache par fonction", f"# TYPE {prefix}_cache_requests_total counter"]
+        for name, m in metrics:
+            if m.hits or m.misses:
+                lines.append(f'{prefix}_cache_requests_total{{fn="{_label(name)}",result="hit"}} {m.hits}')
+                lines.append(f'{prefix}_cache_requests_total{{fn="{_label(name)}",result="miss"}} {m.misses}')
+        lines += [f"# HELP {prefix}_component_stat Compteurs internes des composants", f"# TYPE {prefix}_component_stat gauge"]
+        for component, stats in sorted(self.components().items()):
+            for stat, value in sorted(stats.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f'{prefix}_component_stat{{component="{_label(component)}",stat="{_label(stat)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        # Fichier lu par le textfile collector de node_exporter : écriture atomique (fichier temporaire + rename)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f: f.write(self.prometheus())
+        os.replace(tmp, path)
+
+    def start_writer(self, path, interval=15):
+        with self._lock:
+            if self._writer is not None and self._writer.is_alive(): return
+            self._writer = threading.Thread(target=self._write_loop, args=(path, interval), name="metrics-writer", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self, path, interval):
+        while True:
+            try: self.write_textfile(path)
+            except OSError: pass
+            time.sleep(interval)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = Registry()
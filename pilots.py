@@ -0,0 +1,61 @@
+import re
+import threading
+from dataclasses import dataclass
+
+# --- INDEX PILOTES ---
+# Construit une fois par instantané des heures fsHub : callsign -> heures déjà normalisées.
+_CALLSIGN = re.compile(r"\b[A-Z]{3}\d{3,5}\b")
+
+
+def parse_hours(h_str):
+    try: return float(str(h_str).lower().replace('h', '').replace(',', '').replace(' ', ''))
+    except: return 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class PilotHours:
+    callsign: str
+    hours: float
+    raw: str
+    fshub_id: str | None
+    fshub_name: str | None = None
+
+
+def build_pilot_index(roster, hours_map):
+    # Un passage sur les lignes fsHub (callsigns extraits du nom), puis un accès direct par pilote du roster
+    by_callsign = {}
+    without_callsign = []
+    for name, h in hours_map.items():
+        callsigns = _CALLSIGN.findall(name)
+        if not callsigns: without_callsign.append((name, h))
+        for callsign in callsigns:
+            by_callsign.setdefault(callsign, (name, h))
+    index = {}
+    for pilot in roster:
+        found = by_callsign.get(pilot['id'])
+        if found is None and without_callsign:
+            # Nom fsHub sans callsign reconnaissable : recherche par sous-chaîne comme avant
+            found = next(((name, h) for name, h in without_callsign if pilot['id'] in name), None)
+        name, raw = found if found else (None, pilot['default'])
+        index[pilot['id']] = PilotHours(pilot['id'], parse_hours(raw), raw, pilot.get('fshub_id'), name)
+    return index
+
+
+class PilotIndexCache:
+    def __init__(self):
+        self._state = (None, {})
+        self._lock = threading.Lock()
+
+    def get(self, version, roster, hours_map):
+        key = (version, id(roster), len(roster))
+        state = self._state
+        if state[0] != key:
+            with self._lock:
+                state = self._state
+                if state[0] != key:
+                    state = (key, build_pilot_index(roster, hours_map))
+                    self._state = state
+        return state[1]
+
+
+PILOT_INDEX = PilotIndexCache()
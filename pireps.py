@@ -0,0 +1,176 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from flights import DATA_DIR
+from fshub import FlightRow
+
+# --- PIREP MANUELS ---
+# Validation du formulaire -> stockage local indexé -> file de validation Staff. Un PIREP approuvé entre dans
+# l'historique des vols (FlightStore) et donc dans les statistiques, sans nouveau passage sur fsHub.
+PENDING, APPROVED, REJECTED, DUPLICATE = "pending", "approved", "rejected", "duplicate"
+_ICAO = re.compile(r"[A-Z][A-Z0-9]{3}")
+_HHMM = re.compile(r"(\d{1,2}):?(\d{2})\s*[zZ]?")
+MAX_BLOCK_MINUTES = 20 * 60
+
+
+class InvalidPirep(ValueError):
+    def __init__(self, errors):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+@dataclass(frozen=True, slots=True)
+class Pirep:
+    pilot: str
+    flight_nb: str
+    aircraft: str
+    dep: str
+    arr: str
+    off_block: datetime                 # UTC
+    on_block: datetime                  # UTC
+    landing_fpm: int
+    remarks: str = ""
+
+    @property
+    def block_minutes(self):
+        return int((self.on_block - self.off_block).total_seconds() // 60)
+
+    def flight_row(self):
+        return FlightRow(self.dep, self.arr, self.aircraft, self.landing_fpm, self.off_block.date(), self.block_minutes)
+
+
+def parse_utc(day, hhmm):
+    # "HH:MM", "HHMM" ou "HH:MMZ" le jour donné -> datetime UTC (None si illisible)
+    m = _HHMM.fullmatch((hhmm or "").strip())
+    if m is None: return None
+    hour, minute = int(m.group(1)), int(m.group(2))
+    if hour > 23 or minute > 59: return None
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=timezone.utc)
+
+
+def validate_pirep(pilot, flight_nb, aircraft, dep, arr, date_dep, time_dep, date_arr, time_arr, landing_fpm, remarks=""):
+    # Retourne un Pirep ou lève InvalidPirep avec la liste de toutes les erreurs
+    errors = []
+    dep, arr = (dep or "").strip().upper(), (arr or "").strip().upper()
+    if not (flight_nb or "").strip(): errors.append("Numéro de vol manquant")
+    if not _ICAO.fullmatch(dep): errors.append(f"Code OACI de départ invalide : '{dep}'")
+    if not _ICAO.fullmatch(arr): errors.append(f"Code OACI d'arrivée invalide : '{arr}'")
+    off_block, on_block = parse_utc(date_dep, time_dep), parse_utc(date_arr, time_arr)
+    if off_block is None: errors.append(f"Heure de départ invalide : '{time_dep}' (HH:MM UTC)")
+    if on_block is None: errors.append(f"Heure d'arrivée invalide : '{time_arr}' (HH:MM UTC)")
+    if off_block and on_block:
+        minutes = (on_block - off_block).total_seconds() / 60
+        if minutes <= 0: errors.append("L'arrivée doit être postérieure au départ")
+        elif minutes > MAX_BLOCK_MINUTES: errors.append("Temps bloc supérieur à 20 h")
+        if off_block > datetime.now(timezone.utc): errors.append("Vol dans le futur")
+    if not -3000 <= int(landing_fpm) <= 500: errors.append(f"Taux d'atterrissage improbable : {landing_fpm} fpm")
+    if errors: raise InvalidPirep(errors)
+    return Pirep(pilot, flight_nb.strip().upper(), aircraft, dep, arr, off_block, on_block, int(landing_fpm), (remarks or "").strip())
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pireps (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pilot TEXT NOT NULL,
+    flight_nb TEXT,
+    aircraft TEXT,
+    dep TEXT NOT NULL,
+    arr TEXT NOT NULL,
+    off_block TEXT NOT NULL,
+    on_block TEXT NOT NULL,
+    block_minutes INTEGER,
+    landing_fpm INTEGER,
+    remarks TEXT,
+    status TEXT NOT NULL,
+    duplicate_of INTEGER,
+    submitted_at REAL NOT NULL,
+    reviewed_by TEXT,
+    reviewed_at REAL,
+    flight_id INTEGER
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pireps_unique ON pireps (pilot, dep, arr, off_block);
+CREATE INDEX IF NOT EXISTS idx_pireps_status ON pireps (status, submitted_at);
+CREATE INDEX IF NOT EXISTS idx_pireps_pilot ON pireps (pilot, off_block);
+"""
+
+
+class PirepStore:
+    def __init__(self, path):
+        if path != ":memory:": os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _query(self, sql, args=()):
+        with self._lock, self._db:
+            return self._db.execute(sql, args).fetchall()
+
+    def _known_flight(self, flights, p):
+        # Vol déjà synchronisé depuis fsHub (même pilote, même route, jour de départ ou d'arrivée)
+        for day in {p.off_block.date(), p.on_block.date()}:
+            found = flights.find(p.pilot, p.dep, p.arr, day)
+            if found is not None: return found['flight_id']
+        return None
+
+    def submit(self, p, flights):
+        # -> (id, statut) ; un PIREP déjà soumis (même pilote, route et heure bloc) n'est pas dupliqué
+        duplicate_of = self._known_flight(flights, p)
+        status = DUPLICATE if duplicate_of is not None else PENDING
+        with self._lock, self._db:
+            cur = self._db.execute(
+                "INSERT OR IGNORE INTO pireps (pilot, flight_nb, aircraft, dep, arr, off_block, on_block, block_minutes, landing_fpm, "
+                "remarks, status, duplicate_of, submitted_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (p.pilot, p.flight_nb, p.aircraft, p.dep, p.arr, p.off_block.isoformat(), p.on_block.isoformat(), p.block_minutes,
+                 p.landing_fpm, p.remarks, status, duplicate_of, time.time()))
+            if cur.rowcount: return cur.lastrowid, status
+            row = self._db.execute("SELECT id, status FROM pireps WHERE pilot = ? AND dep = ? AND arr = ? AND off_block = ?",
+                                   (p.pilot, p.dep, p.arr, p.off_block.isoformat())).fetchone()
+        return row['id'], row['status']
+
+    def get(self, pirep_id):
+        rows = self._query("SELECT * FROM pireps WHERE id = ?", (pirep_id,))
+        return rows[0] if rows else None
+
+    def queue(self, limit=50):
+        return self._query("SELECT * FROM pireps WHERE status = ? ORDER BY submitted_at LIMIT ?", (PENDING, limit))
+
+    def pending_count(self):
+        return self._query("SELECT COUNT(*) FROM pireps WHERE status = ?", (PENDING,))[0][0]
+
+    def pilot_reports(self, pilot, limit=10):
+        return self._query("SELECT * FROM pireps WHERE pilot = ? ORDER BY off_block DESC LIMIT ?", (pilot, limit))
+
+    def _review(self, pirep_id, status, reviewer, duplicate_of=None):
+        # Transition unique depuis "pending" : deux membres du Staff ne peuvent pas traiter le même PIREP
+        with self._lock, self._db:
+            return self._db.execute("UPDATE pireps SET status = ?, reviewed_by = ?, reviewed_at = ?, duplicate_of = ? "
+                                    "WHERE id = ? AND status = ?",
+                                    (status, reviewer, time.time(), duplicate_of, pirep_id, PENDING)).rowcount
+
+    def approve(self, pirep_id, reviewer, flights):
+        # Revérifie le doublon (fsHub a pu synchroniser le vol entre-temps) puis ajoute le vol à l'historique
+        row = self.get(pirep_id)
+        if row is None or row['status'] != PENDING: return None
+        p = Pirep(row['pilot'], row['flight_nb'], row['aircraft'], row['dep'], row['arr'], datetime.fromisoformat(row['off_block']),
+                  datetime.fromisoformat(row['on_block']), row['landing_fpm'], row['remarks'])
+        duplicate_of = self._known_flight(flights, p)
+        if duplicate_of is not None:
+            self._review(pirep_id, DUPLICATE, reviewer, duplicate_of=duplicate_of)
+            return DUPLICATE
+        if not self._review(pirep_id, APPROVED, reviewer): return None
+        flight_id = flights.add(p.pilot, p.flight_row())
+        self._query("UPDATE pireps SET flight_id = ? WHERE id = ?", (flight_id, pirep_id))
+        return APPROVED
+
+    def reject(self, pirep_id, reviewer):
+        return REJECTED if self._review(pirep_id, REJECTED, reviewer) else None
+
+
+PIREP_STORE = PirepStore(os.path.join(DATA_DIR, "pireps.sqlite3"))
@@ -0,0 +1,66 @@
+from bisect import bisect_left
+
+from content import ROSTER_DATA
+
+# --- ANNUAIRE DES PILOTES ---
+# Index construits une fois par process : accès direct par callsign et par id fsHub, positions par grade et par
+# rôle, clés triées (callsign + mots du nom) pour la recherche par préfixe. Une recherche ne touche que les
+# entrées trouvées et l'affichage ne parcourt que la page demandée.
+class Roster:
+    def __init__(self, rows):
+        self.rows = sorted(rows, key=lambda p: p['id'])
+        self.by_callsign = {p['id']: p for p in self.rows}
+        self.by_fshub = {p['fshub_id']: p['id'] for p in self.rows if p['fshub_id']}
+        self.by_grade = {}
+        self.by_role = {}
+        keys = []
+        for pos, p in enumerate(self.rows):
+            self.by_grade.setdefault(p['grade'], set()).add(pos)
+            self.by_role.setdefault(p['role'], set()).add(pos)
+            keys.append((p['id'].casefold(), pos))
+            keys.extend((word.casefold(), pos) for word in p['nom'].split())
+        keys.sort()
+        self._keys = [k for k, _ in keys]
+        self._key_pos = [pos for _, pos in keys]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get(self, callsign, default=None):
+        return self.by_callsign.get(callsign, default)
+
+    def callsign_for(self, fshub_id):
+        return self.by_fshub.get(fshub_id)
+
+    @property
+    def grades(self):
+        return sorted(self.by_grade)
+
+    @property
+    def roles(self):
+        return sorted(self.by_role)
+
+    def _prefix(self, prefix):
+        prefix = prefix.casefold()
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\U0010ffff", lo)
+        return set(self._key_pos[lo:hi])
+
+    def search(self, query="", grade=None, role=None):
+        # Chaque mot de la requête doit préfixer le callsign ou un mot du nom ; résultats dans l'ordre du roster
+        sets = [self._prefix(word) for word in (query or "").split()]
+        if grade: sets.append(self.by_grade.get(grade, set()))
+        if role: sets.append(self.by_role.get(role, set()))
+        if not sets: return self.rows
+        sets.sort(key=len)
+        return [self.rows[pos] for pos in sorted(sets[0].intersection(*sets[1:]))]
+
+
+def paginate(rows, page, size):
+    # -> (lignes de la page, nombre de pages) ; page numérotée à partir de 1 et ramenée dans les bornes
+    pages = max(-(-len(rows) // size), 1)
+    page = min(max(page, 1), pages)
+    return rows[(page - 1) * size:page * size], pages
+
+
+ROSTER = Roster(ROSTER_DATA)
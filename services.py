@@ -0,0 +1,245 @@
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+import streamlit as st
+
+from content import ROSTER_DATA
+from events import EVENT_BOARD, EVENT_CALENDAR, EVENT_STORE, default_backend
+from flights import FLIGHT_STORE
+from fragments import RENDER_CACHE, flight_cards_html, pilot_flight_cards_html, podium_html, ranking_html
+from fshub import CONDITIONAL_STATS, FSHUB_FEEDS, OverviewSnapshot, fetch_overview, fetch_pilot_flights, fetch_pilot_hours, flight_rows, to_frame
+from i18n import T
+from leaderboard import LEADERBOARD
+from mailer import MAIL_QUEUE
+from metrics import METRICS
+from pilots import PILOT_INDEX
+from roster import ROSTER
+from tours import TOUR_TRACKER
+from weather import WEATHER_CACHE, CYCLE_INGESTER, StationNotFound, get_many
+
+# --- SERVICES PARTAGES ---
+# Accès aux données (météo, fsHub, historique, événements, e-mails) utilisés par les pages. Importé après le premier
+# affichage de la page de connexion : requests, lxml et les bases locales ne ralentissent pas le démarrage.
+_START_LOCK = threading.Lock()
+_started = False
+
+
+def start():
+    # Threads d'arrière-plan et configuration : une seule fois par process, quel que soit le nombre de sessions
+    global _started
+    if _started: return
+    with _START_LOCK:
+        if _started: return
+        CYCLE_INGESTER.start()
+        # File d'envoi des e-mails : le thread démarre dès que la configuration SMTP est connue
+        # (et reprend les messages restés en file lors d'un arrêt)
+        try: MAIL_QUEUE.configure(st.secrets["email"])
+        except Exception: pass
+        if MAIL_QUEUE.settings is not None: MAIL_QUEUE.start()
+        # Événements : JSONBin si configuré, SQLite local sinon
+        try: jsonbin = st.secrets["jsonbin"]
+        except Exception: jsonbin = None
+        EVENT_STORE.configure(default_backend(jsonbin))
+        # Flux fsHub rafraîchis en arrière-plan (1 thread par process) : les pages lisent le dernier instantané
+        FSHUB_FEEDS.register("overview", fetch_overview, 300)
+        FSHUB_FEEDS.register("pilot_hours", fetch_pilot_hours, 3600)
+        for pilot in ROSTER_DATA:
+            if pilot['fshub_id']: FSHUB_FEEDS.register(f"pilot_flights:{pilot['fshub_id']}", partial(fetch_pilot_flights, pilot['fshub_id']), 600)
+        TOUR_TRACKER.resync([p['id'] for p in ROSTER_DATA], FLIGHT_STORE.pilot_flights)
+        FSHUB_FEEDS.on_refresh("leaderboard", on_fshub_refresh)
+        if not LEADERBOARD.ready: LEADERBOARD.update_hours(get_pilot_index())
+        FSHUB_FEEDS.start()
+        # Compteurs déjà tenus par les composants, relus à chaque export des métriques
+        METRICS.collect("weather_cache", WEATHER_CACHE.stats)
+        METRICS.collect("noaa_cycles", lambda: {"errors": CYCLE_INGESTER.errors, "not_modified": CYCLE_INGESTER.not_modified,
+                                                  "last_duration": CYCLE_INGESTER.last_duration})
+        METRICS.collect("fshub_conditional", CONDITIONAL_STATS)
+        METRICS.collect("fshub_feeds", FSHUB_FEEDS.stats)
+        METRICS.collect("event_store", EVENT_STORE.stats)
+        METRICS.collect("mail_queue", lambda: {**MAIL_QUEUE.stats, "pending": MAIL_QUEUE.pending()})
+        # ATN_METRICS_FILE : export texte réécrit périodiquement pour le textfile collector de node_exporter
+        if os.environ.get("ATN_METRICS_FILE"): METRICS.start_writer(os.environ["ATN_METRICS_FILE"])
+        _started = True
+
+
+def is_staff(callsign):
+    return ROSTER.get(callsign, {}).get('role') == "STAFF"
+
+
+def load_event_data():
+    return EVENT_STORE.rsvps()
+
+
+@METRICS.timed("events.upsert_memory")
+def save_event_data(event_id, uid, vote):
+    # Upsert du seul couple (événement, pilote) ; écriture regroupée en arrière-plan. La métrique ne couvre que la mise
+    # à jour en mémoire : la persistance JSONBin est mesurée à part (jsonbin.load / jsonbin.save)
+    EVENT_STORE.upsert(event_id, uid, vote)
+
+
+WEATHER_UNAVAILABLE = {"METAR": "⚠️ Météo indisponible", "TAF": "⚠️ TAF indisponible"}
+
+
+@METRICS.timed("get_real_metar", error=lambda text: text.startswith("⚠️"))
+def get_real_metar(icao_code):
+    try: return WEATHER_CACHE.get(icao_code, "METAR", metric="get_real_metar")
+    except StationNotFound: return WEATHER_UNAVAILABLE["METAR"]
+    except: return "⚠️ Erreur connexion"
+
+
+def get_real_taf(icao_code):
+    try: return WEATHER_CACHE.get(icao_code, "TAF")
+    except StationNotFound: return WEATHER_UNAVAILABLE["TAF"]
+    except: return "⚠️ Erreur connexion"
+
+
+def get_weather_batch(icao_codes, products=("METAR", "TAF"), deadline=4):
+    # Tous les bulletins en parallèle : la latence est celle de la requête la plus lente, pas la somme
+    results = get_many([(icao, product) for icao in icao_codes for product in products], deadline=deadline)
+    weather = {}
+    for icao in icao_codes:
+        for product in products:
+            res = results.get((icao.upper(), product))
+            if isinstance(res, str): weather[(icao, product)] = res
+            elif isinstance(res, StationNotFound): weather[(icao, product)] = WEATHER_UNAVAILABLE[product]
+            else: weather[(icao, product)] = "⚠️ Erreur connexion"
+    return weather
+
+
+def parse_eta(hhmm):
+    # "HH:MM" UTC -> prochaine occurrence (aujourd'hui, ou demain si déjà passée)
+    try: t = datetime.strptime(hhmm.strip(), "%H:%M")
+    except: return None
+    now = datetime.now(timezone.utc)
+    eta = now.replace(hour=t.hour, minute=t.minute, second=0, microsecond=0)
+    return eta if eta >= now - timedelta(hours=1) else eta + timedelta(days=1)
+
+
+def get_all_pilots_hours_global():
+    return FSHUB_FEEDS.get("pilot_hours", {})
+
+
+def get_pilot_index():
+    # Reconstruit seulement quand un nouvel instantané des heures fsHub est publié
+    snap = FSHUB_FEEDS.snapshot("pilot_hours")
+    return PILOT_INDEX.get(snap.version, ROSTER_DATA, snap.value or {})
+
+
+def on_fshub_refresh(name, snap):
+    # Appelé par le thread de rafraîchissement : les classements sont prêts avant le rendu des pages
+    if name == "pilot_hours":
+        LEADERBOARD.update_hours(PILOT_INDEX.get(snap.version, ROSTER_DATA, snap.value or {}))
+    elif name.startswith("pilot_flights:") and name[14:] in ROSTER.by_fshub:
+        # Seuls les vols plus récents que le dernier connu sont convertis et insérés dans l'historique local (la page
+        # fsHub a déjà été téléchargée et analysée en entier) ; classements recalculés sur tout l'historique
+        callsign = ROSTER.by_fshub[name[14:]]
+        new_flights = FLIGHT_STORE.sync(callsign, flight_rows(*snap.value))
+        LEADERBOARD.update_pilot_flights(callsign, FLIGHT_STORE.pilot_flights(callsign))
+        # Seuls les vols nouvellement synchronisés sont rapprochés des étapes de tour
+        if new_flights: TOUR_TRACKER.match(callsign, new_flights)
+
+
+def get_fshub_overview():
+    # Une seule page overview téléchargée et analysée pour les stats et les vols récents
+    return FSHUB_FEEDS.get("overview", OverviewSnapshot())
+
+
+@METRICS.timed("get_va_stats_surgical")
+def get_va_stats_surgical():
+    overview = get_fshub_overview()
+    # Echec de cache = aucun instantané fsHub encore publié, valeurs par défaut affichées
+    METRICS.cache("get_va_stats_surgical", bool(overview.flights))
+    return {"flights": overview.flights or "835", "hours": overview.hours or "1,828"}
+
+
+def get_fshub_flights():
+    import pandas as pd
+    overview = get_fshub_overview()
+    if not overview.rows: return pd.DataFrame(), False
+    return to_frame(overview.header, overview.rows), True
+
+
+@METRICS.timed("get_pilot_personal_flights")
+def get_pilot_personal_flights(fshub_id):
+    import pandas as pd
+    if not fshub_id: return pd.DataFrame(), False
+    FSHUB_FEEDS.register(f"pilot_flights:{fshub_id}", partial(fetch_pilot_flights, fshub_id), 600)
+    # Historique local en priorité (synchronisé en arrière-plan), page fsHub brute sinon
+    callsign = ROSTER.callsign_for(fshub_id)
+    stored = FLIGHT_STORE.recent(callsign, 5) if callsign else []
+    METRICS.cache("get_pilot_personal_flights", bool(stored))
+    if stored:
+        return pd.DataFrame([(f['pilot'], f['dep'], f['arr'], f['aircraft'], f['landing_fpm'], f['day'] or "-") for f in stored],
+                            columns=["Pilot", "Departure", "Arrival", "Aircraft", "Landing", "Date"]), True
+    header, rows, _ = FSHUB_FEEDS.get(f"pilot_flights:{fshub_id}", ((), [], []))
+    if not rows: return pd.DataFrame(), False
+    return to_frame(header, rows), True
+
+
+# --- FRAGMENTS HTML EN CACHE ---
+# Clé de version = instantané des données affichées : reconstruction seulement quand elles changent
+def recent_flights_html():
+    return RENDER_CACHE.get("home_flights", FSHUB_FEEDS.snapshot("overview").version, st.session_state['lang'],
+                            lambda: flight_cards_html(get_fshub_flights()[0].head(5)))
+
+
+def pilot_flights_html(fshub_id):
+    callsign = ROSTER.callsign_for(fshub_id)
+    version = (FLIGHT_STORE.pilot_version(callsign), FSHUB_FEEDS.snapshot(f"pilot_flights:{fshub_id}").version)
+    return RENDER_CACHE.get(f"profile_flights:{fshub_id}", version, st.session_state['lang'],
+                            lambda: pilot_flight_cards_html(get_pilot_personal_flights(fshub_id)[0].head(5)))
+
+
+def podium_top3_html():
+    def build():
+        return podium_html([{"nom": ROSTER.get(e.callsign)['nom'], "raw": e.display, "grade": ROSTER.get(e.callsign)['grade']}
+                            for e in LEADERBOARD.view("hours", 3)])
+    return RENDER_CACHE.get("podium", LEADERBOARD.version, st.session_state['lang'], build)
+
+
+def leaderboard_html(view, k=5):
+    # Vue top-K déjà classée ("flights", "landing", "month:AAAA-MM") : ni tri ni calcul au rendu ; "" si vide
+    def build():
+        entries = LEADERBOARD.view(view, k)
+        return ranking_html([{**(ROSTER.get(e.callsign) or {"nom": e.callsign, "grade": ""}), "raw": e.display} for e in entries]) if entries else ""
+    return RENDER_CACHE.get(f"leaderboard:{view}", LEADERBOARD.version, st.session_state['lang'], build)
+
+
+def get_event_board():
+    # Index des événements reconstruit uniquement quand une inscription ou events.json change
+    return EVENT_BOARD.get(EVENT_CALENDAR.events(), EVENT_STORE)
+
+
+def event_card_html(ev, board):
+    going = board.count(ev.id)
+    seats = f"👥 {going}/{ev.slots}" if ev.slots else f"👥 {going}"
+    tags = "".join(f'<span class="ev-tag">{tag}</span>' for tag in ev.tags)
+    return f"""<div class="event-card"><div class="ev-date-box"><div class="ev-day">{ev.start.day}</div><div class="ev-month">{T("months_short")[ev.start.month - 1]}</div></div><div class="ev-details"><div class="ev-title">{ev.title}</div><div class="ev-meta"><span>🕒 {ev.start:%H:%M} Z</span><span>📍 Hub {ev.hub}</span><span>{seats}</span>{tags}</div></div></div>"""
+
+
+def get_career_stats(callsign):
+    # Recalculé uniquement quand de nouveaux vols du pilote arrivent dans l'historique local (numpy/pandas chargés ici)
+    from career import CAREER_CACHE
+    return CAREER_CACHE.get(callsign, FLIGHT_STORE.pilot_version(callsign), lambda: FLIGHT_STORE.frame(callsign))
+
+
+@METRICS.timed("send_email_via_ionos", error=lambda result: result is not True)
+def send_email_via_ionos(subject, body):
+    # Dépôt dans la file d'envoi (retour immédiat) ; la livraison SMTP se fait en arrière-plan
+    if MAIL_QUEUE.settings is None: return "Configuration e-mail absente"
+    try: msg_id = MAIL_QUEUE.enqueue(subject, body)
+    except Exception as e: return str(e)
+    st.session_state.setdefault('outbox', []).append(msg_id)
+    return True
+
+
+def show_mail_status():
+    # Suivi des derniers messages déposés pendant la session
+    ids = st.session_state.get('outbox')
+    if not ids: return
+    st.caption(T("mail_status"))
+    for row in MAIL_QUEUE.statuses(ids[-5:]):
+        error = f" · {row['last_error']}" if row['status'] != "sent" and row['last_error'] else ""
+        st.caption(f"{T('mail_states')[row['status']]} · {row['subject']}{error}")
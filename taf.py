@@ -0,0 +1,152 @@
+import re
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+
+from metar import Metar, decode_metar
+
+# --- DECODEUR TAF ---
+_HEADER = re.compile(r"(?:TAF\s+)?(?:(?:AMD|COR)\s+)?(?P<station>[A-Z][A-Z0-9]{3})\s+(?P<issued>\d{6}Z)")
+_STAMP = re.compile(r"(\d{4})/(\d{2})/(\d{2}) (\d{2}):(\d{2})")
+_PERIOD = re.compile(r"(\d{2})(\d{2})/(\d{2})(\d{2})")
+_FM = re.compile(r"FM(\d{2})(\d{2})(\d{2})")
+_PROB = re.compile(r"PROB\d{2}")
+
+
+@dataclass(slots=True)
+class TafPeriod:
+    start: datetime
+    end: datetime
+    prevailing: Metar
+    changes: list = field(default_factory=list)     # [(type, Metar)] ex: ("TEMPO", ...), ("PROB30 TEMPO", ...)
+
+
+@dataclass(slots=True)
+class Taf:
+    station: str
+    issued: datetime
+    valid_from: datetime
+    valid_to: datetime
+    raw: str
+    periods: list = field(default_factory=list)
+    starts: list = field(default_factory=list)
+
+    def at(self, when):
+        # Recherche dichotomique dans les périodes élémentaires précalculées
+        if when < self.valid_from or when >= self.valid_to: return None
+        idx = bisect_right(self.starts, when) - 1
+        return self.periods[idx] if idx >= 0 else None
+
+
+def _resolve(day, hour, minute, ref):
+    # Les TAF ne donnent que le jour du mois : on se cale sur le mois de référence
+    base = ref.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if day - ref.day > 15: base = (base - timedelta(days=1)).replace(day=1)
+    elif ref.day - day > 15: base = (base + timedelta(days=32)).replace(day=1)
+    return base + timedelta(days=day - 1, hours=hour, minutes=minute)
+
+
+def _merge(base, change, tokens):
+    # Un BECMG ne remplace que les éléments qu'il mentionne
+    merged = replace(base, raw=base.raw + " " + change.raw, rvr=list(base.rvr), weather=list(base.weather),
+                     clouds=list(base.clouds), trends=[])
+    if change.wind_speed is not None:
+        merged.wind_dir, merged.wind_speed, merged.wind_gust = change.wind_dir, change.wind_speed, change.wind_gust
+        merged.wind_variable, merged.wind_unit = change.wind_variable, change.wind_unit
+    if change.visibility_m is not None: merged.visibility_m, merged.cavok = change.visibility_m, change.cavok
+    if change.weather or "NSW" in tokens: merged.weather = list(change.weather)
+    if change.clouds or "NSC" in tokens or "SKC" in tokens or change.cavok: merged.clouds = list(change.clouds)
+    return merged
+
+
+def parse_taf(text, ref=None):
+    lines = text.strip().split("\n")
+    stamp = _STAMP.match(lines[0]) if lines else None
+    if stamp:
+        ref = datetime(*map(int, stamp.groups()), tzinfo=timezone.utc)
+        lines = lines[1:]
+    ref = ref or datetime.now(timezone.utc)
+    body = " ".join(lines).replace("=", " ")
+    header = _HEADER.search(body)
+    if header is None: raise ValueError("TAF illisible")
+    tokens = body[header.end():].split()
+    issued_txt = header["issued"]
+    issued = _resolve(int(issued_txt[:2]), int(issued_txt[2:4]), int(issued_txt[4:6]), ref)
+    validity = _PERIOD.fullmatch(tokens[0]) if tokens else None
+    if validity is None: raise ValueError("Période de validité absente")
+    d1, h1, d2, h2 = map(int, validity.groups())
+    valid_from, valid_to = _resolve(d1, h1, 0, issued), _resolve(d2, h2, 0, issued)
+
+    # Découpage en groupes : [type, début, fin, jetons]
+    groups = [["BASE", valid_from, valid_to, []]]
+    for token in tokens[1:]:
+        if token == "RMK": break
+        fm = _FM.fullmatch(token)
+        if fm:
+            groups.append(["FM", _resolve(*map(int, fm.groups()), issued), valid_to, []])
+        elif token in ("BECMG", "TEMPO") or _PROB.fullmatch(token):
+            if token == "TEMPO" and groups[-1][0].startswith("PROB") and not groups[-1][3]:
+                groups[-1][0] += " TEMPO"
+            else:
+                groups.append([token, None, None, []])
+        elif groups[-1][1] is None and _PERIOD.fullmatch(token):
+            p1, q1, p2, q2 = map(int, _PERIOD.fullmatch(token).groups())
+            groups[-1][1], groups[-1][2] = _resolve(p1, q1, 0, issued), _resolve(p2, q2, 0, issued)
+        else:
+            groups[-1][3].append(token)
+    groups = [g for g in groups if g[1] is not None]
+
+    decoded = [(kind, start, end, tokens_, decode_metar(" ".join(tokens_), with_station=False))
+               for kind, start, end, tokens_ in groups]
+    bounds = sorted({valid_from, valid_to} | {t for g in decoded for t in (g[1], g[2]) if valid_from <= t <= valid_to})
+    taf = Taf(station=header["station"], issued=issued, valid_from=valid_from, valid_to=valid_to, raw=text)
+    for start, end in zip(bounds, bounds[1:]):
+        prevailing = None
+        changes = []
+        for kind, g_start, g_end, tokens_, cond in decoded:
+            if kind in ("BASE", "FM"):
+                if g_start <= start: prevailing = cond
+            elif kind == "BECMG":
+                if g_end <= start and prevailing is not None: prevailing = _merge(prevailing, cond, tokens_)
+                elif g_start <= start < g_end: changes.append((kind, cond))
+            elif g_start <= start < g_end:
+                changes.append((kind, cond))
+        taf.periods.append(TafPeriod(start=start, end=end, prevailing=prevailing, changes=changes))
+        taf.starts.append(start)
+    return taf
+
+
+# --- CACHE PAR EMISSION ---
+# Une entrée par station : on ne re-décode que lorsqu'un nouveau TAF (nouvelle heure d'émission) arrive.
+_PARSED = {}
+_PARSED_LOCK = threading.Lock()
+
+
+def parse_taf_cached(text):
+    header = _HEADER.search(text)
+    if header is None: return parse_taf(text)
+    key = (header["issued"], text.strip())
+    cached = _PARSED.get(header["station"])
+    if cached is not None and cached[0] == key: return cached[1]
+    taf = parse_taf(text)
+    with _PARSED_LOCK:
+        _PARSED[header["station"]] = (key, taf)
+    return taf
+
+
+def forecast_at(text, when):
+    try: return parse_taf_cached(text).at(when)
+    except ValueError: return None
+
+
+def forecast_many(queries, get_taf):
+    # queries : [(icao, datetime)] ; un seul accès au TAF et un seul décodage par station
+    tafs = {}
+    results = []
+    for icao, when in queries:
+        if icao not in tafs:
+            try: tafs[icao] = parse_taf_cached(get_taf(icao))
+            except Exception: tafs[icao] = None
+        results.append(tafs[icao].at(when) if tafs[icao] is not None else None)
+    return results
@@ -0,0 +1,7 @@
+import os
+import sys
+import tempfile
+
+# Bases SQLite des singletons (DATA_DIR) dans un répertoire temporaire : les tests ne touchent pas data/
+os.environ.setdefault("ATN_DATA_DIR", tempfile.mkdtemp(prefix="atn-tests-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,21 @@
+from datetime import date
+
+import pandas as pd
+
+from career import career_stats, longest_streaks
+
+
+def test_longest_streaks_with_fixed_date():
+    days = pd.Series(["2026-03-01", "2026-03-02", "2026-03-03", "2026-03-10", "2026-03-11", "2026-03-11", None])
+    assert longest_streaks(days, date(2026, 3, 12)) == (3, 2)
+    assert longest_streaks(days, date(2026, 3, 13)) == (3, 0)
+    assert longest_streaks(pd.Series([], dtype=object)) == (0, 0)
+
+
+def test_career_stats():
+    df = pd.DataFrame({"dep": ["NTAA", "NTTB", "NTAA"], "arr": ["NTTB", "NTAA", "NTTB"], "aircraft": ["AT76", "AT76", "A320"],
+                       "landing_fpm": [-120, None, -300], "day": ["2026-03-01", "2026-03-02", "2026-04-01"], "minutes": [45, 50, None]})
+    stats = career_stats(df, today=date(2026, 4, 2))
+    assert (stats["flights"], stats["landing_avg"]) == (3, -210.0) and abs(stats["hours"] - 95 / 60) < 1e-9
+    assert stats["by_route"].loc["NTAA-NTTB", "flights"] == 2 and stats["by_aircraft"].index[0] == "AT76"
+    assert (stats["best_streak"], stats["current_streak"]) == (2, 1)
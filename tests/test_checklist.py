@@ -0,0 +1,64 @@
+from streamlit.testing.v1 import AppTest
+
+from checklists import CHECKLISTS, ChecklistState, ChecklistStore, parse_checklist
+
+DOC = {"type": "TEST", "nom": "Test", "phases": [{"phase": "Avant roulage", "items": ["Portes", "Balises", "Volets"]},
+                                                 {"phase": "Après atterrissage", "items": ["Feux", "Transpondeur"]}]}
+
+
+def test_state_masks_and_progress():
+    state = ChecklistState(parse_checklist(DOC))
+    state.set(0, 0, True)
+    state.set(0, 2, True)
+    state.set(1, 1, True)
+    state.set(1, 1, False)
+    assert state.checked(0, 2) and not state.checked(0, 1) and not state.phase_done(0)
+    assert state.summary() == [("Avant roulage", 2, 3), ("Après atterrissage", 0, 2)] and state.progress() == (2, 5)
+    state.set(0, 1, True)
+    assert state.phase_done(0) and state.progress() == (3, 5)
+    generation = state.generation
+    state.reset()
+    assert state.progress() == (0, 5) and state.generation == generation + 1
+
+
+def test_dump_restore_and_definition_change():
+    checklist = parse_checklist(DOC)
+    state = ChecklistState(checklist, [0b101, 0b10])
+    restored = ChecklistState.restore(checklist, state.dump())
+    assert restored.masks == [0b101, 0b10]
+    # Définition modifiée (signature différente) ou texte illisible : état vide
+    changed = parse_checklist({**DOC, "phases": DOC["phases"] + [{"phase": "Parking", "items": ["Moteurs"]}]})
+    assert ChecklistState.restore(changed, state.dump()).masks == [0, 0, 0]
+    assert ChecklistState.restore(checklist, "illisible").masks == [0, 0]
+
+
+def test_store_keeps_state_per_pilot_and_aircraft(tmp_path):
+    checklists = {"TEST": parse_checklist(DOC)}
+    store = ChecklistStore(str(tmp_path / "checklists.sqlite3"), checklists)
+    state = store.load("THT1004", "TEST")
+    state.set(1, 0, True)
+    store.save("THT1004", state)
+    state.set(0, 0, True)
+    store.save("THT1004", state)
+    reopened = ChecklistStore(str(tmp_path / "checklists.sqlite3"), checklists)
+    assert reopened.load("THT1004", "TEST").masks == [0b1, 0b1] and reopened.load("THT1005", "TEST").masks == [0, 0]
+
+
+def checklist_page():
+    import streamlit as st
+
+    import views
+    st.session_state.setdefault('lang', 'FR')
+    st.session_state.setdefault('username', 'THT9024')
+    views.render("menu_checklist")
+
+
+def test_page_shows_one_overall_progress_bar():
+    total = sum(len(items) for _, items in CHECKLISTS["A320"].phases)
+    at = AppTest.from_function(checklist_page, default_timeout=30).run()
+    assert not at.exception
+    assert [p.value for p in at.get("progress")] == [0] and at.checkbox
+    at.checkbox[0].check().run()
+    assert not at.exception
+    bars = at.get("progress")
+    assert len(bars) == 1 and bars[0].value == round(100 / total)
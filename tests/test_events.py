@@ -0,0 +1,122 @@
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from streamlit.testing.v1 import AppTest
+
+import events
+import services
+from events import STATUS_MAYBE, STATUS_YES, EventCalendar, EventStore, JsonBinBackend, SqliteEventBackend
+
+
+def events_page():
+    import streamlit as st
+
+    import views
+    st.session_state.setdefault('lang', 'FR')
+    st.session_state.setdefault('username', 'THT1004')
+    views.render("menu_events")
+
+
+def write_events(path, *rows):
+    path.write_text(json.dumps(list(rows)), encoding="utf-8")
+
+
+def test_calendar_reloads_when_file_changes(tmp_path):
+    path = tmp_path / "events.json"
+    write_events(path, {"id": "a", "titre": "A", "date": "2026-01-01 19:00", "hub": "NTAA"})
+    calendar = EventCalendar(str(path))
+    first = calendar.events()
+    assert [e.id for e in first] == ["a"] and calendar.events() is first
+    write_events(path, {"id": "a", "titre": "A", "date": "2026-01-01 19:00", "hub": "NTAA"},
+                 {"id": "b", "titre": "B", "date": "2026-02-01 19:00", "hub": "NTTB", "places": 4})
+    path.touch()
+    assert [e.id for e in calendar.events()] == ["a", "b"]
+    # Fichier invalide : le calendrier précédent reste servi
+    path.write_text("[{", encoding="utf-8")
+    assert [e.id for e in calendar.events()] == ["a", "b"]
+
+
+def test_events_page_records_vote(tmp_path, monkeypatch):
+    start = datetime.now(timezone.utc) + timedelta(days=7)
+    path = tmp_path / "events.json"
+    write_events(path, {"id": "evt_test", "titre": "Vol de groupe", "date": f"{start:%Y-%m-%d %H:%M}", "hub": "NTAA", "places": 10})
+    store = EventStore(SqliteEventBackend(str(tmp_path / "events.sqlite3")), debounce=60)
+    monkeypatch.setattr(services, "EVENT_CALENDAR", EventCalendar(str(path)))
+    monkeypatch.setattr(services, "EVENT_STORE", store)
+    monkeypatch.setattr(services, "EVENT_BOARD", events.EventBoardCache())
+
+    at = AppTest.from_function(events_page).run()
+    assert not at.exception
+    assert not [i for i in at.info if "Aucun" in i.value]
+    at.button(key="evt_test_yes").click().run()
+    assert not at.exception
+    assert store.rsvps()[("evt_test", "THT1004")] == STATUS_YES
+    assert services.get_event_board().count("evt_test") == 1
+    # Écriture regroupée : le vote arrive dans la base au flush
+    assert store.flush()
+    assert store.backend.load()[0] == {("evt_test", "THT1004"): STATUS_YES}
+
+
+class DownBackend:
+    def __init__(self):
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        raise ConnectionError("jsonbin down")
+
+
+def test_failed_first_load_waits_before_retrying():
+    backend = DownBackend()
+    store = EventStore(backend, retry_delay=30)
+    for _ in range(10): assert store.snapshot() == (0, {})
+    assert backend.loads == 1 and store.stats["errors"] == 1
+    store._loaded_at = time.time() - 31
+    store.snapshot()
+    assert backend.loads == 2
+
+
+class FakeResponse:
+    def __init__(self, record=None):
+        self.record = record
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"record": self.record}
+
+
+class FakeJsonBin:
+    def __init__(self, record):
+        self.record = record
+        self.calls = []
+
+    def get(self, url, timeout):
+        self.calls.append("GET")
+        return FakeResponse(json.loads(json.dumps(self.record)))
+
+    def put(self, url, json, timeout):
+        self.calls.append("PUT")
+        self.record = json
+        return FakeResponse()
+
+
+def test_jsonbin_flush_reads_once():
+    backend = JsonBinBackend("bin", "key")
+    backend._session = FakeJsonBin({"_rev": 3, "evt1": {"THT1001": STATUS_YES}})
+    store = EventStore(backend, debounce=60)
+    store.snapshot()
+    backend._session.calls.clear()
+    store.upsert("evt2", "THT1004", STATUS_MAYBE)
+    assert store.flush()
+    assert backend._session.calls == ["GET", "PUT"]
+    assert backend._session.record == {"_rev": 4, "evt1": {"THT1001": STATUS_YES}, "evt2": {"THT1004": STATUS_MAYBE}}
+    # Révision modifiée par un autre process : relecture, fusion et nouvel essai
+    backend._session.record = {"_rev": 9, "evt1": {"THT1002": STATUS_YES}}
+    backend._session.calls.clear()
+    store.upsert("evt1", "THT1004", STATUS_YES)
+    assert store.flush() and store.stats["conflicts"] == 1
+    assert backend._session.calls == ["GET", "GET", "GET", "PUT"]
+    assert backend._session.record == {"_rev": 10, "evt1": {"THT1002": STATUS_YES, "THT1004": STATUS_YES}}
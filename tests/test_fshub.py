@@ -0,0 +1,105 @@
+import io
+import time
+from datetime import date
+
+import fshub
+from fshub import FeedRefresher, FlightRow, extract_table, flight_rows, parse_overview, parse_pilot_flights, parse_pilot_hours, pilots_table
+
+PILOTS_PAGE = b"""<html><body>
+<table><tr><th>Airline</th><th>Hours</th></tr><tr><td>THT</td><td>12 345</td></tr></table>
+<table><thead><tr><th>Pilot</th><th>Rank</th><th>Total Hours</th></tr></thead>
+<tbody><tr><td>THT1001 Guillaume B.</td><td>CDB</td><td>232h30</td></tr>
+<tr><td>THT1002 Alain <b>L.</b></td><td>CDB</td><td>190h</td></tr><tr><td>incomplet</td></tr></tbody></table>
+<table><tr><th>Pilot</th><th>Hours</th></tr><tr><td>jamais lu</td><td>0</td></tr></table>
+</body></html>"""
+
+PILOT_PAGE = b"""<html><body>
+<table><tr><td>a</td><td>b</td><td>c</td><td>d</td><td>e</td></tr></table>
+<table><tr><th>Flight</th><th>Departure</th><th>Arrival</th><th>Aircraft</th><th>Landing</th><th>Flight Time</th><th>Date</th></tr>
+<tr><td><a href="/flight/4521">THT101</a></td><td>NTAA</td><td>NTTB</td><td>AT76</td><td>-152 fpm</td><td>0:45</td><td>2026-10-12</td></tr>
+<tr><td>THT102</td><td>NTTB</td><td>NTAA</td><td>AT76</td><td>-98 fpm</td><td>1h05</td><td>Oct 11, 2026</td></tr>
+</table></body></html>"""
+
+OVERVIEW_PAGE = b"""<html><body><div class="stat"><h3>835</h3>Total Flights</div><div class="stat"><h3>2,410.5</h3>Total Hours</div>
+<table><tr><th>Pilot</th><th>Departure</th><th>Arrival</th><th>Aircraft</th><th>Landing</th><th>Date</th></tr>
+<tr><td>THT1001</td><td>NTAA</td><td>KLAX</td><td>B789</td><td>-180 fpm</td><td>2026-10-17</td></tr></table></body></html>"""
+
+
+def test_extract_table_picks_the_target_table():
+    header, rows = extract_table(io.BytesIO(PILOTS_PAGE), pilots_table)
+    assert header == ("Pilot", "Rank", "Total Hours") and rows[:2] == [("THT1001 Guillaume B.", "CDB", "232h30"), ("THT1002 Alain L.", "CDB", "190h")]
+    assert extract_table(io.BytesIO(PILOTS_PAGE), lambda header, rows: False) == ((), [])
+    assert parse_pilot_hours(io.BytesIO(PILOTS_PAGE)) == {"THT1001 Guillaume B.": "232h30", "THT1002 Alain L.": "190h"}
+
+
+def test_pilot_flights_table_with_flight_ids():
+    header, rows, ids = parse_pilot_flights(io.BytesIO(PILOT_PAGE))
+    assert header[0] == "Flight" and len(rows) == 2 and ids == ["4521", None]
+    assert list(flight_rows(header, rows, ids)) == [FlightRow("NTAA", "NTTB", "AT76", -152, date(2026, 10, 12), 45, 4521),
+                                                    FlightRow("NTTB", "NTAA", "AT76", -98, date(2026, 10, 11), 65, None)]
+
+
+def test_parse_overview():
+    snap = parse_overview(io.BytesIO(OVERVIEW_PAGE))
+    assert (snap.flights, snap.hours) == ("835", "2,410.5")
+    assert snap.header[:3] == ("Pilot", "Departure", "Arrival") and snap.rows == [("THT1001", "NTAA", "KLAX", "B789", "-180 fpm", "2026-10-17")]
+
+
+def test_feed_stats_expose_refresh_time_and_duration():
+    feeds = FeedRefresher()
+
+    def slow():
+        time.sleep(0.01)
+        return {"ok": True}
+
+    def broken(): raise ConnectionError("fsHub down")
+
+    feeds.register("overview", slow, 300)
+    feeds.register("pilot_hours", broken, 3600)
+    assert feeds.stats()["overview.age"] == -1 and feeds.stats()["overview.refreshed_at"] == 0
+    before = time.time()
+    feeds.refresh_now("overview")
+    feeds.refresh_now("pilot_hours")
+    stats = feeds.stats()
+    assert before <= stats["overview.refreshed_at"] <= time.time() and 0 <= stats["overview.age"] < 5
+    assert stats["overview.duration"] >= 0.01 and stats["overview.errors"] == 0
+    assert stats["pilot_hours.refreshed_at"] == 0 and stats["pilot_hours.errors"] == 1
+
+
+class FakeResponse:
+    def __init__(self, status, body=b"", headers=None):
+        self.status_code, self.headers = status, headers or {}
+        self.raw = io.BytesIO(body)
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc): return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400: raise ConnectionError(self.status_code)
+
+
+def test_not_modified_reuses_parsed_snapshot(monkeypatch):
+    sent, responses = [], [FakeResponse(200, OVERVIEW_PAGE, {"ETag": '"v1"', "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"}),
+                           FakeResponse(304), FakeResponse(200, OVERVIEW_PAGE.replace(b"835", b"836"), {"ETag": '"v2"'})]
+
+    def get(url, headers, timeout, stream):
+        sent.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(fshub.requests, "get", get)
+    monkeypatch.setattr(fshub, "_CONDITIONAL", {})
+    monkeypatch.setattr(fshub, "CONDITIONAL_STATS", {"full": 0, "not_modified": 0})
+    feeds = FeedRefresher()
+    feeds.register("overview", fshub.fetch_overview, 300)
+    notified = []
+    feeds.on_refresh("test", lambda name, snap: notified.append(snap.version))
+    first = feeds.refresh_now("overview")
+    assert first.version == 1 and first.value.flights == "835" and "If-None-Match" not in sent[0]
+    # 304 : même objet analysé, version inchangée (pas de notification ni de recalcul en aval)
+    second = feeds.refresh_now("overview")
+    assert sent[1]["If-None-Match"] == '"v1"' and sent[1]["If-Modified-Since"] == "Sat, 17 Oct 2026 10:00:00 GMT"
+    assert second.value is first.value and second.version == 1 and second.error is None
+    third = feeds.refresh_now("overview")
+    assert third.version == 2 and third.value.flights == "836"
+    assert fshub.CONDITIONAL_STATS == {"full": 2, "not_modified": 1} and notified == [1, 2]
@@ -0,0 +1,38 @@
+from datetime import date
+
+from fshub import FlightRow
+from leaderboard import Leaderboard
+from pilots import PilotHours
+
+
+def flights(n, landing=-150, day=date(2026, 3, 10)):
+    return [FlightRow("NTAA", "NTTB", "AT76", landing, day, 45) for _ in range(n)]
+
+
+def test_flight_views_rank_top_k_and_follow_updates():
+    board = Leaderboard(k=2)
+    board.update_pilot_flights("THT1001", flights(3, -250))
+    board.update_pilot_flights("THT1002", flights(5, -90))
+    board.update_pilot_flights("THT1003", flights(2, -40, date(2026, 2, 1)))
+    assert [(e.callsign, e.value) for e in board.view("flights")] == [("THT1002", 5), ("THT1001", 3)]
+    # Moyenne la plus douce d'abord, 3 vols minimum (THT1003 exclu)
+    assert [(e.callsign, e.display) for e in board.view("landing")] == [("THT1002", "-90 fpm"), ("THT1001", "-250 fpm")]
+    assert board.months() == ["2026-03", "2026-02"]
+    assert [e.callsign for e in board.view("month:2026-02")] == ["THT1003"]
+
+    # Nouveaux vols d'un pilote : seul son agrégat change, les vues suivent
+    version = board.version
+    board.update_pilot_flights("THT1003", flights(2, -40, date(2026, 2, 1)) + flights(6, -60))
+    assert board.version == version + 1
+    assert [(e.callsign, e.value) for e in board.view("flights")] == [("THT1003", 8), ("THT1002", 5)]
+    assert [e.callsign for e in board.view("landing")] == ["THT1003", "THT1002"]
+    assert [(e.callsign, e.value) for e in board.view("month:2026-03")] == [("THT1003", 6), ("THT1002", 5)]
+    assert [e.callsign for e in board.view("flights", 1)] == ["THT1003"]
+
+
+def test_hours_view():
+    board = Leaderboard(k=3)
+    assert not board.ready and board.view("hours") == ()
+    board.update_hours({cs: PilotHours(cs, hours, raw, None) for cs, hours, raw in
+                        (("THT1001", 232.5, "232h30"), ("THT1002", 598.0, "598h"), ("THT1003", 0.0, "-"), ("THT1004", 190.0, "190h"))})
+    assert board.ready and [e.display for e in board.view("hours")] == ["598h", "232h30", "190h"]
@@ -0,0 +1,110 @@
+import socket
+import time
+from email import message_from_bytes
+
+import pytest
+from aiosmtpd.controller import Controller
+from streamlit.testing.v1 import AppTest
+
+import services
+from mailer import FAILED, QUEUED, SENT, MailQueue
+
+
+class Handler:
+    def __init__(self):
+        self.messages = []
+        self.refuse = 0                 # nombre de messages suivants refusés (451)
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.refuse:
+            self.refuse -= 1
+            return "451 4.3.0 Try again later"
+        self.messages.append(message_from_bytes(envelope.content)["Subject"])
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    handler = Handler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler, {"smtp_server": "127.0.0.1", "smtp_port": port, "username": "crew@atn.test", "password": "",
+                    "receiver_email": "staff@atn.test", "starttls": False}
+    controller.stop()
+
+
+def test_drain_uses_one_connection(smtp):
+    handler, settings = smtp
+    queue = MailQueue(":memory:", settings)
+    ids = [queue.enqueue(f"PIREP {i}", "corps") for i in range(3)]
+    assert queue.pending() == 3
+    assert queue.drain_once() == 3
+    assert handler.messages == ["PIREP 0", "PIREP 1", "PIREP 2"]
+    assert [r['status'] for r in queue.statuses(ids)] == [SENT] * 3
+    assert queue.stats["connections"] == 1 and queue.pending() == 0
+    # Session gardée ouverte entre deux lots
+    queue.enqueue("PIREP 3", "corps")
+    assert queue.drain_once() == 1 and queue.stats["connections"] == 1
+    queue._close()
+
+
+def test_retry_with_exponential_backoff(smtp):
+    handler, settings = smtp
+    queue = MailQueue(":memory:", settings, backoff=30, max_attempts=3)
+    msg_id = queue.enqueue("Validation tour", "corps")
+    handler.refuse = 1
+    before = time.time()
+    assert queue.drain_once() == 1
+    row = queue._query("SELECT * FROM outbox WHERE id = ?", (msg_id,))[0]
+    assert (row['status'], row['attempts']) == (QUEUED, 1) and "451" in row['last_error']
+    assert before + 30 <= row['next_attempt'] <= time.time() + 30
+    # Pas encore échu : rien à envoyer
+    assert queue.drain_once() == 0
+    queue._query("UPDATE outbox SET next_attempt = 0 WHERE id = ?", (msg_id,))
+    assert queue.drain_once() == 1
+    row = queue._query("SELECT * FROM outbox WHERE id = ?", (msg_id,))[0]
+    assert (row['status'], row['attempts'], row['last_error']) == (SENT, 2, None)
+    assert handler.messages == ["Validation tour"] and queue.stats["retries"] == 1
+
+    # Délai doublé à chaque échec, abandon après max_attempts
+    msg_id = queue.enqueue("Contact", "corps")
+    handler.refuse = 3
+    delays = []
+    for _ in range(3):
+        start = time.time()
+        queue.drain_once()
+        row = queue._query("SELECT * FROM outbox WHERE id = ?", (msg_id,))[0]
+        if row['status'] == QUEUED:
+            delays.append(round(row['next_attempt'] - start))
+            queue._query("UPDATE outbox SET next_attempt = 0 WHERE id = ?", (msg_id,))
+    assert delays == [30, 60]
+    assert (row['status'], row['attempts']) == (FAILED, 3) and queue.stats["failed"] == 1
+    queue._close()
+
+
+def mail_status_page():
+    import streamlit as st
+
+    import services
+    st.session_state.setdefault('lang', 'FR')
+    services.show_mail_status()
+
+
+def test_mail_status_shown_in_ui(smtp, monkeypatch):
+    handler, settings = smtp
+    queue = MailQueue(":memory:", settings)
+    monkeypatch.setattr(services, "MAIL_QUEUE", queue)
+    sent, retried = queue.enqueue("PIREP NTAA-NTTB", "corps"), queue.enqueue("Contact", "corps")
+    queue.drain_once()
+    queue._query("UPDATE outbox SET status = ?, last_error = ? WHERE id = ?", (QUEUED, "451 4.3.0 Try again later", retried))
+
+    at = AppTest.from_function(mail_status_page)
+    at.session_state['outbox'] = [sent, retried]
+    at.run()
+    assert not at.exception
+    captions = [c.value for c in at.caption]
+    assert captions == ["📤 Mes envois", "⏳ En attente · Contact · 451 4.3.0 Try again later", "✅ Envoyé · PIREP NTAA-NTTB"]
+    queue._close()
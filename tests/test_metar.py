@@ -0,0 +1,47 @@
+import pandas as pd
+
+from bench import SAMPLE_METARS, varied_metars
+from metar import BATCH_COLUMNS, _BY_FIRST_CHAR, _TOKEN, decode_batch, decode_metar
+
+BULLETINS = SAMPLE_METARS + varied_metars(500) + [
+    "METAR KJFK 181251Z 00000KT 10SM FEW250 22/12 A3001 RMK AO2 SLP165",
+    "SPECI LFPG 181230Z 27015G25KT 240V300 0800 R27L/0600N +TSRA BKN008CB OVC020 M01/M03 Q0998 BECMG NSW",
+    "KORD 181251Z 1 1/2SM FZFG VV002 M05/M06 A2990 9999",
+    "EDDF 181220Z VRB02KT 3000 1500NE BR NSC 10/09 Q1020 TEMPO 1500 RERA",
+    "NTAA 181200Z 9999 CAVOK 1/4SM 27/ Q1013",
+    "KSFO 181256Z 28012KT 10SM FEW008 16/12 A2992",
+    "",
+]
+
+
+def test_first_char_dispatch_matches_full_pattern():
+    for token in {t for b in BULLETINS for t in b.split()} | {"VCFG", "VRB05KT", "M1/4SM", "P6SM", "RESHRA", "COR", "SKC", "R09/P1500"}:
+        full, fast = _TOKEN.fullmatch(token), _BY_FIRST_CHAR.get(token[0], lambda t: None)(token)
+        assert (full and full.lastgroup) == (fast and fast.lastgroup), token
+        if full: assert {k: v for k, v in full.groupdict().items() if v} == {k: v for k, v in fast.groupdict().items() if v}
+
+
+def test_decode_batch_matches_decode_metar():
+    df = decode_batch(BULLETINS)
+    assert len(df) == len(BULLETINS)
+    for i, raw in enumerate(BULLETINS):
+        m = decode_metar(raw)
+        expected = {c: " ".join(m.weather) if c == "weather" else m.ceiling_ft if c == "ceiling_ft" else getattr(m, c) for c in BATCH_COLUMNS}
+        got = {c: None if pd.isna(v) else v for c, v in df.loc[i, list(BATCH_COLUMNS)].items()}
+        assert got == expected, raw
+
+
+def test_decode_metar_groups():
+    m = decode_metar("KORD 181251Z VRB03KT 1 1/2SM R28L/2000V4000FT/U FZFG BKN004 OVC010 M05/M06 A2990 RMK AO2")
+    assert (m.station, m.day, m.hour, m.minute) == ("KORD", 18, 12, 51)
+    assert m.wind_variable and m.wind_dir is None and m.wind_speed == 3
+    assert m.visibility_m == 2414 and m.rvr == [("28L", "2000", "4000", "FT")]
+    assert m.weather == ["FZFG"] and m.ceiling_ft == 400
+    assert (m.temp_c, m.dewpoint_c, m.qnh_inhg, m.qnh_hpa) == (-5, -6, 29.9, 1013.0)
+
+
+def test_decode_batch_keeps_altimeter_inches():
+    # Groupe A : pouces lus tels quels (pas recalculés depuis les hPa arrondis)
+    df = decode_batch(["KSFO 181256Z 28012KT 10SM FEW008 16/12 A2992", "KJFK 181251Z 00000KT 10SM FEW250 22/12 A3001",
+                       "NTAA 181200Z 08010KT 9999 FEW020 28/22 Q1013"])
+    assert df["qnh_inhg"].tolist() == [29.92, 30.01, 29.91] and df["qnh_hpa"].tolist() == [1013.0, 1016.0, 1013.0]
@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from flights import FlightStore
+from fshub import FlightRow
+from pireps import APPROVED, DUPLICATE, PENDING, REJECTED, InvalidPirep, PirepStore, validate_pirep
+
+DAY = date.today() - timedelta(days=2)
+
+
+def pirep(pilot="THT1004", dep="ntaa", arr="NTTB", time_dep="08:10", time_arr="0905z", day_arr=DAY, landing=-180):
+    return validate_pirep(pilot, " tn08 ", "AT76", dep, arr, DAY, time_dep, day_arr, time_arr, landing, " RAS ")
+
+
+def test_validate_pirep():
+    p = pirep()
+    assert (p.flight_nb, p.dep, p.arr, p.block_minutes, p.remarks) == ("TN08", "NTAA", "NTTB", 55, "RAS")
+    assert pirep(time_dep="23:30", time_arr="00:40", day_arr=DAY + timedelta(days=1)).block_minutes == 70
+    with pytest.raises(InvalidPirep) as e:
+        validate_pirep("THT1004", "", "AT76", "NT", "NTTB", DAY, "25:00", DAY, "09:05", -4000)
+    # Toutes les erreurs remontées en une fois
+    assert len(e.value.errors) == 4 and isinstance(e.value, ValueError)
+    for kwargs in ({"time_arr": "08:00"}, {"time_arr": "08:10"}, {"day_arr": DAY + timedelta(days=2)}):
+        with pytest.raises(InvalidPirep): pirep(**kwargs)
+    with pytest.raises(InvalidPirep, match="futur"):
+        validate_pirep("THT1004", "TN08", "AT76", "NTAA", "NTTB", date.today() + timedelta(days=1), "08:00",
+                       date.today() + timedelta(days=1), "09:00", -150)
+
+
+def test_submit_detects_duplicates():
+    flights, store = FlightStore(":memory:"), PirepStore(":memory:")
+    pirep_id, status = store.submit(pirep(), flights)
+    assert status == PENDING and store.submit(pirep(), flights) == (pirep_id, PENDING)
+    assert store.pending_count() == 1
+    # Vol déjà synchronisé depuis fsHub le même jour sur la même route
+    flights.sync("THT1004", [FlightRow("NTTB", "NTTR", "AT76", -120, DAY, 30, 501)])
+    other_id, status = store.submit(pirep(dep="NTTB", arr="NTTR"), flights)
+    assert status == DUPLICATE and store.get(other_id)['duplicate_of'] == 501
+    assert [r['id'] for r in store.queue()] == [pirep_id]
+
+
+def test_review_flow():
+    flights, store = FlightStore(":memory:"), PirepStore(":memory:")
+    approved, _ = store.submit(pirep(), flights)
+    rejected, _ = store.submit(pirep(dep="NTTB", arr="NTTR"), flights)
+    raced, _ = store.submit(pirep(dep="NTTR", arr="NTTH"), flights)
+    assert store.approve(approved, "THT1001", flights) == APPROVED
+    assert store.approve(approved, "THT1002", flights) is None            # déjà traité
+    row = store.get(approved)
+    assert row['reviewed_by'] == "THT1001" and row['flight_id'] is not None
+    assert [(f.dep, f.arr, f.minutes) for f in flights.pilot_flights("THT1004")] == [("NTAA", "NTTB", 55)]
+    assert store.reject(rejected, "THT1001") == REJECTED and store.reject(rejected, "THT1001") is None
+    # Vol synchronisé par fsHub entre la soumission et la validation : doublon, rien n'est ajouté
+    flights.sync("THT1004", [FlightRow("NTTR", "NTTH", "AT76", -120, DAY, 25, 777)])
+    assert store.approve(raced, "THT1001", flights) == DUPLICATE
+    assert store.get(raced)['duplicate_of'] == 777 and flights.count("THT1004") == 2
+    assert store.queue() == [] and sorted(r['status'] for r in store.pilot_reports("THT1004")) == [APPROVED, DUPLICATE, REJECTED]
+
+
+def pirep_page():
+    import streamlit as st
+
+    import views
+    st.session_state.setdefault('lang', 'FR')
+    st.session_state.setdefault('username', 'THT1004')
+    views.render("menu_pirep")
+
+
+def test_form_shows_validation_errors():
+    at = AppTest.from_function(pirep_page, default_timeout=30).run()
+    at.text_input[1].input("NT")
+    at.button[0].click().run()
+    assert not at.exception
+    errors = [e.value for e in at.error]
+    assert "Numéro de vol manquant" in errors and any("départ invalide : 'NT'" in e for e in errors)
@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+
+import taf
+from taf import forecast_at, forecast_many, parse_taf
+
+NTAA = ("2026/10/18 11:00\n"
+        "TAF NTAA 181100Z 1812/1918 08012KT 9999 FEW020 TEMPO 1814/1818 4000 SHRA BKN012 BECMG 1820/1822 12005KT "
+        "PROB30 TEMPO 1900/1904 2000 TSRA FM191200 10015G25KT CAVOK=")
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_change_groups():
+    t = parse_taf(NTAA)
+    assert (t.station, t.issued, t.valid_from, t.valid_to) == ("NTAA", utc(2026, 10, 18, 11), utc(2026, 10, 18, 12), utc(2026, 10, 19, 18))
+    base = t.at(utc(2026, 10, 18, 13))
+    assert (base.prevailing.wind_dir, base.prevailing.wind_speed, base.prevailing.visibility_m, base.changes) == (80, 12, 9999, [])
+    # TEMPO : conditions temporaires à côté des conditions dominantes, inchangées
+    tempo = t.at(utc(2026, 10, 18, 15, 30))
+    assert tempo.prevailing.wind_speed == 12 and [(k, c.visibility_m, c.weather) for k, c in tempo.changes] == [("TEMPO", 4000, ["SHRA"])]
+    assert t.at(utc(2026, 10, 18, 18)).changes == []
+    # BECMG : changement en cours pendant sa période, puis fusionné (seul le vent change, nuages et visibilité gardés)
+    becoming = t.at(utc(2026, 10, 18, 21))
+    assert becoming.prevailing.wind_dir == 80 and [(k, c.wind_dir) for k, c in becoming.changes] == [("BECMG", 120)]
+    after = t.at(utc(2026, 10, 18, 23)).prevailing
+    assert (after.wind_dir, after.wind_speed, after.visibility_m, after.clouds) == (120, 5, 9999, [("FEW", 2000, None)])
+    # PROB30 TEMPO : un seul groupe
+    prob = t.at(utc(2026, 10, 19, 2))
+    assert prob.prevailing.wind_dir == 120 and [(k, c.visibility_m, c.weather) for k, c in prob.changes] == [("PROB30 TEMPO", 2000, ["TSRA"])]
+    # FM : remplace entièrement les conditions dominantes
+    fm = t.at(utc(2026, 10, 19, 12)).prevailing
+    assert (fm.wind_dir, fm.wind_speed, fm.wind_gust, fm.cavok, fm.clouds) == (100, 15, 25, True, [])
+
+
+def test_at_bounds():
+    t = parse_taf(NTAA)
+    assert t.at(utc(2026, 10, 18, 11, 59)) is None and t.at(utc(2026, 10, 19, 18)) is None
+    assert t.at(utc(2026, 10, 18, 12)).start == utc(2026, 10, 18, 12)
+    assert t.at(utc(2026, 10, 19, 17, 59)).end == utc(2026, 10, 19, 18)
+    assert forecast_at("pas un TAF", utc(2026, 10, 18, 13)) is None
+
+
+def test_month_and_year_rollover():
+    t = parse_taf("2026/10/31 17:00\nTAF NTAA 311700Z 3118/0124 08012KT 9999 FEW020 FM010600 12008KT 9999 SCT030")
+    assert (t.valid_from, t.valid_to) == (utc(2026, 10, 31, 18), utc(2026, 11, 2))
+    assert t.at(utc(2026, 11, 1, 5)).prevailing.wind_dir == 80 and t.at(utc(2026, 11, 1, 6)).prevailing.wind_dir == 120
+    # Référence (jour 1) postérieure à l'émission (jour 31) : mois et année précédents
+    t = parse_taf("TAF NTAA 312300Z 0100/0106 08012KT 9999 FEW020", ref=utc(2027, 1, 1, 0, 10))
+    assert (t.issued, t.valid_from, t.valid_to) == (utc(2026, 12, 31, 23), utc(2027, 1, 1), utc(2027, 1, 1, 6))
+
+
+def test_forecast_many_fetches_and_parses_once_per_station(monkeypatch):
+    fetched, parsed = [], []
+    real_parse = taf.parse_taf
+    monkeypatch.setattr(taf, "_PARSED", {})
+    monkeypatch.setattr(taf, "parse_taf", lambda text: parsed.append(text) or real_parse(text))
+
+    def get_taf(icao):
+        fetched.append(icao)
+        if icao == "XXXX": raise ConnectionError(icao)
+        return NTAA
+
+    results = forecast_many([("NTAA", utc(2026, 10, 18, 15)), ("XXXX", utc(2026, 10, 18, 15)), ("NTAA", utc(2026, 10, 19, 13)),
+                             ("NTAA", utc(2026, 10, 20))], get_taf)
+    assert fetched == ["NTAA", "XXXX"] and len(parsed) == 1
+    assert results[0].changes[0][0] == "TEMPO" and results[1] is None and results[2].prevailing.cavok and results[3] is None
+    # Même émission : décodage servi par le cache
+    forecast_at(NTAA, utc(2026, 10, 18, 13))
+    assert len(parsed) == 1
@@ -0,0 +1,61 @@
+from datetime import date
+
+from fshub import FlightRow
+from tours import APPROVED, REJECTED, TOURS, TourTracker, parse_tours
+
+
+def tours(*stops):
+    return {t.name: t for t in parse_tours([{"nom": "Tour", "debut": "2026-01-01", "escales": list(stops)}])}
+
+
+def flight(dep, arr, day, flight_id):
+    return FlightRow(dep, arr, "A320", -120, day, 60, flight_id)
+
+
+def test_definition_change_remaps_by_route_and_rematches(tmp_path):
+    path = str(tmp_path / "tours.sqlite3")
+    history = [flight("NTAA", "NTTB", date(2026, 2, 1), 1), flight("NTTB", "NTTR", date(2026, 2, 2), 2),
+               flight("NTTR", "NTTH", date(2026, 2, 3), 3)]
+    tracker = TourTracker(path, tours("NTAA", "NTTB", "NTTR"))
+    assert tracker.resync(["THT1004"], lambda pilot: history) == 2
+    assert tracker.progress("THT1004", "Tour").mask == 0b11
+    tracker.validate("THT1004", "Tour", 2, source="manual")
+    assert TourTracker(path, tours("NTAA", "NTTB", "NTTR")).stale == []
+
+    # Étape insérée en tête : les routes validées suivent leur nouvelle position, la nouvelle route reste ouverte,
+    # puis l'historique déjà synchronisé valide l'étape NTTR-NTTH ajoutée en fin de tour
+    tracker = TourTracker(path, tours("NTTM", "NTAA", "NTTB", "NTTR", "NTTH"))
+    assert tracker.stale == ["Tour"]
+    assert tracker.progress("THT1004", "Tour").mask == 0b0110
+    assert tracker.resync(["THT1004"], lambda pilot: history) == 1
+    assert tracker.progress("THT1004", "Tour").mask == 0b1110
+    assert TourTracker(path, tours("NTTM", "NTAA", "NTTB", "NTTR", "NTTH")).progress("THT1004", "Tour").mask == 0b1110
+
+
+def test_tour_without_published_legs():
+    tracker = TourTracker(":memory:", tours())
+    progress = tracker.progress("THT1004", "Tour")
+    assert progress.total == 0 and not progress.complete and progress.next_leg is None
+    assert tracker.match("THT1004", [flight("NTAA", "NTTB", date(2026, 2, 1), 1)]) == []
+
+
+def test_manual_request_is_approved_by_staff():
+    tracker = TourTracker(":memory:", tours("NTAA", "NTTB", "NTTR"))
+    request_id, created = tracker.request("THT1004", "Tour", 2, "NTTB", "NTTR", "AT76", date(2026, 2, 2), "00:35")
+    assert created and tracker.request("THT1004", "Tour", 2) == (request_id, False)
+    other, _ = tracker.request("THT1005", "Tour", 1)
+    assert [r.id for r in tracker.pending()] == [request_id, other]
+    assert tracker.approve(request_id, "THT1001") == APPROVED
+    assert tracker.approve(request_id, "THT1001") is None          # déjà traitée
+    progress = tracker.progress("THT1004", "Tour")
+    assert progress.mask == 0b10 and progress.next_leg == (1, ("NTAA", "NTTB"))
+    assert tracker.reject(other, "THT1001") == REJECTED and tracker.pending() == []
+    assert tracker.progress("THT1005", "Tour").mask == 0
+    # Étape inexistante : la demande reste en attente, rien n'est validé
+    bad, _ = tracker.request("THT1004", "Tour", 9)
+    assert tracker.approve(bad, "THT1001") is None and [r.id for r in tracker.pending()] == [bad]
+
+
+def test_published_tours_have_legs():
+    assert TOURS and all(tour.legs for tour in TOURS.values())
+    assert all(a != b for tour in TOURS.values() for a, b in tour.legs)
@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import weather
+from metrics import METRICS
+from weather import CycleIngester, CycleTable, HttpCycleSource, StationNotFound, WeatherCache, directory_cycle_source, get_many
+
+
+def write_cycle(directory, product, blocks):
+    # Même fichier pour les 24 heures : le test ne dépend pas de l'heure à laquelle il tourne
+    folder = directory / product.lower()
+    folder.mkdir(exist_ok=True)
+    text = "".join(f"{stamp:%Y/%m/%d %H:%M}\n{bulletin}\n\n" for stamp, bulletin in blocks)
+    for hour in range(24): (folder / f"{hour:02d}Z.TXT").write_text(text, encoding="latin-1")
+
+
+def test_ingester_fills_cycle_tables(tmp_path, monkeypatch):
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    write_cycle(tmp_path, "METAR", [(now - timedelta(minutes=20), "NTAA 181200Z 08010KT 9999 FEW020 28/22 Q1012"),
+                                    (now - timedelta(minutes=50), "NTTB 181130Z 10005KT CAVOK 29/21 Q1011"),
+                                    (now - timedelta(minutes=10), "NTTB 181150Z 11006KT CAVOK 29/21 Q1011"),
+                                    (now - timedelta(hours=4), "KLAX 180800Z 25008KT 10SM CLR 18/12 A2992")])
+    write_cycle(tmp_path, "TAF", [(now - timedelta(hours=2), "TAF NTAA 181100Z 1812/1918 08012KT 9999 FEW020")])
+    tables = {"METAR": CycleTable("METAR", max_age=3 * 3600), "TAF": CycleTable("TAF", max_age=8 * 3600)}
+    monkeypatch.setattr(weather, "CYCLE_TABLES", tables)
+    ingester = CycleIngester(tables, source=directory_cycle_source(str(tmp_path)))
+    ingester.run_once()
+    assert ingester.errors == 0 and len(tables["METAR"]) == 3 and len(tables["TAF"]) == 1
+    # Bulletin le plus récent gardé par station, table servie avant toute requête NOAA
+    assert weather.fetch_weather("nttb", "METAR") == "NTTB 181150Z 11006KT CAVOK 29/21 Q1011"
+    assert weather.fetch_weather("NTAA", "TAF").endswith("\nTAF NTAA 181100Z 1812/1918 08012KT 9999 FEW020")
+    # Au-delà de max_age : plus servi par la table (repli sur la requête station)
+    assert tables["METAR"].lookup("KLAX") is None
+
+    # Fichiers inchangés : ni relus ni réanalysés ; un cycle modifié est relu
+    loaded_at = tables["METAR"].loaded_at
+    ingester.run_once()
+    assert ingester.not_modified == 4 and tables["METAR"].loaded_at == loaded_at
+    path = tmp_path / "metar" / f"{datetime.now(timezone.utc).hour:02d}Z.TXT"
+    path.write_text(f"{now:%Y/%m/%d %H:%M}\nNTAA 181230Z 09012KT 9999 SCT020 28/22 Q1013\n\n", encoding="latin-1")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    ingester.run_once()
+    assert tables["METAR"].lookup("NTAA") == "NTAA 181230Z 09012KT 9999 SCT020 28/22 Q1013"
+
+
+class FakeResponse:
+    def __init__(self, status_code, lines=(), headers=None):
+        self.status_code = status_code
+        self.lines = lines
+        self.headers = headers or {}
+        self.encoding = None
+
+    def raise_for_status(self):
+        if self.status_code >= 400: raise ConnectionError(self.status_code)
+
+    def iter_lines(self, decode_unicode=False):
+        yield from self.lines
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeSession:
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers)
+        if headers.get("If-None-Match") == '"v1"': return FakeResponse(304)
+        return FakeResponse(200, ["2026/10/18 12:00", "NTAA 181200Z 08010KT 9999 FEW020 28/22 Q1012", ""],
+                            {"ETag": '"v1"', "Last-Modified": "Sun, 18 Oct 2026 12:05:00 GMT"})
+
+
+def test_http_source_sends_validators(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(weather, "_SESSION", session)
+    source = HttpCycleSource()
+    assert len(list(source("METAR", 12))) == 3
+    assert source("METAR", 12) is None
+    assert session.requests[1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Sun, 18 Oct 2026 12:05:00 GMT"}
+    # Autre cycle : pas de validateur connu, téléchargement complet
+    assert source("METAR", 13) is not None and session.requests[2] == {}
+
+
+def test_weather_cache_reports_hits_and_misses():
+    calls = []
+
+    def fetcher(icao, product):
+        calls.append(icao)
+        if icao == "XXXX": raise StationNotFound(icao)
+        return f"{icao} 181200Z 08010KT 9999 FEW020 28/22 Q1012"
+
+    cache = WeatherCache(fetcher, ttl=600, max_stale=3600)
+    metric = "test.weather_cache"
+    cache.get("NTAA", "METAR", metric=metric)                   # échec : appel
+    cache.get("ntaa", "METAR", metric=metric)                   # succès : frais
+    for _ in range(2):
+        with pytest.raises(StationNotFound): cache.get("XXXX", "METAR", metric=metric)   # échec, puis succès négatif
+    text, stamp = cache._entries[("NTAA", "METAR")]
+    cache._entries[("NTAA", "METAR")] = (text, stamp - 900)
+    cache.get("NTAA", "METAR", metric=metric)                   # succès : périmé servi, rafraîchi en arrière-plan
+    cache.get("NTTB", "METAR")                                  # sans nom : non compté
+    m = METRICS.snapshot()[metric]
+    assert (m.hits, m.misses) == (3, 2)
+    assert cache.stats["hits"] == cache.stats["negative_hits"] == cache.stats["stale_hits"] == 1 and cache.stats["misses"] == 3
+
+
+def test_weather_cache_single_flight():
+    release, calls = threading.Event(), []
+
+    def fetcher(icao, product):
+        calls.append(icao)
+        release.wait(5)
+        if icao == "DOWN": raise ConnectionError(icao)
+        return f"{icao} 181200Z 08010KT 9999 FEW020 28/22 Q1012"
+
+    cache = WeatherCache(fetcher)
+    for station in ("NTAA", "DOWN"):
+        results = []
+
+        def read():
+            try: results.append(cache.get(station, "METAR"))
+            except ConnectionError as e: results.append(e)
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for t in threads: t.start()
+        time.sleep(0.2)
+        release.set()
+        for t in threads: t.join(5)
+        release.clear()
+        # Un seul appel amont ; les autres sessions attendent et reçoivent le même résultat (ou l'erreur)
+        assert calls.count(station) == 1 and len(results) == 8
+        if station == "NTAA": assert set(results) == {"NTAA 181200Z 08010KT 9999 FEW020 28/22 Q1012"}
+        else: assert all(isinstance(r, ConnectionError) for r in results)
+    assert cache.stats["refreshes"] == 2 and cache.stats["errors"] == 1 and cache.stats["misses"] == 16
+
+
+def test_get_many_returns_partial_results_at_deadline():
+    slow, calls = threading.Event(), []
+
+    def fetcher(icao, product):
+        calls.append((icao, product))
+        if icao == "SLOW": slow.wait(5)
+        if icao == "XXXX": raise StationNotFound(icao)
+        return f"{product} {icao}"
+
+    cache = WeatherCache(fetcher)
+    start = time.perf_counter()
+    try:
+        results = get_many([("ntaa", "METAR"), ("NTAA", "METAR"), ("NTAA", "TAF"), ("SLOW", "METAR"), ("XXXX", "METAR"), ("", "METAR")],
+                           deadline=0.3, cache=cache)
+    finally: slow.set()
+    assert time.perf_counter() - start < 2
+    # Station lente absente du résultat, erreurs rendues comme valeurs, doublons et codes vides ignorés
+    assert set(results) == {("NTAA", "METAR"), ("NTAA", "TAF"), ("XXXX", "METAR")}
+    assert results[("NTAA", "METAR")] == "METAR NTAA" and results[("NTAA", "TAF")] == "TAF NTAA"
+    assert isinstance(results[("XXXX", "METAR")], StationNotFound)
+    assert sorted(calls) == [("NTAA", "METAR"), ("NTAA", "TAF"), ("SLOW", "METAR"), ("XXXX", "METAR")]
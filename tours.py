@@ -0,0 +1,258 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import date
+
+from flights import DATA_DIR
+
+# --- DEFINITION DES TOURS ---
+# Tours tenus par le staff dans tours.json : {"nom", "debut", "escales": [...]}, l'étape n allant de escales[n-1] à
+# escales[n]. Un tour sans escales publiées n'est pas suivi (ni rapprochement, ni validation manuelle).
+TOURS_FILE = os.environ.get("ATN_TOURS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "tours.json"))
+
+
+@dataclass(frozen=True, slots=True)
+class Tour:
+    name: str
+    legs: tuple                         # ((dep, arr), ...) dans l'ordre
+    start: date | None = None           # vols antérieurs non pris en compte
+    signature: int = 0                  # crc32 des étapes et de la date de début : relance le rapprochement si elle change
+
+    @property
+    def full_mask(self):
+        return (1 << len(self.legs)) - 1
+
+
+def parse_tours(rows):
+    tours = []
+    for r in rows:
+        legs = tuple(zip(r['escales'], r['escales'][1:]))
+        start = date.fromisoformat(r['debut']) if r.get('debut') else None
+        tours.append(Tour(r['nom'], legs, start, zlib.crc32(repr((legs, start)).encode())))
+    return tours
+
+
+def load_tours(path):
+    with open(path, encoding="utf-8") as f: return {t.name: t for t in parse_tours(json.load(f))}
+
+
+TOURS = load_tours(TOURS_FILE)
+
+
+def route_key(route):
+    return f"{route[0]}-{route[1]}"
+
+
+@dataclass(frozen=True, slots=True)
+class TourProgress:
+    tour: Tour
+    mask: int                           # bit n-1 = étape n validée
+
+    @property
+    def done(self):
+        return self.mask.bit_count()
+
+    @property
+    def total(self):
+        return len(self.tour.legs)
+
+    @property
+    def complete(self):
+        return bool(self.tour.legs) and self.mask == self.tour.full_mask
+
+    @property
+    def next_leg(self):
+        # (numéro, (dep, arr)) de la première étape non validée, None si le tour est terminé ou sans étapes publiées
+        if not self.tour.legs or self.complete: return None
+        idx = (~self.mask & (self.mask + 1)).bit_length() - 1
+        return idx + 1, self.tour.legs[idx]
+
+    def leg_done(self, number):
+        return bool(self.mask >> (number - 1) & 1)
+
+
+# --- SUIVI PAR PILOTE ---
+# Étapes validées stockées en SQLite avec leur route ("DEP-ARR") ; masque de progression (pilote, tour) tenu en
+# mémoire et mis à jour à chaque validation, donc lu en temps constant par la page. Quand les étapes d'un tour
+# changent (signature différente de celle enregistrée), les étapes validées sont replacées par route sur la
+# nouvelle définition (celles dont la route a disparu sont retirées) et l'historique est de nouveau rapproché.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tour_legs (
+    pilot TEXT NOT NULL,
+    tour TEXT NOT NULL,
+    leg INTEGER NOT NULL,
+    flight_id INTEGER,
+    source TEXT NOT NULL,
+    validated_at REAL NOT NULL,
+    route TEXT,
+    PRIMARY KEY (pilot, tour, leg)
+);
+CREATE TABLE IF NOT EXISTS tour_meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS tour_requests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pilot TEXT NOT NULL,
+    tour TEXT NOT NULL,
+    leg INTEGER NOT NULL,
+    dep TEXT,
+    arr TEXT,
+    aircraft TEXT,
+    flight_date TEXT,
+    block TEXT,
+    remarks TEXT,
+    status TEXT NOT NULL,
+    submitted_at REAL NOT NULL,
+    reviewed_by TEXT,
+    reviewed_at REAL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tour_requests_pending ON tour_requests (pilot, tour, leg) WHERE status = 'pending';
+"""
+
+
+# --- DEMANDES DE VALIDATION MANUELLE ---
+# Vol non suivi par fsHub : la demande du pilote attend dans une file Staff ; l'approbation valide l'étape comme un
+# vol rapproché (source "manual"). Une seule demande en attente par (pilote, tour, étape).
+PENDING, APPROVED, REJECTED = "pending", "approved", "rejected"
+
+
+@dataclass(frozen=True, slots=True)
+class TourRequest:
+    id: int
+    pilot: str
+    tour: str
+    leg: int
+    dep: str
+    arr: str
+    aircraft: str
+    flight_date: str
+    block: str
+    remarks: str
+    status: str
+
+
+_REQUEST_COLUMNS = "id, pilot, tour, leg, dep, arr, aircraft, flight_date, block, remarks, status"
+
+
+class TourTracker:
+    def __init__(self, path, tours):
+        if path != ":memory:": os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        if "route" not in {row[1] for row in self._db.execute("PRAGMA table_info(tour_legs)")}:
+            self._db.execute("ALTER TABLE tour_legs ADD COLUMN route TEXT")
+        self.tours = tours
+        # (dep, arr) -> [(tour, numéro d'étape)] : un seul accès dictionnaire par vol à rapprocher
+        self._by_route = {}
+        for tour in tours.values():
+            for n, route in enumerate(tour.legs, 1):
+                self._by_route.setdefault(route, []).append((tour, n))
+        self._lock = threading.Lock()
+        signatures = dict(self._db.execute("SELECT key, value FROM tour_meta WHERE key LIKE 'signature:%'"))
+        self.stale = [name for name, tour in tours.items() if signatures.get(f"signature:{name}") != str(tour.signature)]
+        with self._db:
+            for name in self.stale: self._remap(self.tours[name])
+        self._masks = {}
+        for pilot, tour, leg in self._db.execute("SELECT pilot, tour, leg FROM tour_legs"):
+            if tour in tours: self._masks[(pilot, tour)] = self._masks.get((pilot, tour), 0) | 1 << (leg - 1)
+
+    def _remap(self, tour):
+        # Étapes validées replacées par route, dans l'ordre : la k-ième validation d'une route va à la k-ième étape
+        # de cette route dans la nouvelle définition. Idempotent (relancé tant que la signature n'est pas enregistrée).
+        rows = self._db.execute("SELECT pilot, leg, flight_id, source, validated_at, route FROM tour_legs WHERE tour = ? "
+                                "ORDER BY pilot, leg", (tour.name,)).fetchall()
+        self._db.execute("DELETE FROM tour_legs WHERE tour = ?", (tour.name,))
+        legs_by_route = {}
+        for n, route in enumerate(tour.legs, 1): legs_by_route.setdefault(route_key(route), []).append(n)
+        kept, pilot_legs, current = [], {}, None
+        for pilot, _, flight_id, source, validated_at, route in rows:
+            if pilot != current: pilot_legs, current = {r: list(ns) for r, ns in legs_by_route.items()}, pilot
+            if pilot_legs.get(route):
+                kept.append((pilot, tour.name, pilot_legs[route].pop(0), flight_id, source, validated_at, route))
+        self._db.executemany("INSERT INTO tour_legs VALUES (?, ?, ?, ?, ?, ?, ?)", kept)
+
+    def progress(self, pilot, tour_name):
+        return TourProgress(self.tours[tour_name], self._masks.get((pilot, tour_name), 0))
+
+    def all_progress(self, pilot):
+        return [self.progress(pilot, name) for name in self.tours]
+
+    def validate(self, pilot, tour_name, leg, flight_id=None, source="manual"):
+        bit = 1 << (leg - 1)
+        route = route_key(self.tours[tour_name].legs[leg - 1])
+        with self._lock, self._db:
+            if self._masks.get((pilot, tour_name), 0) & bit: return False
+            self._db.execute("INSERT OR IGNORE INTO tour_legs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (pilot, tour_name, leg, flight_id, source, time.time(), route))
+            self._masks[(pilot, tour_name)] = self._masks.get((pilot, tour_name), 0) | bit
+        return True
+
+    def request(self, pilot, tour_name, leg, dep="", arr="", aircraft="", flight_date="", block="", remarks=""):
+        # -> (id, créée) ; une demande déjà en attente pour la même étape est renvoyée telle quelle
+        with self._lock, self._db:
+            cur = self._db.execute("INSERT OR IGNORE INTO tour_requests (pilot, tour, leg, dep, arr, aircraft, flight_date, block, remarks, "
+                                   "status, submitted_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                   (pilot, tour_name, leg, dep, arr, aircraft, str(flight_date), block, remarks, PENDING, time.time()))
+            if cur.rowcount: return cur.lastrowid, True
+            return self._db.execute("SELECT id FROM tour_requests WHERE pilot = ? AND tour = ? AND leg = ? AND status = ?",
+                                    (pilot, tour_name, leg, PENDING)).fetchone()[0], False
+
+    def pending(self, limit=50):
+        with self._lock:
+            rows = self._db.execute(f"SELECT {_REQUEST_COLUMNS} FROM tour_requests WHERE status = ? ORDER BY submitted_at LIMIT ?",
+                                    (PENDING, limit)).fetchall()
+        return [TourRequest(*row) for row in rows]
+
+    def _review(self, request_id, status, reviewer):
+        # Transition unique depuis "pending" : deux membres du Staff ne peuvent pas traiter la même demande
+        with self._lock, self._db:
+            row = self._db.execute(f"SELECT {_REQUEST_COLUMNS} FROM tour_requests WHERE id = ? AND status = ?", (request_id, PENDING)).fetchone()
+            if row is None: return None
+            self._db.execute("UPDATE tour_requests SET status = ?, reviewed_by = ?, reviewed_at = ? WHERE id = ?",
+                             (status, reviewer, time.time(), request_id))
+        return TourRequest(*row)
+
+    def approve(self, request_id, reviewer):
+        # Refusée sans effet si le tour ou l'étape n'existent plus dans tours.json
+        with self._lock:
+            row = self._db.execute("SELECT tour, leg FROM tour_requests WHERE id = ?", (request_id,)).fetchone()
+        if row is None or row[0] not in self.tours or not 1 <= row[1] <= len(self.tours[row[0]].legs): return None
+        req = self._review(request_id, APPROVED, reviewer)
+        if req is None: return None
+        self.validate(req.pilot, req.tour, req.leg, source="manual")
+        return APPROVED
+
+    def reject(self, request_id, reviewer):
+        return REJECTED if self._review(request_id, REJECTED, reviewer) else None
+
+    def match(self, pilot, flights):
+        # Rapprochement par lot : dans chaque tour, un vol (FlightRow) valide la première étape encore ouverte de
+        # même route ; vols traités du plus ancien au plus récent. Retourne [(tour, étape)] nouvellement validés.
+        validated = []
+        for f in sorted(flights, key=lambda f: f.day or date.min):
+            used = set()
+            for tour, n in self._by_route.get((f.dep, f.arr), ()):
+                if tour.name in used or (tour.start and (f.day is None or f.day < tour.start)): continue
+                if self._masks.get((pilot, tour.name), 0) >> (n - 1) & 1: continue
+                if self.validate(pilot, tour.name, n, f.flight_id, "fshub"):
+                    validated.append((tour.name, n))
+                    used.add(tour.name)
+        return validated
+
+    def resync(self, pilots, load):
+        # Au démarrage : tout l'historique local est rapproché de nouveau si un tour est nouveau ou a changé depuis
+        # le dernier passage (premier démarrage compris) ; sinon seuls les vols nouvellement synchronisés passent par
+        # match(). Les signatures ne sont enregistrées qu'une fois le rapprochement terminé.
+        if not self.stale: return 0
+        count = sum(len(self.match(pilot, load(pilot))) for pilot in pilots)
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO tour_meta VALUES (?, ?)",
+                                 [(f"signature:{name}", str(self.tours[name].signature)) for name in self.stale])
+            self.stale = []
+        return count
+
+
+TOUR_TRACKER = TourTracker(os.path.join(DATA_DIR, "tours.sqlite3"), TOURS)
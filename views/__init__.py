@@ -0,0 +1,54 @@
+import functools
+import importlib
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from metrics import METRICS
+
+# --- PAGES ---
+# Clé de menu -> module de views/. Chaque module (et ses dépendances lourdes : pandas, services...) n'est importé
+# qu'au premier affichage de la page, puis reste en cache pour tout le process.
+PAGES = {
+    "menu_home": "home",
+    "menu_profile": "profile",
+    "menu_briefing": "briefing",
+    "menu_events": "agenda",
+    "menu_roster": "roster",
+    "menu_pirep": "pirep",
+    "menu_metar": "metar",
+    "menu_tours": "tour_progress",
+    "menu_checklist": "checklist",
+    "menu_contact": "contact",
+    "menu_metrics": "staff_metrics",
+}
+STAFF_PAGES = {"menu_metrics"}
+
+
+def menu(staff):
+    return [page for page in PAGES if staff or page not in STAFF_PAGES]
+
+
+def render(page):
+    module = PAGES.get(page, page)
+    with METRICS.time(f"page.{module}"):
+        importlib.import_module(f"views.{module}").render()
+
+
+# --- FRAGMENTS ---
+# Zones interactives rejouées seules par Streamlit (st.fragment) : une case cochée, un vote ou une réponse au quiz
+# ne relance que la zone concernée, sans CSS, barre latérale ni reste de la page. Chaque exécution est chronométrée
+# ("fragment.<module>.<fonction>" dans METRICS) : temps propre du fragment, à comparer au rerun complet ("app.run").
+def fragment(fn):
+    name = f"fragment.{fn.__module__}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        with METRICS.time(name): return fn(*args, **kwargs)
+    return st.fragment(timed)
+
+
+def rerun_fragment():
+    # Rerun limité au fragment courant ; rerun complet si l'exécution en cours n'est pas celle d'un fragment
+    try: st.rerun(scope="fragment")
+    except StreamlitAPIException: st.rerun()
@@ -0,0 +1,50 @@
+import pandas as pd
+import streamlit as st
+
+from events import STATUS_MAYBE, STATUS_NO, STATUS_YES
+from i18n import T
+from services import event_card_html, get_event_board, save_event_data
+from views import fragment, rerun_fragment
+
+
+@fragment
+def event_rsvp(ev, uid):
+    # Un vote ne rejoue que la carte de l'événement (compteurs et participants relus sur l'index à jour) ;
+    # la liste "mes événements" suit au prochain rerun complet
+    board = get_event_board()
+    st.markdown(event_card_html(ev, board), unsafe_allow_html=True)
+    c1, c2, c3, c4 = st.columns([1, 1, 1, 3])
+    mine = board.status(ev.id, uid)
+    full = board.full(ev.id) and mine != STATUS_YES
+    vote = None
+    if c1.button(T("event_full") if full else "✅ Présent", key=f"{ev.id}_yes", disabled=full): vote = STATUS_YES
+    if c2.button("🤔 Peut-être", key=f"{ev.id}_maybe"): vote = STATUS_MAYBE
+    if c3.button("❌ Absent", key=f"{ev.id}_no"): vote = STATUS_NO
+    if mine: c4.caption(f"{T('event_my_status')} : {mine} · ✅ {board.count(ev.id, STATUS_YES)} · 🤔 {board.count(ev.id, STATUS_MAYBE)} · ❌ {board.count(ev.id, STATUS_NO)}")
+    if vote:
+        save_event_data(ev.id, uid, vote)
+        rerun_fragment()
+    participants = board.participants(ev.id)
+    if participants:
+        with st.expander(f"👥 Participants ({len(participants)})"):
+            st.dataframe(pd.DataFrame(list(participants.items()), columns=['Pilote', 'Statut']), use_container_width=True)
+
+
+def render():
+    st.title(T("event_title"))
+    board = get_event_board()
+    uid = st.session_state['username']
+    upcoming = board.upcoming()
+    if not upcoming: st.info(T("event_none"))
+    for ev in upcoming:
+        event_rsvp(ev, uid)
+    st.markdown("---")
+    my_events = board.my_events(uid)
+    if my_events:
+        st.write(f"### {T('event_mine')}")
+        for ev, status in my_events: st.write(f"**{ev.start:%d/%m/%Y %H:%M} Z** · {ev.title} · {status}")
+    past = board.past(limit=5)
+    if past:
+        with st.expander(T("event_past")):
+            for ev in past:
+                st.markdown(event_card_html(ev, board), unsafe_allow_html=True)
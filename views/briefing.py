@@ -0,0 +1,67 @@
+import streamlit as st
+
+from i18n import T
+from metar import metar_summary, summarize
+from services import get_weather_batch, parse_eta
+from taf import forecast_at
+
+
+def render():
+    st.title(T("briefing_title"))
+    st.info(T("briefing_desc"))
+    
+    st.markdown("### 🗺️ Plan de Vol")
+    with st.container(border=True):
+        c1, c2, c3, c4 = st.columns(4)
+        with c1: dep = st.text_input(T("briefing_dep"), max_chars=4, placeholder="NTAA").upper()
+        with c2: arr = st.text_input(T("briefing_arr"), max_chars=4, placeholder="NTTB").upper()
+        with c3: ac = st.text_input(T("briefing_ac"), placeholder="A320")
+        with c4: eta = parse_eta(st.text_input(T("briefing_eta"), max_chars=5, placeholder="HH:MM"))
+        
+        st.write("")
+        if st.button(T("briefing_btn"), type="primary", use_container_width=True):
+            if dep and arr:
+                st.markdown("---")
+                st.success(f"✅ Route analysée : **{dep}** ➡️ **{arr}**")
+                wx = get_weather_batch([dep, arr])
+                col_met1, col_met2 = st.columns(2)
+                with col_met1:
+                    with st.container(border=True):
+                        st.subheader(f"🛫 {dep}")
+                        raw_met = wx[(dep, "METAR")]
+                        data_met = metar_summary(raw_met)
+                        m1, m2, m3 = st.columns(3)
+                        m1.metric("💨 Vent", data_met["Wind"])
+                        m2.metric("🌡️ Temp", data_met["Temp"])
+                        m3.metric("⏱️ QNH", data_met["QNH"])
+                        with st.expander("📄 Voir Bulletin Brut (METAR/TAF)"):
+                            st.code(raw_met, language="text")
+                            st.caption("Prévisions (TAF) :")
+                            st.code(wx[(dep, "TAF")], language="text")
+                with col_met2:
+                    with st.container(border=True):
+                        st.subheader(f"🛬 {arr}")
+                        raw_met_arr = wx[(arr, "METAR")]
+                        data_met_arr = metar_summary(raw_met_arr)
+                        m1, m2, m3 = st.columns(3)
+                        m1.metric("💨 Vent", data_met_arr["Wind"])
+                        m2.metric("🌡️ Temp", data_met_arr["Temp"])
+                        m3.metric("⏱️ QNH", data_met_arr["QNH"])
+                        if eta:
+                            st.caption(f"{T('briefing_eta_fcst')} : {eta.strftime('%d/%m %H:%M')} Z")
+                            period = forecast_at(wx[(arr, "TAF")], eta)
+                            if period:
+                                e1, e2 = st.columns(2)
+                                e1.metric("💨 Vent", summarize(period.prevailing)["Wind"])
+                                e2.metric("👁️ Visi", f"{period.prevailing.visibility_m} m" if period.prevailing.visibility_m is not None else "N/A")
+                                for kind, cond in period.changes: st.caption(f"{kind} : {cond.raw}")
+                            else: st.caption("N/A")
+                        with st.expander("📄 Voir Bulletin Brut (METAR/TAF)"):
+                            st.code(raw_met_arr, language="text")
+                            st.caption("Prévisions (TAF) :")
+                            st.code(wx[(arr, "TAF")], language="text")
+                if ac:
+                    simbrief_url = f"https://dispatch.simbrief.com/options/new?type={ac}&orig={dep}&dest={arr}"
+                    st.markdown("---")
+                    st.markdown(f"""<div style="text-align: center;"><a href="{simbrief_url}" target="_blank" style="text-decoration: none;"><button style="background-color: #d32f2f; color: white; padding: 15px 30px; border: none; border-radius: 8px; font-size: 18px; font-weight: bold; cursor: pointer; transition: 0.3s;">{T("briefing_simbrief")}</button></a></div>""", unsafe_allow_html=True)
+            else: st.error("Veuillez entrer au moins un aéroport de départ et d'arrivée.")
@@ -0,0 +1,47 @@
+import streamlit as st
+
+from checklists import CHECKLIST_STORE, CHECKLISTS
+from i18n import T
+from views import fragment
+
+
+def _toggle(state, phase, item, key):
+    state.set(phase, item, st.session_state[key])
+    CHECKLIST_STORE.save(st.session_state['username'], state)
+
+
+def _draw_progress(bar, state):
+    done, total = state.progress()
+    bar.progress(done / total if total else 0.0, text=f"{T('checklist_progress')} : {done}/{total}")
+
+
+@fragment
+def checklist_phase(state, phase, bar):
+    # Une case cochée ne rejoue que sa phase ; l'état (masque de la phase) est enregistré à chaque changement et la
+    # barre globale, réservée par render() avec st.empty(), est redessinée depuis le fragment
+    name, items = state.checklist.phases[phase]
+    with st.expander(f"🔹 {name}", expanded=False):
+        for i, item in enumerate(items):
+            key = f"chk_{state.checklist.aircraft}_{state.generation}_{phase}_{i}"
+            st.checkbox(item, value=state.checked(phase, i), key=key, on_change=_toggle, args=(state, phase, i, key))
+        if state.phase_done(phase): st.success(T("checklist_complete"))
+    _draw_progress(bar, state)
+
+
+def render():
+    st.title(T("checklist_title"))
+    st.warning(T("checklist_info"))
+    aircraft = st.selectbox(T("checklist_aircraft"), list(CHECKLISTS), index=list(CHECKLISTS).index("A320") if "A320" in CHECKLISTS else 0,
+                            format_func=lambda a: f"{a} · {CHECKLISTS[a].name}", key="checklist_aircraft")
+    # Progression restaurée depuis le dernier enregistrement du pilote au changement d'appareil
+    state = st.session_state.get('checklist')
+    if state is None or state.checklist.aircraft != aircraft:
+        state = st.session_state['checklist'] = CHECKLIST_STORE.load(st.session_state['username'], aircraft)
+    bar = st.empty()
+    _draw_progress(bar, state)
+    if st.button(T("checklist_reset")):
+        state.reset()
+        CHECKLIST_STORE.save(st.session_state['username'], state)
+        st.rerun()
+    for phase in range(len(state.checklist.phases)):
+        checklist_phase(state, phase, bar)
@@ -0,0 +1,29 @@
+import streamlit as st
+
+from assets import LOGO
+from i18n import T
+from services import send_email_via_ionos, show_mail_status
+
+
+def render():
+    st.title(T("contact_title"))
+    c_contact_1, c_contact_2 = st.columns([1, 2])
+    with c_contact_1:
+        st.markdown(f'<img src="{LOGO.url}" width="150" alt="ATN-Virtual">', unsafe_allow_html=True)
+        st.write("### ATN-Virtual Staff")
+        st.info(T("contact_desc"))
+        st.caption("Réponse sous 24/48h")
+    with c_contact_2:
+        with st.container(border=True):
+            st.write("#### 📩 Formulaire")
+            st.text_input("De (Expéditeur)", value=st.session_state['username'], disabled=True)
+            sujet_contact = st.text_input(T("form_subject"), placeholder="ex: Problème PIREP...")
+            message_contact = st.text_area(T("form_msg"), height=150)
+            
+            if st.button(T("contact_send"), type="primary"):
+                final_subject = f"[Crew Center] {sujet_contact}" if sujet_contact else "[Crew Center] Nouvelle demande"
+                body = f"De: {st.session_state['username']}\n\n{message_contact}"
+                res = send_email_via_ionos(final_subject, body)
+                if res is True: st.success(T("email_success"))
+                else: st.error(T("email_error") + str(res))
+            show_mail_status()
@@ -0,0 +1,71 @@
+import pandas as pd
+import streamlit as st
+
+from flights import FLIGHT_STORE
+from i18n import T
+from leaderboard import LEADERBOARD
+from metar import metar_summary
+from roster import ROSTER
+from services import event_card_html, get_event_board, get_real_metar, get_va_stats_surgical, leaderboard_html, podium_top3_html, recent_flights_html
+
+
+def render():
+    st.title(f"🌺 {T('title_home')} {st.session_state['username']}")
+    metar_ntaa = get_real_metar('NTAA')
+    data_ntaa = metar_summary(metar_ntaa)
+    with st.expander(f"🌦️ Météo Tahiti (NTAA)", expanded=False):
+        mc1, mc2, mc3 = st.columns(3)
+        mc1.metric("Vent", data_ntaa["Wind"])
+        mc2.metric("Temp", data_ntaa["Temp"])
+        mc3.metric("QNH", data_ntaa["QNH"])
+        st.caption(metar_ntaa)
+    st.write("")
+    
+    # --- RECUPERATION STATS ---
+    va_stats = get_va_stats_surgical()
+    
+    c1,c2,c3,c4 = st.columns(4)
+    c1.metric(T("stats_pilots"), str(len(ROSTER)), "Actifs")
+    c2.metric(T("stats_hours"), f"{va_stats['hours']} h", "Total")
+    c3.metric(T("stats_flights"), va_stats['flights'], "Total") 
+    landing = FLIGHT_STORE.landing
+    if landing.count:
+        c4.metric(T("stats_landing"), f"{landing.mean:.0f} fpm", f"{landing.hard_rate:.1%} {T('landing_hard')}", delta_color="inverse")
+        with st.expander(T("landing_distribution")):
+            st.caption(f"n = {landing.count} · σ = {landing.stddev:.0f} fpm · P10 {landing.percentile(10):.0f} · P50 {landing.percentile(50):.0f} · P90 {landing.percentile(90):.0f}")
+            st.bar_chart(pd.Series(landing.distribution(), name="fpm").rename(index=str))
+    else:
+        c4.metric(T("stats_landing"), "N/A")
+        c4.caption(T("landing_no_data"))
+    st.markdown("---")
+    
+    st.subheader(T("leaderboard_title"))
+    st.markdown(podium_top3_html(), unsafe_allow_html=True)
+    with st.expander(T("leaderboard_more")):
+        # Vues top-K tenues par LEADERBOARD à chaque synchronisation : le rendu ne fait que lire le HTML en cache
+        tab_flights, tab_landing, tab_month = st.tabs([T("leaderboard_flights"), T("leaderboard_landing"), T("leaderboard_month")])
+        for tab, view in ((tab_flights, "flights"), (tab_landing, "landing")):
+            html = leaderboard_html(view)
+            if html: tab.markdown(html, unsafe_allow_html=True)
+            else: tab.caption(T("leaderboard_empty"))
+        months = LEADERBOARD.months()
+        if months:
+            month = tab_month.selectbox(T("leaderboard_month"), months, key="leaderboard_month", label_visibility="collapsed")
+            tab_month.markdown(leaderboard_html(f"month:{month}"), unsafe_allow_html=True)
+        else: tab_month.caption(T("leaderboard_empty"))
+    st.markdown("---")
+    
+    st.subheader(T("event_next"))
+    board = get_event_board()
+    next_ev = board.next_event()
+    if next_ev:
+        st.markdown(event_card_html(next_ev, board), unsafe_allow_html=True)
+        my_status = board.status(next_ev.id, st.session_state['username'])
+        if my_status: st.caption(f"{T('event_my_status')} : {my_status}")
+    else: st.caption(T("event_none"))
+    st.markdown("---")
+
+    st.subheader(T("recent_flights"))
+    flights_html = recent_flights_html()
+    if flights_html: st.markdown(flights_html, unsafe_allow_html=True)
+    else: st.caption(T("demo_mode"))
@@ -0,0 +1,145 @@
+from datetime import date
+
+import streamlit as st
+
+from assets import LOGO
+from content import QUIZ_DATA
+from views import fragment, rerun_fragment
+
+# --- SÉCURITÉ ---
+try:
+    USERS_DB = st.secrets["users"]
+except FileNotFoundError:
+    USERS_DB = { "admin": "admin", "THT1001": "1234" }
+
+
+@fragment
+def quiz_card():
+    # Question courante rejouée seule ; rerun complet uniquement après la dernière question (écran de résultat)
+    q_data = QUIZ_DATA[st.session_state['quiz_index']]
+    st.markdown(f"**Question {st.session_state['quiz_index']+1}/{len(QUIZ_DATA)}**")
+    st.write(q_data['question'])
+    
+    # Choix réponse
+    choice = st.radio("Votre réponse :", q_data['options'], key=f"q_{st.session_state['quiz_index']}")
+    
+    if st.button("Valider la réponse"):
+        if choice == q_data['answer']:
+            st.session_state['quiz_score'] += 1
+            st.success("✅ Bonne réponse !")
+        else:
+            st.error(f"❌ Mauvaise réponse. La bonne réponse était : {q_data['answer']}")
+        
+        # Passer à la suivante
+        st.session_state['quiz_index'] += 1
+        if st.session_state['quiz_index'] < len(QUIZ_DATA): rerun_fragment()
+        else: st.rerun()
+
+
+def render():
+    st.markdown(f"""<div class="login-logo-container"><img src="{LOGO.url}" class="login-logo"></div><h1 style='text-align: center;'>CREW CENTER ATN-VIRTUAL VA</h1>""", unsafe_allow_html=True)
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        # LOGIQUE D'INSCRIPTION / QUIZ
+        if st.session_state['show_register']:
+            # ETAPE 1 : QUIZ (Si pas encore passé)
+            if not st.session_state['quiz_passed']:
+                st.markdown("### 🎓 Examen d'entrée")
+                st.info("Pour rejoindre ATN-Virtual, vous devez réussir ce test de connaissances aéronautiques (Score mini: 8/10).")
+                
+                # Vérifie si le quiz est fini
+                if st.session_state['quiz_index'] < len(QUIZ_DATA):
+                    quiz_card()
+                else:
+                    # FIN DU QUIZ
+                    final_score = st.session_state['quiz_score']
+                    st.write(f"### 🏁 Résultat : {final_score}/10")
+                    
+                    if final_score >= 8:
+                        st.balloons()
+                        st.success("🎉 Félicitations ! Vous avez réussi l'examen.")
+                        if st.button("Accéder au formulaire d'inscription"):
+                            st.session_state['quiz_passed'] = True
+                            st.rerun()
+                    else:
+                        st.error("⛔ Échec. Vous devez obtenir au moins 8/10.")
+                        if st.button("Réessayer"):
+                            st.session_state['quiz_index'] = 0
+                            st.session_state['quiz_score'] = 0
+                            st.rerun()
+            
+            # ETAPE 2 : FORMULAIRE (Si Quiz OK)
+            else:
+                st.markdown("### 📝 Formulaire d'Inscription")
+                st.success("✅ Examen validé.")
+                with st.form("register_form"):
+                    r_nom = st.text_input("Nom *")
+                    r_prenom = st.text_input("Prénom *")
+                    r_email = st.text_input("Email *")
+                    r_vid = st.text_input("VID IVAO *")
+                    r_dob = st.date_input("Date de naissance *", min_value=date(1950, 1, 1), max_value=date.today(), format="DD/MM/YYYY")
+                    st.markdown("Veuillez lire le règlement : [Règlement Intérieur](https://www.atnvirtual.fr/about-4)")
+                    r_rules = st.checkbox("J'ai lu et j'accepte le règlement du site *")
+                    
+                    submitted = st.form_submit_button("Envoyer ma candidature")
+                    if submitted:
+                        if not r_nom or not r_prenom or not r_email or not r_vid or not r_rules:
+                            st.warning("⚠️ Veuillez remplir tous les champs obligatoires et accepter le règlement.")
+                        else:
+                            today = date.today()
+                            age = today.year - r_dob.year - ((today.month, today.day) < (r_dob.month, r_dob.day))
+                            
+                            subject = f"[INSCRIPTION] Nouveau Pilote : {r_prenom} {r_nom}"
+                            body = f"""
+                            NOUVELLE DEMANDE D'INSCRIPTION (QUIZ REUSSI)
+                            --------------------------------------------
+                            Nom : {r_nom}
+                            Prénom : {r_prenom}
+                            Email : {r_email}
+                            VID IVAO : {r_vid}
+                            Date de Naissance : {r_dob.strftime('%d/%m/%Y')}
+                            Âge Calculé : {age} ans
+                            Score Examen : {st.session_state['quiz_score']}/10
+                            
+                            Action : Vérifier VID + Âge (Si < 16 ans, refuser).
+                            """
+                            from services import send_email_via_ionos
+                            if send_email_via_ionos(subject, body) is True:
+                                st.success("✅ Candidature envoyée ! Le Staff vous contactera.")
+                            else:
+                                st.error("Erreur technique.")
+
+            if st.button("⬅️ Retour connexion"):
+                st.session_state['show_register'] = False
+                st.session_state['quiz_passed'] = False
+                st.session_state['quiz_index'] = 0
+                st.session_state['quiz_score'] = 0
+                st.rerun()
+
+        else:
+            with st.form("login"):
+                u = st.text_input("Identifiant")
+                p = st.text_input("Mot de passe", type="password")
+                if st.form_submit_button("Se connecter ✈️"):
+                    if u in USERS_DB and USERS_DB[u] == p:
+                        st.session_state['logged_in'] = True
+                        st.session_state['username'] = u
+                        st.rerun()
+                    else: st.error("❌ Erreur connexion")
+            
+            st.markdown("---")
+            with st.container(border=True):
+                st.markdown("<h3 class='center-text'>🌟 Rejoignez l'aventure !</h3>", unsafe_allow_html=True)
+                st.markdown("""<div style='text-align: center; color: #57606a; margin-bottom: 20px;'>Embarquez pour une expérience immersive au cœur du Pacifique. Du vol inter-îles en ATR au long-courrier en Dreamliner, vivez la simulation autrement dans une ambiance conviviale et professionnelle.</div>""", unsafe_allow_html=True)
+                
+                # --- BOUTON DEPLACE ICI, A L'INTERIEUR DU CADRE ET CENTRE ---
+                c_reg1, c_reg2, c_reg3 = st.columns([1, 2, 1])
+                with c_reg2:
+                    if st.button("📝 Créer un compte", use_container_width=True):
+                        st.session_state['show_register'] = True
+                        st.rerun()
+                
+                st.markdown("<hr style='margin-top: 10px; margin-bottom: 20px;'>", unsafe_allow_html=True)
+                c_invit1, c_invit2 = st.columns(2)
+                with c_invit1: st.link_button("🔗 Inscription fsHub", "https://fshub.io/airline/THT/overview", use_container_width=True)
+                with c_invit2: st.link_button("🌐 Notre Site Web", "https://www.atnvirtual.fr/", use_container_width=True)
@@ -0,0 +1,32 @@
+import streamlit as st
+
+from i18n import T
+from metar import metar_summary
+from services import get_real_metar
+from views import fragment
+
+
+@fragment
+def metar_search():
+    # Saisie et recherche rejouées seules
+    with st.container(border=True):
+        c1, c2 = st.columns([3, 1])
+        icao = c1.text_input(T("metar_label"), max_chars=4, placeholder="NTAA").upper()
+        if c2.button(T("metar_btn"), type="primary") and icao:
+            st.markdown("---")
+            raw = get_real_metar(icao)
+            if "⚠️" not in raw:
+                data = metar_summary(raw)
+                st.subheader(f"📍 {icao}")
+                m1, m2, m3 = st.columns(3)
+                m1.metric("Vent", data["Wind"])
+                m2.metric("Temp", data["Temp"])
+                m3.metric("QNH", data["QNH"])
+                st.code(raw, language="text")
+            else: st.error(raw)
+
+
+def render():
+    st.title(T("metar_title"))
+    st.write(T("metar_desc"))
+    metar_search()
@@ -0,0 +1,71 @@
+import pandas as pd
+import streamlit as st
+
+from flights import FLIGHT_STORE
+from i18n import T
+from leaderboard import LEADERBOARD
+from pireps import APPROVED, DUPLICATE, PIREP_STORE, InvalidPirep, validate_pirep
+from services import is_staff, send_email_via_ionos, show_mail_status
+from tours import TOUR_TRACKER
+
+
+def render():
+    st.title(T("pirep_title"))
+    with st.expander(T("pirep_intro"), expanded=True):
+        st.info(T("pirep_warn"))
+        c_fp_1, c_fp_2, c_fp_rate = st.columns([2, 2, 1])
+        p_flight_nb = c_fp_1.text_input(T("form_flight_nb"), placeholder="ex: TN08")
+        p_aircraft = c_fp_2.selectbox(T("form_aircraft"), ["B789", "A359", "A320", "AT76", "DH8D", "B350", "C172"])
+        p_landing = c_fp_rate.number_input(T("form_landing"), value=-200, step=10)
+        c_fp_3, c_fp_4 = st.columns(2)
+        p_dep = c_fp_3.text_input(T("form_dep"), max_chars=4, placeholder="NTAA").upper()
+        p_arr = c_fp_4.text_input(T("form_arr"), max_chars=4, placeholder="KLAX").upper()
+        st.markdown("---")
+        c_fp_5, c_fp_6 = st.columns(2)
+        p_date_dep = c_fp_5.date_input(T("form_date_dep"))
+        p_time_dep = c_fp_6.text_input(T("form_time_dep"), placeholder="HH:MM")
+        c_fp_7, c_fp_8 = st.columns(2)
+        p_date_arr = c_fp_7.date_input(T("form_date_arr"))
+        p_time_arr = c_fp_8.text_input(T("form_time_arr"), placeholder="HH:MM")
+        st.markdown("---")
+        p_remark = st.text_area(T("form_msg") + " (Optionnel)")
+        
+        if st.button(T("pirep_send"), type="primary"):
+            try:
+                pirep = validate_pirep(st.session_state['username'], p_flight_nb, p_aircraft, p_dep, p_arr, p_date_dep, p_time_dep, p_date_arr, p_time_arr, p_landing, p_remark)
+                pirep_id, status = PIREP_STORE.submit(pirep, FLIGHT_STORE)
+                if status == DUPLICATE: st.info(T("pirep_duplicate"))
+                else:
+                    st.success(T("pirep_saved"))
+                    # Notification Staff (le rapport lui-même est dans la file de validation)
+                    block = f"{pirep.block_minutes // 60}h{pirep.block_minutes % 60:02d}"
+                    subject = f"[PIREP #{pirep_id}] {pirep.flight_nb} : {pirep.dep}-{pirep.arr}"
+                    body = f"PILOTE: {pirep.pilot}\nVOL: {pirep.flight_nb}\nAVION: {pirep.aircraft}\nDEPART: {pirep.dep} le {pirep.off_block:%Y-%m-%d à %H:%M}z\nARRIVEE: {pirep.arr} le {pirep.on_block:%Y-%m-%d à %H:%M}z\nTEMPS BLOC: {block}\nLANDING: {pirep.landing_fpm} fpm\nREMARQUES: {pirep.remarks}"
+                    res = send_email_via_ionos(subject, body)
+                    if res is not True: st.error(T("email_error") + str(res))
+            except InvalidPirep as e:
+                for error in e.errors: st.error(error)
+    show_mail_status()
+
+    my_reports = PIREP_STORE.pilot_reports(st.session_state['username'])
+    if my_reports:
+        st.markdown(f"#### {T('pirep_mine')}")
+        st.dataframe(pd.DataFrame([(r['flight_nb'], f"{r['dep']}-{r['arr']}", r['off_block'][:16].replace("T", " "), f"{r['block_minutes'] // 60}h{r['block_minutes'] % 60:02d}", f"{r['landing_fpm']} fpm", T("pirep_states")[r['status']]) for r in my_reports],
+                                  columns=["Vol", "Route", "Off-block (Z)", "Bloc", "Landing", "Statut"]), use_container_width=True, hide_index=True)
+
+    # --- FILE DE VALIDATION (STAFF) ---
+    if is_staff(st.session_state['username']):
+        queue = PIREP_STORE.queue()
+        st.markdown(f"#### {T('pirep_queue')} ({len(queue)})")
+        for r in queue:
+            q1, q2, q3 = st.columns([4, 1, 1])
+            q1.write(f"**#{r['id']} · {r['pilot']} · {r['flight_nb']}** {r['dep']} → {r['arr']} · {r['aircraft']} · {r['off_block'][:16].replace('T', ' ')} Z · {r['block_minutes'] // 60}h{r['block_minutes'] % 60:02d} · {r['landing_fpm']} fpm" + (f" · _{r['remarks']}_" if r['remarks'] else ""))
+            if q2.button(T("pirep_approve"), key=f"pirep_ok_{r['id']}"):
+                if PIREP_STORE.approve(r['id'], st.session_state['username'], FLIGHT_STORE) == APPROVED:
+                    pilot_flights = FLIGHT_STORE.pilot_flights(r['pilot'])
+                    LEADERBOARD.update_pilot_flights(r['pilot'], pilot_flights)
+                    TOUR_TRACKER.match(r['pilot'], pilot_flights)
+                st.rerun()
+            if q3.button(T("pirep_reject"), key=f"pirep_ko_{r['id']}"):
+                PIREP_STORE.reject(r['id'], st.session_state['username'])
+                st.rerun()
@@ -0,0 +1,36 @@
+import streamlit as st
+
+from i18n import T
+from roster import ROSTER
+from services import get_career_stats, get_pilot_index, pilot_flights_html
+
+
+def render():
+    st.title(T("profile_title"))
+    current_pilot = ROSTER.get(st.session_state['username'])
+    if current_pilot:
+        st.write(f"### 👋 {current_pilot['nom']}")
+        st.markdown(f"#### {T('profile_career')}")
+        my_hours = get_pilot_index()[current_pilot['id']].raw
+        c1, c2 = st.columns(2)
+        c1.metric(T("profile_grade"), current_pilot['grade'])
+        c2.metric(T("profile_hours"), my_hours)
+        career = get_career_stats(current_pilot['id'])
+        if career['flights']:
+            k1, k2, k3, k4 = st.columns(4)
+            k1.metric(T("career_flights"), career['flights'])
+            k2.metric(T("career_hours"), f"{career['hours']:.1f} h")
+            k3.metric(T("career_landing"), f"{career['landing_avg']:.0f} fpm" if career['landing_avg'] is not None else "N/A")
+            k4.metric(T("career_streak"), career['best_streak'])
+            with st.expander(T("career_details")):
+                if not career['monthly_hours'].empty: st.bar_chart(career['monthly_hours'].rename(index=str))
+                st.dataframe(career['by_aircraft'].round(1), use_container_width=True)
+                st.dataframe(career['by_route'].head(10).round(1), use_container_width=True)
+        st.markdown("---")
+        st.markdown(f"#### {T('profile_flights')}")
+        if current_pilot['fshub_id']:
+            flights_html = pilot_flights_html(current_pilot['fshub_id'])
+            if flights_html: st.markdown(flights_html, unsafe_allow_html=True)
+            else: st.info("Aucun vol récent.")
+        else: st.warning("Compte non lié.")
+    else: st.error("Profil introuvable.")
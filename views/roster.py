@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+
+import streamlit as st
+
+from assets import PILOT_AVATAR_URL
+from fshub import FSHUB_FEEDS
+from i18n import T
+from roster import ROSTER, paginate
+from services import get_pilot_index
+
+PAGE_SIZE = 24
+
+
+def pilot_card_html(pilot, hours):
+    h_disp = f"⏱️ {hours.raw}" if hours.raw and hours.raw != "-" else f"<span class='badge-inactive'>{T('roster_inactive')}</span>"
+    staff = '<span class="staff-badge">STAFF</span>' if pilot['role'] == "STAFF" else ""
+    return f"""<div class="pilot-card"><img src="{PILOT_AVATAR_URL}" class="pilot-img"><div class="pilot-details"><div class="pilot-name">{pilot['id']} - {pilot['nom']}</div><div class="rank-line"><span class="pilot-rank">{pilot['grade']}</span>{staff}</div><div class="pilot-info">{h_disp}</div></div></div>"""
+
+
+def render():
+    st.title(T("roster_title"))
+    hours_feed = FSHUB_FEEDS.snapshot("pilot_hours")
+    st.caption(f"{T('roster_sync')} · {datetime.fromtimestamp(hours_feed.refreshed_at, timezone.utc):%H:%M} Z" if hours_feed.version else T("roster_sync"))
+    f1, f2, f3 = st.columns([2, 1, 1])
+    query = f1.text_input(T("roster_search"), key="roster_query", placeholder="THT1001, Guillaume…")
+    grade = f2.selectbox(T("roster_grade"), [None] + ROSTER.grades, format_func=lambda g: g or T("roster_all"), key="roster_grade")
+    role = f3.selectbox(T("roster_role"), [None] + ROSTER.roles, format_func=lambda r: r or T("roster_all"), key="roster_role")
+    results = ROSTER.search(query, grade, role)
+    st.markdown("---")
+    if not results:
+        st.info(T("roster_none"))
+        return
+    # Page ramenée dans les bornes avant création du widget (un filtre peut réduire le nombre de pages)
+    pages = paginate(results, 1, PAGE_SIZE)[1]
+    if st.session_state.get("roster_page", 1) > pages: st.session_state["roster_page"] = pages
+    page = st.number_input(T("roster_page"), 1, pages, key="roster_page") if pages > 1 else 1
+    rows, _ = paginate(results, page, PAGE_SIZE)
+    st.caption(f"{len(results)} {T('roster_results')} · {T('roster_page')} {page}/{pages}")
+    # Une seule charge HTML par page, quelle que soit la taille du roster
+    pilot_index = get_pilot_index()
+    cards = "".join(pilot_card_html(p, pilot_index[p['id']]) for p in rows)
+    st.markdown(f'<div class="roster-grid">{cards}</div>', unsafe_allow_html=True)
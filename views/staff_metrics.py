@@ -0,0 +1,50 @@
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import streamlit as st
+
+from fshub import FSHUB_FEEDS
+from i18n import T
+from metrics import METRICS
+from services import is_staff
+
+
+def _ms(seconds):
+    return round(seconds * 1e3, 2) if seconds is not None else None
+
+
+def render():
+    st.title(T("metrics_title"))
+    if not is_staff(st.session_state['username']):
+        st.error(T("staff_only"))
+        return
+    st.caption(T("metrics_desc"))
+    metrics = sorted(METRICS.snapshot().items())
+    if not metrics: st.info(T("metrics_empty"))
+    else:
+        # Quantiles lus sur l'histogramme : borne haute du seau (None au-delà de 10 s)
+        st.dataframe(pd.DataFrame([(name, m.count, m.errors, f"{m.errors / m.count:.1%}" if m.count else "-", _ms(m.mean) if m.count else None,
+                                    _ms(m.quantile(0.5)), _ms(m.quantile(0.95)), _ms(m.quantile(0.99)), m.hits, m.misses,
+                                    f"{m.hit_ratio:.0%}" if m.hit_ratio is not None else "-") for name, m in metrics],
+                                  columns=["Fonction", "Appels", "Erreurs", "Taux d'erreur", "Moyenne (ms)", "P50 ≤ (ms)", "P95 ≤ (ms)",
+                                           "P99 ≤ (ms)", "Cache hit", "Cache miss", "Ratio cache"]),
+                     use_container_width=True, hide_index=True)
+    feeds = sorted(FSHUB_FEEDS.status().items())
+    if feeds:
+        # Dernier rafraîchissement réussi de chaque flux (heure UTC et âge) et durée du dernier appel
+        now = time.time()
+        st.markdown(f"#### {T('metrics_feeds')}")
+        st.dataframe(pd.DataFrame([(name, snap.version, f"{datetime.fromtimestamp(snap.refreshed_at, timezone.utc):%H:%M:%S} Z" if snap.refreshed_at else "-",
+                                    round(now - snap.refreshed_at) if snap.refreshed_at else None, _ms(snap.duration) if snap.refreshed_at or snap.error else None,
+                                    snap.error or "") for name, snap in feeds],
+                                  columns=["Flux", "Version", "Rafraîchi à", "Âge (s)", "Durée (ms)", "Erreur"]), use_container_width=True, hide_index=True)
+    components = METRICS.components()
+    if components:
+        st.markdown(f"#### {T('metrics_components')}")
+        st.dataframe(pd.DataFrame([(component, stat, value) for component, stats in sorted(components.items()) for stat, value in sorted(stats.items())],
+                                  columns=["Composant", "Compteur", "Valeur"]), use_container_width=True, hide_index=True)
+    dump = METRICS.prometheus()
+    with st.expander(T("metrics_dump")):
+        st.download_button("metrics.prom", dump, file_name="metrics.prom", mime="text/plain")
+        st.code(dump, language="text")
@@ -0,0 +1,76 @@
+import pandas as pd
+import streamlit as st
+
+from i18n import T
+from services import is_staff, send_email_via_ionos, show_mail_status
+from tours import APPROVED, TOUR_TRACKER, TOURS
+
+LISTE_TOURS = list(TOURS)       # étapes définies par le staff dans tours.json
+
+
+def render():
+    st.title("🏆 Tours Pilotes")
+    uid = st.session_state['username']
+    st.caption("Les étapes sont validées automatiquement à partir de vos vols synchronisés fsHub (et des PIREP validés).")
+    overview = TOUR_TRACKER.all_progress(uid)
+    if not overview:
+        st.info("Aucun tour publié pour le moment.")
+        return
+    for col, prog in zip(st.columns(len(overview)), overview):
+        col.metric(prog.tour.name, f"{prog.done}/{prog.total}" if prog.total else "-", "🏁 Terminé" if prog.complete else None)
+    st.markdown("---")
+    selected_tour = st.selectbox("Sélectionner le Tour", LISTE_TOURS)
+    prog = TOUR_TRACKER.progress(uid, selected_tour)
+    if not prog.total: st.info("Étapes de ce tour pas encore publiées.")
+    else:
+        st.progress(prog.done / prog.total, text=f"Étape {prog.done}/{prog.total} validée" + ("s" if prog.done > 1 else ""))
+        if prog.next_leg:
+            next_number, (next_dep, next_arr) = prog.next_leg
+            st.info(f"➡️ Prochaine étape : **{next_number}/{prog.total} · {next_dep} → {next_arr}**")
+        else: st.success("🏁 Tour terminé, félicitations !")
+        st.dataframe(pd.DataFrame([(n, dep, arr, "✅" if prog.leg_done(n) else "") for n, (dep, arr) in enumerate(prog.tour.legs, 1)],
+                                  columns=["Étape", "Départ", "Arrivée", "Validée"]), use_container_width=True, hide_index=True)
+
+    with st.expander("📝 Vol non suivi par fsHub ? Demande de validation manuelle"):
+        open_legs = [n for n in range(1, prog.total + 1) if not prog.leg_done(n)]
+        if not prog.total: st.caption("Validation possible dès la publication des étapes.")
+        elif not open_legs: st.caption("Toutes les étapes sont déjà validées.")
+        else:
+            col_main1, col_main2 = st.columns(2)
+            with col_main1:
+                leg_number = st.selectbox("Numéro de l'étape", open_legs, format_func=lambda n: f"{n} · {prog.tour.legs[n - 1][0]} → {prog.tour.legs[n - 1][1]}")
+                aircraft = st.text_input("Appareil utilisé", placeholder="ex: B789")
+            with col_main2:
+                # Départ / arrivée saisis par le pilote (pré-remplis avec l'étape publiée)
+                dep_default, arr_default = prog.tour.legs[leg_number - 1]
+                c1, c2 = st.columns(2)
+                dep_icao = c1.text_input("Départ (ICAO)", value=dep_default, max_chars=4, key=f"tour_dep_{selected_tour}_{leg_number}").upper()
+                arr_icao = c2.text_input("Arrivée (ICAO)", value=arr_default, max_chars=4, key=f"tour_arr_{selected_tour}_{leg_number}").upper()
+                date_flight = st.date_input("Date du vol")
+                flight_time = st.text_input("Temps de vol (Block)", placeholder="ex: 01:45")
+            comment = st.text_area("Lien du rapport fsHub (Optionnel) ou Remarques")
+            if st.button("✅ ENVOYER LA VALIDATION", type="primary"):
+                # Demande enregistrée dans la file Staff ; l'e-mail ne sert qu'à prévenir le Staff
+                request_id, created = TOUR_TRACKER.request(uid, selected_tour, leg_number, dep_icao, arr_icao, aircraft, date_flight, flight_time, comment)
+                if not created: st.info(f"Demande #{request_id} déjà en attente pour cette étape.")
+                else:
+                    st.success(f"Demande #{request_id} enregistrée : elle sera traitée par le Staff.")
+                    subject = f"VALIDATION TOUR #{request_id} - {selected_tour} - Etape {leg_number} - {uid}"
+                    body = f"PILOTE: {uid}\nTOUR: {selected_tour}\nETAPE: {leg_number}\nAVION: {aircraft}\nDEPART: {dep_icao}\nARRIVEE: {arr_icao}\nDATE: {date_flight}\nTEMPS: {flight_time}\nREMARQUES: {comment}"
+                    res = send_email_via_ionos(subject, body)
+                    if res is not True: st.error(T("email_error") + str(res))
+        show_mail_status()
+
+    # --- DEMANDES EN ATTENTE (STAFF) ---
+    if is_staff(uid):
+        pending = TOUR_TRACKER.pending()
+        st.markdown(f"#### Demandes de validation manuelle ({len(pending)})")
+        for r in pending:
+            q1, q2, q3 = st.columns([4, 1, 1])
+            q1.write(f"**#{r.id} · {r.pilot} · {r.tour}** étape {r.leg} · {r.dep} → {r.arr} · {r.aircraft} · {r.flight_date} · {r.block}" + (f" · _{r.remarks}_" if r.remarks else ""))
+            if q2.button(T("pirep_approve"), key=f"tour_ok_{r.id}"):
+                if TOUR_TRACKER.approve(r.id, uid) != APPROVED: st.error(f"Demande #{r.id} : étape inconnue ou déjà traitée.")
+                else: st.rerun()
+            if q3.button(T("pirep_reject"), key=f"tour_ko_{r.id}"):
+                TOUR_TRACKER.reject(r.id, uid)
+                st.rerun()
@@ -0,0 +1,342 @@
+import os
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import METRICS
+
+# --- SOURCES NOAA ---
+# ATN_NOAA_BASE permet de pointer vers un miroir ou un serveur local de test
+NOAA_BASE = os.environ.get("ATN_NOAA_BASE", "https://tgftp.nws.noaa.gov/data")
+NOAA_URLS = {
+    "METAR": NOAA_BASE + "/observations/metar/stations/{icao}.TXT",
+    "TAF": NOAA_BASE + "/forecasts/taf/stations/{icao}.TXT",
+}
+CYCLE_URLS = {
+    "METAR": NOAA_BASE + "/observations/metar/cycles/{hour:02d}Z.TXT",
+    "TAF": NOAA_BASE + "/forecasts/taf/cycles/{hour:02d}Z.TXT",
+}
+
+
+FETCH_WORKERS = 8
+
+# Session HTTP partagée : les connexions TLS vers NOAA sont réutilisées entre appels et threads
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=FETCH_WORKERS))
+_POOL = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="noaa")
+
+
+class StationNotFound(Exception):
+    pass
+
+
+@METRICS.timed("noaa.station")
+def fetch_noaa(icao_code, product, timeout=2):
+    url = NOAA_URLS[product].format(icao=icao_code)
+    response = _SESSION.get(url, timeout=timeout)
+    if response.status_code == 404: raise StationNotFound(icao_code)
+    response.raise_for_status()
+    if product == "METAR":
+        # Ligne 1 = horodatage NOAA, ligne 2 = bulletin
+        lines = response.text.strip().split('\n')
+        return lines[1] if len(lines) >= 2 else response.text
+    return response.text
+
+
+# --- CACHE METEO PARTAGE (1 par process serveur) ---
+class WeatherCache:
+    # ttl : durée de fraîcheur ; max_stale : au-delà on refait un appel bloquant ;
+    # negative_ttl : durée pendant laquelle une station inconnue n'est plus interrogée.
+    # get(..., metric=nom) compte aussi l'accès dans METRICS, décidé sous le verrou : succès pour un bulletin frais,
+    # périmé servi pendant son rafraîchissement ou une station inconnue déjà connue ; échec si un appel est nécessaire.
+    def __init__(self, fetcher, ttl=600, max_stale=6 * 3600, negative_ttl=3600):
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.negative_ttl = negative_ttl
+        self._entries = {}      # (icao, produit) -> (texte ou None, horodatage)
+        self._inflight = {}     # (icao, produit) -> threading.Event
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "negative_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+    def get(self, icao_code, product, metric=None):
+        key = (icao_code.upper(), product)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                text, stamp = entry
+                age = now - stamp
+                if text is None:
+                    if age < self.negative_ttl:
+                        self.stats["negative_hits"] += 1
+                        if metric: METRICS.cache(metric, True)
+                        raise StationNotFound(icao_code)
+                elif age < self.ttl:
+                    self.stats["hits"] += 1
+                    if metric: METRICS.cache(metric, True)
+                    return text
+                elif age < self.max_stale:
+                    # Stale-while-revalidate : on sert l'ancien bulletin, rafraîchi en arrière-plan
+                    self.stats["stale_hits"] += 1
+                    if metric: METRICS.cache(metric, True)
+                    if key not in self._inflight:
+                        self._inflight[key] = threading.Event()
+                        threading.Thread(target=self._refresh_quiet, args=(key,), daemon=True).start()
+                    return text
+            self.stats["misses"] += 1
+            if metric: METRICS.cache(metric, False)
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                self._inflight[key] = threading.Event()
+        if waiter is not None:
+            # Une autre session récupère déjà cette station : on attend son résultat
+            waiter.wait(timeout=10)
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None: raise ConnectionError(icao_code)
+            if entry[0] is None: raise StationNotFound(icao_code)
+            return entry[0]
+        return self._refresh(key)
+
+    def _refresh(self, key):
+        try:
+            text = self.fetcher(key[0], key[1])
+        except StationNotFound:
+            self._store(key, None)
+            raise
+        except Exception:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        else:
+            self._store(key, text)
+            return text
+        finally:
+            with self._lock:
+                self.stats["refreshes"] += 1
+                event = self._inflight.pop(key, None)
+            if event is not None: event.set()
+
+    def _refresh_quiet(self, key):
+        try: self._refresh(key)
+        except Exception: pass
+
+    def _store(self, key, text):
+        with self._lock:
+            self._entries[key] = (text, time.time())
+
+    def peek(self, icao_code, product):
+        entry = self._entries.get((icao_code.upper(), product))
+        return entry[0] if entry else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# --- TABLES CYCLE NOAA (tous les bulletins mondiaux de l'heure) ---
+# Une ligne par station : index ICAO -> rang, textes et horodatages en colonnes.
+class CycleTable:
+    def __init__(self, product, max_age):
+        self.product = product
+        self.max_age = max_age
+        self._rows = {}
+        self._stamps = array('d')
+        self._texts = []
+        self._lock = threading.Lock()
+        self.loaded_at = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def ingest(self, lines):
+        count = 0
+        for stamp, text in iter_cycle_blocks(lines):
+            icao = bulletin_station(text)
+            if not icao: continue
+            with self._lock:
+                row = self._rows.get(icao)
+                if row is None:
+                    self._stamps.append(stamp)
+                    self._texts.append(text)
+                    self._rows[icao] = len(self._texts) - 1
+                elif stamp >= self._stamps[row]:
+                    self._stamps[row] = stamp
+                    self._texts[row] = text
+            count += 1
+        self.loaded_at = time.time()
+        return count
+
+    def lookup(self, icao_code):
+        row = self._rows.get(icao_code.upper())
+        if row is None: return None
+        stamp = self._stamps[row]
+        if time.time() - stamp > self.max_age: return None
+        if self.product == "TAF":
+            # Même forme que le fichier station : ligne d'horodatage puis le TAF
+            return datetime.fromtimestamp(stamp, timezone.utc).strftime("%Y/%m/%d %H:%M") + "\n" + self._texts[row]
+        return self._texts[row]
+
+
+def iter_cycle_blocks(lines):
+    # Blocs séparés par une ligne vide : "AAAA/MM/JJ HH:MM" puis le bulletin (éventuellement sur plusieurs lignes)
+    stamp, body = None, []
+    for line in lines:
+        line = line.rstrip()
+        if not line:
+            if stamp is not None and body: yield stamp, "\n".join(body)
+            stamp, body = None, []
+        elif stamp is None:
+            try: stamp = datetime.strptime(line, "%Y/%m/%d %H:%M").replace(tzinfo=timezone.utc).timestamp()
+            except ValueError: continue
+        else:
+            body.append(line)
+    if stamp is not None and body: yield stamp, "\n".join(body)
+
+
+def bulletin_station(text):
+    for token in text.split(None, 4):
+        if token in ("METAR", "SPECI", "TAF", "AMD", "COR"): continue
+        return token if len(token) == 4 and token.isalnum() else None
+    return None
+
+
+def file_lines(path):
+    with open(path, encoding="latin-1") as f:
+        for line in f: yield line.rstrip("\n")
+
+
+# Une source rend les lignes du fichier de cycle, ou None s'il n'a pas changé depuis la dernière lecture complète :
+# le fichier n'est alors ni retéléchargé ni réanalysé.
+class HttpCycleSource:
+    # Requêtes conditionnelles par URL de cycle (If-None-Match / If-Modified-Since, comme fshub.fetch_parsed) :
+    # un cycle inchangé coûte un 304
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self._validators = {}           # url -> (ETag, Last-Modified)
+
+    def __call__(self, product, hour):
+        url = CYCLE_URLS[product].format(hour=hour)
+        etag, modified = self._validators.get(url, (None, None))
+        headers = {}
+        if etag: headers["If-None-Match"] = etag
+        if modified: headers["If-Modified-Since"] = modified
+        response = _SESSION.get(url, headers=headers, stream=True, timeout=self.timeout)
+        if response.status_code == 304:
+            response.close()
+            return None
+        try: response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        return self._lines(url, response)
+
+    def _lines(self, url, response):
+        # Validateurs enregistrés seulement une fois le fichier entièrement lu (et donc ingéré)
+        with response:
+            response.encoding = response.encoding or "latin-1"
+            yield from response.iter_lines(decode_unicode=True)
+        self._validators[url] = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+
+def directory_cycle_source(directory):
+    # Arborescence locale : <directory>/metar/HHZ.TXT et <directory>/taf/HHZ.TXT ; date de modification en guise d'ETag
+    seen = {}
+
+    def source(product, hour):
+        path = os.path.join(directory, product.lower(), f"{hour:02d}Z.TXT")
+        mtime = os.stat(path).st_mtime_ns
+        if seen.get(path) == mtime: return None
+        return lines(path, mtime)
+
+    def lines(path, mtime):
+        yield from file_lines(path)
+        seen[path] = mtime
+    return source
+
+
+CYCLE_TABLES = {"METAR": CycleTable("METAR", max_age=3 * 3600), "TAF": CycleTable("TAF", max_age=8 * 3600)}
+
+
+class CycleIngester:
+    # backfill : nombre d'heures chargées au démarrage (les TAF ne sont émis que toutes les 6 h)
+    def __init__(self, tables, source=None, interval=600, backfill=None):
+        self.tables = tables
+        self.source = source or HttpCycleSource()
+        self.interval = interval
+        self.backfill = backfill or {"METAR": 2, "TAF": 7}
+        self.errors = 0
+        self.not_modified = 0           # cycles inchangés depuis la dernière lecture (304 / même mtime)
+        self.last_run = 0
+        self.last_duration = 0
+        self._primed = False
+        self._thread = None
+        self._stop = threading.Event()
+
+    def run_once(self):
+        started = time.time()
+        hour = datetime.now(timezone.utc).hour
+        for product, table in self.tables.items():
+            depth = self.backfill.get(product, 2) if not self._primed else 2
+            for back in range(depth - 1, -1, -1):
+                try:
+                    with METRICS.time(f"noaa.cycle.{product}"):
+                        lines = self.source(product, (hour - back) % 24)
+                        if lines is not None: table.ingest(lines)
+                    METRICS.cache(f"noaa.cycle.{product}", lines is None)
+                    if lines is None: self.not_modified += 1
+                except Exception: self.errors += 1
+        self._primed = True
+        self.last_run = time.time()
+        self.last_duration = self.last_run - started
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive(): return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="noaa-cycles", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+if os.environ.get("ATN_NOAA_CYCLE_DIR"):
+    CYCLE_INGESTER = CycleIngester(CYCLE_TABLES, source=directory_cycle_source(os.environ["ATN_NOAA_CYCLE_DIR"]))
+else:
+    CYCLE_INGESTER = CycleIngester(CYCLE_TABLES)
+
+
+def fetch_weather(icao_code, product):
+    # Table du cycle en priorité, requête station par station en secours
+    text = CYCLE_TABLES[product].lookup(icao_code)
+    if text is not None: return text
+    return fetch_noaa(icao_code, product)
+
+
+WEATHER_CACHE = WeatherCache(fetch_weather, ttl=int(os.environ.get("ATN_WEATHER_TTL", 600)))
+
+
+# --- RECUPERATION GROUPEE ---
+# Résout toutes les paires (icao, produit) en parallèle avec une échéance globale.
+# Retourne {(ICAO, produit): texte ou exception} ; les paires non résolues à temps sont absentes.
+def get_many(pairs, deadline=3.0, cache=None):
+    cache = cache or WEATHER_CACHE
+    keys = list(dict.fromkeys((icao.upper(), product) for icao, product in pairs if icao))
+    futures = {_POOL.submit(cache.get, icao, product): (icao, product) for icao, product in keys}
+    done, _ = wait(futures, timeout=deadline)
+    results = {}
+    for future in done:
+        try: results[futures[future]] = future.result()
+        except Exception as e: results[futures[future]] = e
+    return results